@@ -18,6 +18,14 @@ var AUTO_TEST_CONFIG_PATH = 'test_config.json';
 var AUTO_TEST_RESULTS_PATH = 'test_results.json';
 var _pendingTestConfig = null;
 
+// Element keyword patterns for analysis, compiled once at load: the old
+// per-call keyword table did an indexOf scan per keyword per node name
+var TEST_ELEMENT_PATTERNS = {
+    fire: /fire|flame|burn|inferno|blaze|fireball/,
+    frost: /frost|ice|cold|freeze|frozen|blizzard|frostbite/,
+    shock: /shock|lightning|thunder|spark|electric|storm|bolt/
+};
+
 /**
  * Log to C++ for visibility in SKSE log
  */
@@ -241,11 +249,19 @@ function finishTestGeneration(config, treeData, treeGenSettings) {
             var nodes = school.nodes || [];
             var links = school.links || [];
 
-            var withChildren = nodes.filter(function(n) { return n.children && n.children.length > 0; }).length;
-            var withPrereqs = nodes.filter(function(n) { return n.prerequisites && n.prerequisites.length > 0; }).length;
-            var withPositions = nodes.filter(function(n) { return n.x !== 0 || n.y !== 0; }).length;
-            var withFromVisualFirst = nodes.filter(function(n) { return n._fromVisualFirst; }).length;
-            var withFromLayoutEngine = nodes.filter(function(n) { return n._fromLayoutEngine; }).length;
+            // One pass over the nodes for all diagnostic tallies (plus the
+            // root pick below) instead of a filter per counter
+            var withChildren = 0, withPrereqs = 0, withPositions = 0;
+            var withFromVisualFirst = 0, withFromLayoutEngine = 0;
+            var rootNode = null;
+            nodes.forEach(function(n) {
+                if (n.children && n.children.length > 0) withChildren++;
+                if (n.prerequisites && n.prerequisites.length > 0) withPrereqs++;
+                if (n.x !== 0 || n.y !== 0) withPositions++;
+                if (n._fromVisualFirst) withFromVisualFirst++;
+                if (n._fromLayoutEngine) withFromLayoutEngine++;
+                if (!rootNode && n.isRoot) rootNode = n;
+            });
 
             logToCpp(schoolName + ': ' + nodes.length + ' nodes, ' + links.length + ' links');
             logToCpp('  - Nodes with children: ' + withChildren);
@@ -255,7 +271,6 @@ function finishTestGeneration(config, treeData, treeGenSettings) {
             logToCpp('  - Nodes with _fromLayoutEngine: ' + withFromLayoutEngine);
 
             // Log root node details
-            var rootNode = nodes.find(function(n) { return n.isRoot; });
             if (rootNode) {
                 logToCpp('  ROOT: ' + (rootNode.name || rootNode.formId) +
                          ', children=' + (rootNode.children ? rootNode.children.length : 0) +
@@ -286,8 +301,14 @@ function finishTestGeneration(config, treeData, treeGenSettings) {
             timestamp: new Date().toISOString()
         });
 
-        // Also save the tree itself
-        saveTreeData(treeData);
+        // Also save the tree itself - the full-tree serialization dwarfs the
+        // summary write, so it can be turned off in test_config.json when a
+        // sweep only needs the analysis verdicts
+        if (config.saveTreeData !== false) {
+            saveTreeData(treeData);
+        } else {
+            logToCpp('Tree data save skipped (saveTreeData=false in config)');
+        }
     }
 
     // Signal completion
@@ -342,20 +363,11 @@ function analyzeTreeResults(treeData, treeSettings) {
         return analysis;
     }
 
-    // Element keywords for detection
-    var ELEMENTS = {
-        fire: ['fire', 'flame', 'burn', 'inferno', 'blaze', 'fireball'],
-        frost: ['frost', 'ice', 'cold', 'freeze', 'frozen', 'blizzard', 'frostbite'],
-        shock: ['shock', 'lightning', 'thunder', 'spark', 'electric', 'storm', 'bolt']
-    };
-
     function detectElement(node) {
         if (!node || !node.name) return null;
         var text = node.name.toLowerCase();
-        for (var elem in ELEMENTS) {
-            for (var i = 0; i < ELEMENTS[elem].length; i++) {
-                if (text.indexOf(ELEMENTS[elem][i]) >= 0) return elem;
-            }
+        for (var elem in TEST_ELEMENT_PATTERNS) {
+            if (TEST_ELEMENT_PATTERNS[elem].test(text)) return elem;
         }
         return null;
     }
@@ -366,12 +378,19 @@ function analyzeTreeResults(treeData, treeSettings) {
         var nodes = school.nodes || [];
         var links = school.links || [];
 
-        // Build node lookup
+        // Build node lookups once per school - element detection and tier are
+        // resolved here so the links loop below does flat map reads instead of
+        // re-running the keyword scan for every link endpoint
         var nodeMap = {};
-        nodes.forEach(function(n) { nodeMap[n.formId] = n; });
-
-        // Check for root nodes with prerequisites (BUG INDICATOR)
+        var elementById = {};
+        var tierById = {};
         nodes.forEach(function(n) {
+            nodeMap[n.formId] = n;
+            elementById[n.formId] = detectElement(n);
+            tierById[n.formId] = n.tier || 0;
+
+            // Check for root nodes with prerequisites (BUG INDICATOR) -
+            // folded into the lookup pass so nodes are walked once
             if (n.isRoot) {
                 analysis.rootNodeCount++;
                 var prereqs = n.prerequisites || [];
@@ -396,8 +415,8 @@ function analyzeTreeResults(treeData, treeSettings) {
 
             if (!fromNode || !toNode) return;
 
-            var fromElem = detectElement(fromNode);
-            var toElem = detectElement(toNode);
+            var fromElem = elementById[link.from];
+            var toElem = elementById[link.to];
 
             // Check for cross-element
             if (fromElem && toElem && fromElem !== toElem) {
@@ -415,9 +434,7 @@ function analyzeTreeResults(treeData, treeSettings) {
 
             // Check tier ordering
             if (treeSettings && treeSettings.strictTierOrdering) {
-                var fromTier = fromNode.tier || 0;
-                var toTier = toNode.tier || 0;
-                if (fromTier > toTier) {
+                if (tierById[link.from] > tierById[link.to]) {
                     analysis.tierViolations++;
                 }
             }
@@ -734,10 +734,14 @@ var CanvasRenderer = {
                 
                 for (var i = 0; i < cell.length; i++) {
                     var node = cell[i];
-                    var dist = Math.sqrt(Math.pow(node.x - worldX, 2) + Math.pow(node.y - worldY, 2));
+                    // Compare squared distances - this runs per node per
+                    // mousemove, so skip the sqrt/pow calls
+                    var ndx = node.x - worldX;
+                    var ndy = node.y - worldY;
+                    var distSq = ndx * ndx + ndy * ndy;
                     var hitRadius = node.state === 'unlocked' ? 14 : 10;
-                    
-                    if (dist <= hitRadius) {
+
+                    if (distSq <= hitRadius * hitRadius) {
                         return node;
                     }
                 }
@@ -751,8 +755,7 @@ var CanvasRenderer = {
         var globe = (state.treeData && state.treeData.globe) || { x: 0, y: 0, radius: 45 };
         var dx = worldX - globe.x;
         var dy = worldY - globe.y;
-        var dist = Math.sqrt(dx * dx + dy * dy);
-        return dist <= globe.radius ? globe : null;
+        return (dx * dx + dy * dy) <= globe.radius * globe.radius ? globe : null;
     },
 
     // =========================================================================
@@ -1463,6 +1466,30 @@ var CanvasRenderer = {
             return { fromNode: fromNode, toNode: toNode };
         }
 
+        // MINIMAL LOD without learning paths draws none of passes 1-3, so
+        // skip edge resolution entirely - zoomed-out minimal frames are
+        // exactly when the most edges survive viewport culling
+        if (this._lodTier !== 'minimal' || hasLearningPaths) {
+
+        // Resolve each edge ONCE per frame: node lookups, discovery checks,
+        // viewport culling, the edge-key string, and path membership were
+        // previously recomputed in every one of the three z-order passes.
+        var drawList = [];
+        for (var i = 0; i < this.edges.length; i++) {
+            var edge = this.edges[i];
+            var nodes = shouldDrawEdge(edge);
+            if (!nodes) continue;
+
+            drawList.push({
+                fromNode: nodes.fromNode,
+                toNode: nodes.toNode,
+                onSelectedPath: !!(this._selectedPathEdges &&
+                                   this._selectedPathEdges.has(edge.from + '->' + edge.to)),
+                fromOnPath: hasLearningPaths && this._learningPathNodes.has(nodes.fromNode.id),
+                toOnPath: hasLearningPaths && this._learningPathNodes.has(nodes.toNode.id)
+            });
+        }
+
         // === PASS 1: Dim/normal edges (background) ===
         // LOD: Skip entirely in MINIMAL (biggest edge savings)
         if (this._lodTier !== 'minimal') {
@@ -1471,21 +1498,13 @@ var CanvasRenderer = {
         var lodSimple = this._lodTier === 'simple';
 
         ctx.lineWidth = 1;
-        for (var i = 0; i < this.edges.length; i++) {
-            var edge = this.edges[i];
-            var nodes = shouldDrawEdge(edge);
-            if (!nodes) continue;
-
-            var fromNode = nodes.fromNode;
-            var toNode = nodes.toNode;
-            var edgeKey = edge.from + '->' + edge.to;
-            var isOnSelectedPath = this._selectedPathEdges && this._selectedPathEdges.has(edgeKey);
-            var fromOnPath = hasLearningPaths && this._learningPathNodes.has(fromNode.id);
-            var toOnPath = hasLearningPaths && this._learningPathNodes.has(toNode.id);
-            var isLearningEdge = fromOnPath && toOnPath;
+        for (var i = 0; i < drawList.length; i++) {
+            var d = drawList[i];
+            var fromNode = d.fromNode;
+            var toNode = d.toNode;
 
             // Skip selected and learning edges - they go in later passes
-            if (isOnSelectedPath || isLearningEdge) continue;
+            if (d.onSelectedPath || (d.fromOnPath && d.toOnPath)) continue;
 
             var bothUnlocked = fromNode.state === 'unlocked' && toNode.state === 'unlocked';
 
@@ -1526,42 +1545,31 @@ var CanvasRenderer = {
         var showSelectionPath = settings.showSelectionPath !== false;
 
         if (this._lodTier !== 'minimal' && hasSelectedPath && showSelectionPath) {
-            for (var i = 0; i < this.edges.length; i++) {
-                var edge = this.edges[i];
-                var nodes = shouldDrawEdge(edge);
-                if (!nodes) continue;
-
-                var edgeKey = edge.from + '->' + edge.to;
-                if (!this._selectedPathEdges.has(edgeKey)) continue;
+            for (var i = 0; i < drawList.length; i++) {
+                var d2 = drawList[i];
+                if (!d2.onSelectedPath) continue;
 
                 // Don't draw over learning edges - they get their own pass
-                var fromOnPath = hasLearningPaths && this._learningPathNodes.has(nodes.fromNode.id);
-                var toOnPath = hasLearningPaths && this._learningPathNodes.has(nodes.toNode.id);
-                if (fromOnPath && toOnPath) continue;
+                if (d2.fromOnPath && d2.toOnPath) continue;
 
                 ctx.strokeStyle = '#555555';  // Gray highlight (not pure white)
                 ctx.lineWidth = 2;
                 ctx.globalAlpha = 0.5;
 
                 ctx.beginPath();
-                this._drawEdgePath(ctx, nodes.fromNode.x, nodes.fromNode.y, nodes.toNode.x, nodes.toNode.y, curved);
+                this._drawEdgePath(ctx, d2.fromNode.x, d2.fromNode.y, d2.toNode.x, d2.toNode.y, curved);
                 ctx.stroke();
             }
         }
 
         // === PASS 3: Learning path edges (top layer) ===
         if (hasLearningPaths) {
-            for (var i = 0; i < this.edges.length; i++) {
-                var edge = this.edges[i];
-                var nodes = shouldDrawEdge(edge);
-                if (!nodes) continue;
-
-                var fromNode = nodes.fromNode;
-                var toNode = nodes.toNode;
-                var fromOnPath = this._learningPathNodes.has(fromNode.id);
-                var toOnPath = this._learningPathNodes.has(toNode.id);
+            for (var i = 0; i < drawList.length; i++) {
+                var d3 = drawList[i];
+                if (!d3.fromOnPath || !d3.toOnPath) continue;
 
-                if (!fromOnPath || !toOnPath) continue;
+                var fromNode = d3.fromNode;
+                var toNode = d3.toNode;
 
                 // Skip if animating
                 if (this._animatingPathNodes) {
@@ -1580,6 +1588,7 @@ var CanvasRenderer = {
                 ctx.stroke();
             }
         }
+        } // end minimal-LOD edge skip (passes 1-3)
 
         // === PASS 4: Chain edges for hardPrereqs on selected node ===
         // LOD: Skip in MINIMAL and SIMPLE tiers (chains are expensive + low visibility)
@@ -18,6 +18,11 @@
  *
  * Depends on: state.js (state.lastSpellData for spell lookups)
  */
+
+// Skill-level name -> tier ordinal, built once. The parent-scoring loops
+// below used to rebuild this literal per candidate.
+var CLASSIC_TIER_ORD = { 'Novice': 1, 'Apprentice': 2, 'Adept': 3, 'Expert': 4, 'Master': 5 };
+
 var ClassicLayout = {
 
     _seed: 0,
@@ -658,9 +663,8 @@ var ClassicLayout = {
                         }
 
                         // Tier ordering: parent should be at lower or equal tier
-                        var dfTierOrdMap = { 'Novice': 1, 'Apprentice': 2, 'Adept': 3, 'Expert': 4, 'Master': 5 };
-                        var defTierVal = dfTierOrdMap[def.skillLevel] || 3;
-                        var pnTierVal = dfTierOrdMap[pn.skillLevel] || 3;
+                        var defTierVal = CLASSIC_TIER_ORD[def.skillLevel] || 3;
+                        var pnTierVal = CLASSIC_TIER_ORD[pn.skillLevel] || 3;
                         if (pnTierVal > defTierVal) {
                             // Parent tier higher than child — wrong direction
                             dfScore -= 300;
@@ -810,9 +814,8 @@ var ClassicLayout = {
                         else if (fpCandTheme && fpCandTheme !== '_none') fpScore -= 20;
                     }
                     // Tier ordering: parent should be at lower or equal tier
-                    var fpTierMap = { 'Novice': 1, 'Apprentice': 2, 'Adept': 3, 'Expert': 4, 'Master': 5 };
-                    var fpNodeTier = fpTierMap[fpNode ? (fpNode.skillLevel || '') : ''] || 3;
-                    var fpCandTier = fpTierMap[fpCandidate.skillLevel || ''] || 3;
+                    var fpNodeTier = CLASSIC_TIER_ORD[fpNode ? (fpNode.skillLevel || '') : ''] || 3;
+                    var fpCandTier = CLASSIC_TIER_ORD[fpCandidate.skillLevel || ''] || 3;
                     if (fpCandTier > fpNodeTier) {
                         fpScore -= 300; // Wrong direction
                     } else if (fpCandTier === fpNodeTier - 1) {
@@ -195,6 +195,13 @@ var ClassicThemeEngine = {
     _assignThemes: function (spellTexts, keywords) {
         var assignments = {};
 
+        // Reverse index: keyword -> rank. Built once so the exact-match scan
+        // below is O(tokens) per spell instead of O(tokens x keywords)
+        var kwRank = {};
+        for (var kri = 0; kri < keywords.length; kri++) {
+            if (kwRank[keywords[kri]] === undefined) kwRank[keywords[kri]] = kri;
+        }
+
         for (var fid in spellTexts) {
             if (!spellTexts.hasOwnProperty(fid)) continue;
             var tokens = spellTexts[fid].tokens;
@@ -203,8 +210,8 @@ var ClassicThemeEngine = {
             var bestIdx = keywords.length; // lower index = higher score keyword
 
             for (var ti = 0; ti < tokens.length; ti++) {
-                var kwIdx = keywords.indexOf(tokens[ti]);
-                if (kwIdx >= 0 && kwIdx < bestIdx) {
+                var kwIdx = kwRank[tokens[ti]];
+                if (kwIdx !== undefined && kwIdx < bestIdx) {
                     bestIdx = kwIdx;
                     bestKw = tokens[ti];
                 }
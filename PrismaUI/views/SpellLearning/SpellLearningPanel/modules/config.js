@@ -23,10 +23,17 @@ var GRID_CONFIG = {
     maxTiers: 25,
     schoolPadding: 15,
     
-    // Get computed pixel values
+    // Cache for getComputedConfig() — placement loops call it once per node,
+    // and the derived values only change when nodeSize does
+    _computed: null,
+    _computedNodeSize: -1,
+
+    // Get computed pixel values (treat the returned object as read-only)
     getComputedConfig: function() {
         var ns = this.nodeSize;
-        return {
+        if (this._computed && this._computedNodeSize === ns) return this._computed;
+        this._computedNodeSize = ns;
+        return (this._computed = {
             nodeSize: ns,
             baseRadius: Math.round(ns * this.baseRadiusMultiplier),
             tierSpacing: Math.round(ns * this.tierSpacingMultiplier),
@@ -34,7 +41,7 @@ var GRID_CONFIG = {
             minNodeSpacing: Math.round(ns * this.minNodeSpacingMultiplier),
             maxTiers: this.maxTiers,
             schoolPadding: this.schoolPadding
-        };
+        });
     }
 };
 
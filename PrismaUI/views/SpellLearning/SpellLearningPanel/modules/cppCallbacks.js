@@ -90,10 +90,20 @@ window.onBuilderStatus = function(statusStr) {
 window.updateSpellData = function(jsonStr) {
     console.log('[SpellLearning] Received spell data, length:' + jsonStr.length);
 
+    // Parse once up front - the payload can be megabytes for a large load
+    // order, and the tome-scan check below used to reparse the same string
+    var data = null;
+    var parseError = null;
+    try {
+        data = JSON.parse(jsonStr);
+    } catch (e) {
+        parseError = e;
+    }
+
     // Check if this is a tome-only scan response (used for filtering, not main data)
     try {
-        var parsed = JSON.parse(jsonStr);
-        if (parsed.scanMode === 'spell_tomes') {
+        var parsed = data;
+        if (parsed && parsed.scanMode === 'spell_tomes') {
             console.log('[SpellLearning] Tome scan received: ' + (parsed.spells ? parsed.spells.length : 0) + ' tomed spells');
             state.tomedSpellIds = {};
             if (parsed.spells) {
@@ -113,17 +123,22 @@ window.updateSpellData = function(jsonStr) {
             return;
         }
     } catch (e) {
-        console.error('[SpellLearning] Failed to parse JSON for tome scan check:', e);
+        console.error('[SpellLearning] Failed tome scan check:', e);
         /* continue to normal processing */ }
 
     var scanSuccess = false;
     try {
-        var data = JSON.parse(jsonStr);
+        if (parseError) throw parseError;
         state.lastSpellData = data;
+
+        // Give every spell a stable property shape before the builders start
+        // lazily attaching memo fields (see initSpellMemoSlots in edgeScoring)
+        if (typeof initSpellMemoSlots === 'function') initSpellMemoSlots(data.spells);
         
-        var formatted = JSON.stringify(data, null, 2);
+        // Only pretty-print the full dump if there is an output area to show
+        // it in - the indented stringify of a large load order is expensive
         var outputArea = document.getElementById('outputArea');
-        if (outputArea) outputArea.value = formatted;
+        if (outputArea) outputArea.value = JSON.stringify(data, null, 2);
         
         if (state.fullAutoMode) {
             updateStatus(t('status.step2Generating', {count: data.spellCount}));
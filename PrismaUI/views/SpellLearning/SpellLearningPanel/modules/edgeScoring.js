@@ -18,6 +18,11 @@
 // ELEMENT KEYWORDS (Unified source)
 // =============================================================================
 
+// Element identity is the keyword-table key string throughout the pipeline.
+// These literals are interned by the engine, detection results are memoized
+// per spell, and every comparison (===, object-key lookup) is O(1) on the
+// interned reference - an integer-id layer would add a translation step at
+// every UI/LLM boundary without making the hot compares cheaper.
 var ELEMENT_KEYWORDS = {
     // === DESTRUCTION ELEMENTS ===
     fire: [
@@ -146,6 +151,121 @@ var TIER_MAP = {
 // ELEMENT DETECTION
 // =============================================================================
 
+/**
+ * Precompiled per-element alternation patterns. One regex test per element
+ * replaces a substring scan per keyword (~300 indexOf calls per spell).
+ * Substring semantics are preserved — no word boundaries, so "Fireball"
+ * still matches "fire". Cached per keyword table so LLM-expanded keyword
+ * sets get their own compiled patterns.
+ */
+var _elementPatternCache = { source: null, patterns: null };
+
+function getElementPatterns(keywords) {
+    if (_elementPatternCache.source === keywords) return _elementPatternCache.patterns;
+
+    var patterns = {};
+    for (var element in keywords) {
+        var escaped = keywords[element].map(function(kw) {
+            return String(kw).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+        });
+        patterns[element] = new RegExp(escaped.join('|'));
+    }
+    _elementPatternCache.source = keywords;
+    _elementPatternCache.patterns = patterns;
+    return patterns;
+}
+
+/**
+ * Memoization epoch for element detection. Detection reads mutable inputs
+ * (NLP theme data, the LLM classification cache), so cached results on the
+ * spell are only trusted while the epoch matches; call
+ * invalidateElementCache() after those inputs change.
+ */
+var _elementCacheEpoch = 1;
+
+function invalidateElementCache() {
+    _elementCacheEpoch++;
+    _scoringFlagCache.source = null;
+}
+
+/**
+ * Compiled scoring flags, keyed on the settings object identity. scoreEdge
+ * runs once per candidate pair and chased settings.scoring.* through two
+ * property levels on every call; the same settings object is used for a
+ * whole build, so the booleans are resolved once. The cache is cleared by
+ * invalidateElementCache(), which builders already call at build start, so
+ * in-place toggles on a long-lived settings object are picked up.
+ */
+var _scoringFlagCache = { source: null, flags: null };
+
+function getScoringFlags(settings) {
+    if (_scoringFlagCache.source === settings) return _scoringFlagCache.flags;
+
+    var scoring = settings.scoring;
+    var flags = {
+        elementIsolationStrict: !!settings.elementIsolationStrict,
+        elementIsolation: !!settings.elementIsolation,
+        strictTierOrdering: !!settings.strictTierOrdering,
+        allowSameTierLinks: !!settings.allowSameTierLinks,
+        elementMatching: !scoring || scoring.elementMatching !== false,
+        themeCoherence: !!scoring && scoring.themeCoherence !== false,
+        spellTypeMatching: !!scoring && scoring.spellTypeMatching !== false,
+        effectNameMatching: !!scoring && scoring.effectNameMatching !== false
+    };
+    _scoringFlagCache.source = settings;
+    _scoringFlagCache.flags = flags;
+    return flags;
+}
+
+/**
+ * Inverted index over the NLP theme lists: entry key -> theme name.
+ * Built in a single pass over the corpus so per-spell detection does three
+ * flat lookups instead of scanning every theme's spell list. Cached per
+ * themes object; a fresh NLP result gets a fresh index. Each key records the
+ * earliest theme (by scan order) that contains it, so lookups across a
+ * spell's formId/editorId/name still resolve to the theme the original
+ * theme-major scan would have hit first.
+ */
+var _nlpThemeIndexCache = { source: null, index: null };
+
+function getNlpThemeIndex(nlpThemes) {
+    if (_nlpThemeIndexCache.source === nlpThemes) return _nlpThemeIndexCache.index;
+
+    var index = {};
+    var order = 0;
+    for (var themeName in nlpThemes) {
+        var themeSpells = nlpThemes[themeName];
+        order++;
+        if (!Array.isArray(themeSpells)) continue;
+        for (var i = 0; i < themeSpells.length; i++) {
+            var entry = themeSpells[i];
+            var key = (typeof entry === 'object' && entry) ? entry.formId : entry;
+            if (key !== undefined && key !== null && !(key in index)) {
+                index[key] = { theme: themeName, order: order };
+            }
+        }
+    }
+    _nlpThemeIndexCache.source = nlpThemes;
+    _nlpThemeIndexCache.index = index;
+    return index;
+}
+
+/**
+ * Earliest-theme lookup for a spell across its identifying keys.
+ * @param {Object} index - Result of getNlpThemeIndex()
+ * @param {Object} spell
+ * @returns {string|null}
+ */
+function lookupNlpTheme(index, spell) {
+    var best = null;
+    var keys = [spell.formId, spell.editorId, spell.name];
+    for (var k = 0; k < keys.length; k++) {
+        var hit = (keys[k] !== undefined && keys[k] !== null) ? index[keys[k]] : undefined;
+        if (hit && (!best || hit.order < best.order)) best = hit;
+    }
+    return best ? best.theme : null;
+}
+
 /**
  * Detect the element/theme of a spell.
  * Priority:
@@ -153,32 +273,30 @@ var TIER_MAP = {
  *   2. LLM cache
  *   3. Keyword-based detection
  *
+ * Memoized on the spell: conflict/same-element checks call this for both
+ * spells of every candidate pair during edge scoring.
+ *
  * @param {Object} spell - Spell object with name, effectNames, description
  * @returns {string|null} - Element/theme name or null
  */
 function detectSpellElement(spell) {
     if (!spell) return null;
+    if (spell._elementEpoch === _elementCacheEpoch) return spell._element;
+
+    var element = detectSpellElementImpl(spell);
+    spell._elementEpoch = _elementCacheEpoch;
+    spell._element = element;
+    return element;
+}
 
+function detectSpellElementImpl(spell) {
     // === PRIORITY 1: TF-IDF Theme Discovery ===
     // Dynamic discovery is more accurate than hardcoded keywords
     if (window._nlpFuzzyData && window._nlpFuzzyData.themes) {
-        var nlpThemes = window._nlpFuzzyData.themes;
-        var spellId = spell.formId || spell.editorId || spell.name;
-
-        for (var themeName in nlpThemes) {
-            var themeSpells = nlpThemes[themeName];
-            if (Array.isArray(themeSpells)) {
-                // Check if spell is in this theme (by formId, editorId, or name)
-                for (var i = 0; i < themeSpells.length; i++) {
-                    var entry = themeSpells[i];
-                    if (entry === spell.formId ||
-                        entry === spell.editorId ||
-                        entry === spell.name ||
-                        (typeof entry === 'object' && entry.formId === spell.formId)) {
-                        return themeName;  // Return discovered theme
-                    }
-                }
-            }
+        var themeIndex = getNlpThemeIndex(window._nlpFuzzyData.themes);
+        var discovered = lookupNlpTheme(themeIndex, spell);
+        if (discovered !== null) {
+            return discovered;  // Return discovered theme
         }
     }
 
@@ -208,13 +326,11 @@ function detectSpellElement(spell) {
         spell.description || ''
     ].join(' ').toLowerCase();
 
-    // Check each element's keywords
-    for (var element in keywords) {
-        var kwList = keywords[element];
-        for (var i = 0; i < kwList.length; i++) {
-            if (text.indexOf(kwList[i]) >= 0) {
-                return element;
-            }
+    // Check each element's keywords (precompiled alternation per element)
+    var patterns = getElementPatterns(keywords);
+    for (var element in patterns) {
+        if (patterns[element].test(text)) {
+            return element;
         }
     }
     return null;
@@ -256,13 +372,19 @@ function hasSameElement(spell1, spell2) {
 // =============================================================================
 
 /**
- * Get the tier index (0-4) for a spell
+ * Get the tier index (0-4) for a spell.
+ * Pure over the spell, so the result is memoized on it: sort comparators and
+ * scoreEdge re-derive the tier many times per spell during a build.
  * @param {Object} spell
  * @returns {number}
  */
 function getSpellTier(spell) {
     if (!spell) return 0;
+    if (spell._tier !== undefined) return spell._tier;
+    return (spell._tier = getSpellTierImpl(spell));
+}
 
+function getSpellTierImpl(spell) {
     var level = spell.skillLevel || spell.tier || 0;
 
     // Handle string tier names
@@ -299,6 +421,72 @@ function getTierName(tierIndex) {
 // CORE SCORING FUNCTION
 // =============================================================================
 
+/**
+ * Per-spell name tokens for thematic scoring, memoized on the spell: names
+ * never change, and scoreEdge used to re-split and rescan both names for
+ * every candidate pair. The companion _scoreWordSet makes the shared-word
+ * count a hash lookup per token instead of an indexOf scan.
+ */
+function getScoreWords(spell) {
+    if (spell._scoreWords !== undefined) return spell._scoreWords;
+
+    var words = (spell.name || '').toLowerCase().split(/[^a-z]+/).filter(function(w) {
+        return w.length > 3;
+    });
+    var set = {};
+    for (var i = 0; i < words.length; i++) set[words[i]] = true;
+    spell._scoreWordSet = set;
+    return (spell._scoreWords = words);
+}
+
+/**
+ * Effect-name lookup set, memoized on the spell (same rationale as above).
+ */
+function getEffectSet(spell) {
+    if (spell._effectSet !== undefined) return spell._effectSet;
+
+    var set = {};
+    var effects = spell.effectNames || [];
+    for (var i = 0; i < effects.length; i++) set[effects[i]] = true;
+    return (spell._effectSet = set);
+}
+
+/**
+ * Predefine every lazy memo slot the scoring/builder modules attach to spell
+ * objects, in one fixed order per spell. Spells arrive from JSON.parse with
+ * identical shapes; without this, each module's first memo write (element,
+ * score words, theme text, search text, rank) mutates the object shape in
+ * whatever order the call sites happen to run, so the engine ends up with
+ * divergent hidden classes and dictionary-mode property access in the hot
+ * scoring loops. Initializing the slots up front keeps one stable shape and
+ * makes later memo writes in-place stores. All memo guards test
+ * `!== undefined`, so presetting to undefined still reads as "not computed".
+ *
+ * @param {Array} spells - Spell objects fresh from a scan
+ */
+function initSpellMemoSlots(spells) {
+    if (!spells) return;
+    for (var i = 0; i < spells.length; i++) {
+        var s = spells[i];
+        s._element = undefined;       // detectSpellElement (edgeScoring)
+        s._elementEpoch = 0;
+        s._scoreWords = undefined;    // getScoreWords (edgeScoring)
+        s._scoreWordSet = undefined;
+        s._effectSet = undefined;     // getEffectSet (edgeScoring)
+        s._tier = undefined;          // getSpellTier (edgeScoring)
+        s._themeText = undefined;     // theme text (proceduralTreeBuilder)
+        s._themeWords = undefined;
+        s._themeName = undefined;     // lowercased name (proceduralTreeBuilder)
+        s._themes = undefined;        // getSpellThemes (visualFirstBuilder)
+        s._themePair = undefined;     // getThemePairData (visualFirstBuilder)
+        s._searchText = undefined;    // extractSpellText (visualFirstBuilder)
+        s._cachedRank = undefined;    // getSpellRank (visualFirstBuilder)
+        s._tierDepth = undefined;     // getSpellTierDepth (proceduralTreeBuilder)
+        s._keywords = undefined;      // extractSpellKeywords (visualFirstBuilder)
+        s._keywordsStop = undefined;  // stop list the cached keywords were built with
+    }
+}
+
 /**
  * Score a potential edge between two spells.
  * This is THE ONLY function that decides if an edge is valid/desirable.
@@ -308,29 +496,36 @@ function getTierName(tierIndex) {
  * @param {Object} settings - Tree generation settings
  * @returns {number} - Score (negative = forbidden, 0 = neutral, positive = good)
  */
+var _emptySettings = {};
+
 function scoreEdge(fromSpell, toSpell, settings) {
     var score = 0;
-    settings = settings || {};
+    var flags = getScoringFlags(settings || _emptySettings);
 
     // =================================================================
     // ELEMENT ISOLATION - HIGHEST PRIORITY
     // =================================================================
-    var elementConflict = hasElementConflict(fromSpell, toSpell);
-    var sameElement = hasSameElement(fromSpell, toSpell);
+    // Detect each element once and compare locally; going through
+    // hasElementConflict + hasSameElement re-resolved both elements twice
+    // per scored edge
+    var fromElem = detectSpellElement(fromSpell);
+    var toElem = detectSpellElement(toSpell);
+    var bothKnown = !!(fromElem && toElem);
+    var elementConflict = bothKnown && fromElem !== toElem;
+    var sameElement = bothKnown && fromElem === toElem;
 
     if (elementConflict) {
-        if (settings.elementIsolationStrict) {
+        if (flags.elementIsolationStrict) {
             // STRICT MODE: Cross-element is FORBIDDEN
             return -10000;
-        } else if (settings.elementIsolation) {
+        } else if (flags.elementIsolation) {
             // NORMAL MODE: Heavy penalty
             score -= 500;
         }
     }
 
     // Same element bonus (only if elementMatching scoring is enabled)
-    var useElementScoring = !settings.scoring || settings.scoring.elementMatching !== false;
-    if (sameElement && useElementScoring) {
+    if (sameElement && flags.elementMatching) {
         score += 100;
     }
 
@@ -341,12 +536,12 @@ function scoreEdge(fromSpell, toSpell, settings) {
     var toTier = getSpellTier(toSpell);
     var tierDiff = toTier - fromTier;
 
-    if (settings.strictTierOrdering) {
+    if (flags.strictTierOrdering) {
         // Must go from lower to higher tier
         if (tierDiff < 0) {
             return -5000;  // Forbidden: can't go backwards
         }
-        if (tierDiff === 0 && !settings.allowSameTierLinks) {
+        if (tierDiff === 0 && !flags.allowSameTierLinks) {
             return -5000;  // Forbidden: same tier not allowed
         }
     }
@@ -363,18 +558,16 @@ function scoreEdge(fromSpell, toSpell, settings) {
     // =================================================================
     // THEMATIC MATCHING (if enabled)
     // =================================================================
-    if (settings.scoring && settings.scoring.themeCoherence !== false) {
-        var fromText = (fromSpell.name || '').toLowerCase();
-        var toText = (toSpell.name || '').toLowerCase();
-
-        // Shared word fragments (length > 3)
-        var fromWords = fromText.split(/[^a-z]+/).filter(function(w) { return w.length > 3; });
-        var toWords = toText.split(/[^a-z]+/).filter(function(w) { return w.length > 3; });
+    if (flags.themeCoherence) {
+        // Shared word fragments (length > 3) — memoized tokens + hash lookup
+        var fromWords = getScoreWords(fromSpell);
+        getScoreWords(toSpell);
+        var toWordSet = toSpell._scoreWordSet;
 
         var sharedWords = 0;
-        fromWords.forEach(function(w) {
-            if (toWords.indexOf(w) >= 0) sharedWords++;
-        });
+        for (var wi = 0; wi < fromWords.length; wi++) {
+            if (toWordSet[fromWords[wi]] === true) sharedWords++;
+        }
 
         score += sharedWords * 30;
     }
@@ -382,7 +575,7 @@ function scoreEdge(fromSpell, toSpell, settings) {
     // =================================================================
     // SPELL TYPE MATCHING (if enabled)
     // =================================================================
-    if (settings.scoring && settings.scoring.spellTypeMatching !== false) {
+    if (flags.spellTypeMatching) {
         // Same spell type bonus
         if (fromSpell.type && toSpell.type && fromSpell.type === toSpell.type) {
             score += 25;
@@ -392,15 +585,15 @@ function scoreEdge(fromSpell, toSpell, settings) {
     // =================================================================
     // EFFECT NAME MATCHING (if enabled)
     // =================================================================
-    if (settings.scoring && settings.scoring.effectNameMatching !== false) {
+    if (flags.effectNameMatching) {
         var fromEffects = fromSpell.effectNames || [];
-        var toEffects = toSpell.effectNames || [];
+        var toEffectSet = getEffectSet(toSpell);
 
         // Count shared effects
         var sharedEffects = 0;
-        fromEffects.forEach(function(e) {
-            if (toEffects.indexOf(e) >= 0) sharedEffects++;
-        });
+        for (var ei = 0; ei < fromEffects.length; ei++) {
+            if (toEffectSet[fromEffects[ei]] === true) sharedEffects++;
+        }
 
         score += sharedEffects * 20;
     }
@@ -452,6 +645,8 @@ var EdgeScoring = {
     // Element detection
     ELEMENT_KEYWORDS: ELEMENT_KEYWORDS,
     detectSpellElement: detectSpellElement,
+    invalidateElementCache: invalidateElementCache,
+    initSpellMemoSlots: initSpellMemoSlots,
     hasElementConflict: hasElementConflict,
     hasSameElement: hasSameElement,
 
@@ -469,6 +664,8 @@ var EdgeScoring = {
 // Global exports for direct access
 window.EdgeScoring = EdgeScoring;
 window.detectSpellElement = detectSpellElement;
+window.invalidateElementCache = invalidateElementCache;
+window.initSpellMemoSlots = initSpellMemoSlots;
 window.hasElementConflict = hasElementConflict;
 window.hasSameElement = hasSameElement;
 window.getSpellTier = getSpellTier;
@@ -476,4 +673,9 @@ window.scoreEdge = scoreEdge;
 window.isEdgeValid = isEdgeValid;
 window.getBestParent = getBestParent;
 
+// Compile the default keyword patterns at load so the first build does not
+// pay the regex compilation inside its detection loop; LLM-expanded tables
+// still compile on demand through the keyed cache
+getElementPatterns(ELEMENT_KEYWORDS);
+
 console.log('[EdgeScoring] Module loaded');
@@ -521,6 +521,16 @@ var SCHOOL_DEFAULT_BEHAVIORS = {
 // BEHAVIOR ENGINE
 // ============================================================
 
+/**
+ * Single-entry merge cache for getActiveParameters. The growth loop calls
+ * it once per placed spell, but the merged result only changes when the
+ * active phase does, so the same behavior+phase reuses the scratch object
+ * instead of re-copying ~20 base keys per call. Callers that add their own
+ * keys (symmetry, treeGeneration, ...) overwrite them on every call, so
+ * sharing the object between calls is safe.
+ */
+var _activeParamsCache = { behavior: null, phase: null, params: null };
+
 /**
  * Get the active behavior parameters at a given progress point
  * @param {GrowthBehavior} behavior - The base behavior profile
@@ -528,6 +538,20 @@ var SCHOOL_DEFAULT_BEHAVIORS = {
  * @returns {Object} - Merged parameters with phase overrides
  */
 function getActiveParameters(behavior, progress) {
+    // Find the active phase (last one where progress >= at)
+    var activePhase = null;
+    if (behavior.phases && behavior.phases.length > 0) {
+        for (var i = 0; i < behavior.phases.length; i++) {
+            if (progress >= behavior.phases[i].at) {
+                activePhase = behavior.phases[i];
+            }
+        }
+    }
+
+    if (_activeParamsCache.behavior === behavior && _activeParamsCache.phase === activePhase) {
+        return _activeParamsCache.params;
+    }
+
     // Start with base parameters
     var params = {};
     for (var key in behavior) {
@@ -535,79 +559,101 @@ function getActiveParameters(behavior, progress) {
             params[key] = behavior[key];
         }
     }
-    
-    // Apply phase overrides
-    if (behavior.phases && behavior.phases.length > 0) {
-        // Find the active phase (last one where progress >= at)
-        var activePhase = null;
-        for (var i = 0; i < behavior.phases.length; i++) {
-            if (progress >= behavior.phases[i].at) {
-                activePhase = behavior.phases[i];
-            }
-        }
-        
-        // Merge phase changes
-        if (activePhase && activePhase.changes) {
-            for (var changeKey in activePhase.changes) {
-                params[changeKey] = activePhase.changes[changeKey];
-            }
+
+    // Merge phase changes
+    if (activePhase && activePhase.changes) {
+        for (var changeKey in activePhase.changes) {
+            params[changeKey] = activePhase.changes[changeKey];
         }
     }
-    
+
+    _activeParamsCache.behavior = behavior;
+    _activeParamsCache.phase = activePhase;
+    _activeParamsCache.params = params;
     return params;
 }
 
 /**
- * Calculate the preferred position for a new node based on behavior
+ * Calculate preferred positions for a batch of new nodes under one parent.
+ * All per-parent invariants (tier-advance decision, wave term, spread range,
+ * sector clamp bounds) are computed ONCE; only the per-child random wander
+ * runs inside the loop. Use this when placing several children of the same
+ * parent instead of calling calculatePreferredDirection repeatedly.
+ *
+ * The per-child draws stay sequential on purpose: each child consumes the
+ * same number of rng() samples in the same order as repeated single calls,
+ * so batched and unbatched callers produce identical seeded layouts.
+ *
  * @param {Object} parent - Parent node
  * @param {Object} params - Active behavior parameters
  * @param {number} tierNodesPlaced - How many nodes in current tier
  * @param {number} tierCapacity - Estimated capacity of current tier
  * @param {Object} sliceInfo - Sector angle info
  * @param {Function} rng - Random number generator
- * @returns {Object} - Preferred {angle, radiusStep} with ADDITIVE radius step
+ * @param {number} count - How many directions to generate
+ * @returns {Array<Object>} - Array of {angle, radiusStep} (ADDITIVE radius steps)
  */
-function calculatePreferredDirection(parent, params, tierNodesPlaced, tierCapacity, sliceInfo, rng) {
+function calculatePreferredDirections(parent, params, tierNodesPlaced, tierCapacity, sliceInfo, rng, count) {
     var baseAngle = parent.angle;
     var nodeSize = 75; // Standard node size
-    
+
+    // --- Per-parent invariants (hoisted out of the per-child loop) ---
+
     // Vertical bias affects whether we go up (further out) or stay in current tier
     var tierFillRatio = tierCapacity > 0 ? tierNodesPlaced / tierCapacity : 0;
     var shouldAdvanceTier = tierFillRatio >= params.layerFillThreshold || params.verticalBias > 0.5;
-    
-    // Use ADDITIVE radius step (not multiplicative) to prevent explosion
-    var radiusStep;
-    if (shouldAdvanceTier) {
-        // Advance outward - step size based on vertical bias
-        // verticalBias -1 to +1 maps to 0.6 to 1.2 node sizes
-        radiusStep = nodeSize * (0.8 + params.verticalBias * 0.4);
-    } else {
-        // Stay roughly same distance, tiny variation
-        radiusStep = nodeSize * (0.1 + rng() * 0.25);
-    }
-    
-    // Angular wander
-    var wander = (rng() - 0.5) * 2 * params.angularWander;
-    
-    // Wave effect
+
+    // ADDITIVE radius step for the advance case (verticalBias -1..+1 maps to 0.6..1.2 node sizes)
+    var advanceStep = nodeSize * (0.8 + params.verticalBias * 0.4);
+
+    // Wave effect depends only on the parent's tier
+    var waveOffset = 0;
     if (params.waveAmplitude > 0) {
         var wavePhase = (parent.tier || 0) * params.waveFrequency;
-        wander += Math.sin(wavePhase) * params.waveAmplitude;
+        waveOffset = Math.sin(wavePhase) * params.waveAmplitude;
     }
-    
+
     // Spread factor affects how far from parent's angle we can go
     var spreadRange = sliceInfo.sectorAngle * 0.4 * params.spreadFactor;
-    wander = Math.max(-spreadRange, Math.min(spreadRange, wander));
-    
-    var newAngle = baseAngle + wander;
-    
-    // Clamp to sector
-    newAngle = Math.max(sliceInfo.startAngle + 3, Math.min(sliceInfo.endAngle - 3, newAngle));
-    
-    return {
-        angle: newAngle,
-        radiusStep: radiusStep  // ADDITIVE step, not multiplier
-    };
+
+    // Sector clamp bounds
+    var minAngle = sliceInfo.startAngle + 3;
+    var maxAngle = sliceInfo.endAngle - 3;
+
+    // --- Per-child work: just the random draws ---
+    var directions = [];
+    for (var i = 0; i < count; i++) {
+        var radiusStep = shouldAdvanceTier
+            ? advanceStep
+            : nodeSize * (0.1 + rng() * 0.25); // Stay roughly same distance, tiny variation
+
+        // Angular wander + wave
+        var wander = (rng() - 0.5) * 2 * params.angularWander + waveOffset;
+        wander = Math.max(-spreadRange, Math.min(spreadRange, wander));
+
+        var newAngle = Math.max(minAngle, Math.min(maxAngle, baseAngle + wander));
+
+        directions.push({
+            angle: newAngle,
+            radiusStep: radiusStep  // ADDITIVE step, not multiplier
+        });
+    }
+
+    return directions;
+}
+
+/**
+ * Calculate the preferred position for a new node based on behavior
+ * @param {Object} parent - Parent node
+ * @param {Object} params - Active behavior parameters
+ * @param {number} tierNodesPlaced - How many nodes in current tier
+ * @param {number} tierCapacity - Estimated capacity of current tier
+ * @param {Object} sliceInfo - Sector angle info
+ * @param {Function} rng - Random number generator
+ * @returns {Object} - Preferred {angle, radiusStep} with ADDITIVE radius step
+ */
+function calculatePreferredDirection(parent, params, tierNodesPlaced, tierCapacity, sliceInfo, rng) {
+    return calculatePreferredDirections(parent, params, tierNodesPlaced, tierCapacity, sliceInfo, rng, 1)[0];
 }
 
 /**
@@ -675,44 +721,71 @@ function shouldBeHub(node, params, nodesSinceLastHub, rng) {
  * @returns {Object} - { shouldBranch: boolean, newEnergy: number, branchCount: number }
  */
 function shouldBranch(params, currentEnergy, rng) {
-    var branchChance = params.branchChance || 0.25;
-    var energyGain = params.branchEnergyGain || 0.12;
     var energyThreshold = params.branchEnergyThreshold || 1.5;
-    
-    // Add energy bonus to chance
-    var effectiveChance = branchChance + (currentEnergy * 0.3);
-    
-    // Force branch if energy threshold reached
+
+    // Fast path: branch is forced once the energy threshold is reached,
+    // so skip the chance math and the RNG draw entirely in that case.
     var forceBranch = currentEnergy >= energyThreshold;
-    var shouldBranch = forceBranch || (rng() < effectiveChance);
-    
-    if (shouldBranch) {
-        // Calculate how many branches based on branchingFactor
-        var baseBranches = params.branchingFactor || 2;
-        var variance = params.branchingVariance || 0.3;
-        var branchCount = Math.max(2, Math.round(baseBranches + (rng() - 0.5) * baseBranches * variance));
-        
-        // Adjust based on branch style
-        if (params.branchStyle === 'linear') branchCount = Math.min(2, branchCount);
-        if (params.branchStyle === 'binary') branchCount = 2;
-        
-        return {
-            shouldBranch: true,
-            newEnergy: 0, // Reset energy after branching
-            branchCount: branchCount,
-            forced: forceBranch
-        };
+
+    if (!forceBranch) {
+        // Add energy bonus to chance
+        var branchChance = params.branchChance || 0.25;
+        var effectiveChance = branchChance + (currentEnergy * 0.3);
+
+        if (rng() >= effectiveChance) {
+            // No branch - accumulate energy
+            return {
+                shouldBranch: false,
+                newEnergy: currentEnergy + (params.branchEnergyGain || 0.12),
+                branchCount: 0,
+                forced: false
+            };
+        }
     }
-    
-    // No branch - accumulate energy
+
+    // Branching: calculate how many branches based on branchingFactor
+    var baseBranches = params.branchingFactor || 2;
+    var variance = params.branchingVariance || 0.3;
+    var branchCount = Math.max(2, Math.round(baseBranches + (rng() - 0.5) * baseBranches * variance));
+
+    // Adjust based on branch style
+    if (params.branchStyle === 'linear') branchCount = Math.min(2, branchCount);
+    if (params.branchStyle === 'binary') branchCount = 2;
+
     return {
-        shouldBranch: false,
-        newEnergy: currentEnergy + energyGain,
-        branchCount: 0,
-        forced: false
+        shouldBranch: true,
+        newEnergy: 0, // Reset energy after branching
+        branchCount: branchCount,
+        forced: forceBranch
     };
 }
 
+/**
+ * Batched form of shouldBranch: one call decides for k consecutive nodes.
+ *
+ * Energy carries over from one decision to the next and each decision
+ * consumes a data-dependent number of RNG draws (0-2), so the draws cannot
+ * be pre-pulled in bulk without changing the seeded sequence. This keeps
+ * the exact chain semantics of calling shouldBranch k times while giving
+ * builders a single call per parent instead of one per child.
+ *
+ * @param {Object} params - Active behavior parameters
+ * @param {number} currentEnergy - Branch energy going into the first decision
+ * @param {Function} rng - Random number generator
+ * @param {number} k - Number of consecutive decisions to make
+ * @returns {Array} - k results in order, each shaped like shouldBranch's return
+ */
+function shouldBranchBatch(params, currentEnergy, rng, k) {
+    var results = [];
+    var energy = currentEnergy;
+    for (var i = 0; i < k; i++) {
+        var decision = shouldBranch(params, energy, rng);
+        results.push(decision);
+        energy = decision.newEnergy;
+    }
+    return results;
+}
+
 /**
  * Subdivide a spell pool into fuzzy sub-groups for branch assignment.
  * Each branch gets spells that are thematically similar.
@@ -836,6 +909,10 @@ function getCrossConnections(nodes, params, rng) {
     var maxConnections = Math.floor(nodes.length * params.crossConnectionDensity);
     var nodeSize = 75; // Could be passed in
     var maxDist = nodeSize * params.crossConnectionMaxDist;
+    // Squared thresholds: the pair loops below only need distance
+    // comparisons, so skip the sqrt per pair
+    var maxDistSq = maxDist * maxDist;
+    var webDistSq = (maxDist * 1.5) * (maxDist * 1.5);
     
     // For web pattern, create concentric ring connections
     if (params.webPattern) {
@@ -853,11 +930,9 @@ function getCrossConnections(nodes, params, rng) {
             tierNodes.sort(function(a, b) { return a.angle - b.angle; });
             
             for (var i = 0; i < tierNodes.length - 1 && connections.length < maxConnections; i++) {
-                var dist = Math.sqrt(
-                    Math.pow(tierNodes[i].x - tierNodes[i+1].x, 2) +
-                    Math.pow(tierNodes[i].y - tierNodes[i+1].y, 2)
-                );
-                if (dist < maxDist * 1.5) {
+                var wdx = tierNodes[i].x - tierNodes[i+1].x;
+                var wdy = tierNodes[i].y - tierNodes[i+1].y;
+                if (wdx * wdx + wdy * wdy < webDistSq) {
                     connections.push({ from: tierNodes[i], to: tierNodes[i+1], type: 'web' });
                 }
             }
@@ -868,9 +943,9 @@ function getCrossConnections(nodes, params, rng) {
             for (var j = i + 2; j < nodes.length && connections.length < maxConnections; j++) {
                 var dx = nodes[i].x - nodes[j].x;
                 var dy = nodes[i].y - nodes[j].y;
-                var dist = Math.sqrt(dx * dx + dy * dy);
-                
-                if (dist < maxDist && rng() < params.crossConnectionDensity * 0.5) {
+
+                // Squared compare keeps the rng draw gated exactly as before
+                if (dx * dx + dy * dy < maxDistSq && rng() < params.crossConnectionDensity * 0.5) {
                     // Skip if already connected through tree
                     connections.push({ from: nodes[i], to: nodes[j], type: 'cross' });
                 }
@@ -890,9 +965,11 @@ if (typeof window !== 'undefined') {
     window.SCHOOL_DEFAULT_BEHAVIORS = SCHOOL_DEFAULT_BEHAVIORS;
     window.getActiveParameters = getActiveParameters;
     window.calculatePreferredDirection = calculatePreferredDirection;
+    window.calculatePreferredDirections = calculatePreferredDirections;
     window.calculateBranchCount = calculateBranchCount;
     window.shouldBeHub = shouldBeHub;
     window.shouldBranch = shouldBranch;
+    window.shouldBranchBatch = shouldBranchBatch;
     window.subdivideSpellPool = subdivideSpellPool;
     window.shouldCreateTerminalCluster = shouldCreateTerminalCluster;
     window.getCrossConnections = getCrossConnections;
@@ -904,9 +981,11 @@ if (typeof module !== 'undefined' && module.exports) {
         SCHOOL_DEFAULT_BEHAVIORS: SCHOOL_DEFAULT_BEHAVIORS,
         getActiveParameters: getActiveParameters,
         calculatePreferredDirection: calculatePreferredDirection,
+        calculatePreferredDirections: calculatePreferredDirections,
         calculateBranchCount: calculateBranchCount,
         shouldBeHub: shouldBeHub,
         shouldBranch: shouldBranch,
+        shouldBranchBatch: shouldBranchBatch,
         subdivideSpellPool: subdivideSpellPool,
         shouldCreateTerminalCluster: shouldCreateTerminalCluster,
         getCrossConnections: getCrossConnections
@@ -110,6 +110,20 @@
      * @param {Object} [params] - Key-value pairs for {{variable}} replacement
      * @returns {string} Translated string, or the key itself if not found
      */
+    // Compiled {{name}} patterns cached per parameter name - t() runs on
+    // every status update and param names are a small fixed set, so
+    // rebuilding the RegExp per call was wasted work. Safe to reuse with
+    // replace(): it ignores lastIndex on 'g' patterns.
+    var _paramPatterns = {};
+
+    function _paramPattern(name) {
+        var pattern = _paramPatterns[name];
+        if (!pattern) {
+            pattern = _paramPatterns[name] = new RegExp('\\{\\{' + name + '\\}\\}', 'g');
+        }
+        return pattern;
+    }
+
     function t(key, params) {
         var str = _translations[key];
 
@@ -122,7 +136,7 @@
         if (params) {
             for (var name in params) {
                 if (params.hasOwnProperty(name)) {
-                    str = str.replace(new RegExp('\\{\\{' + name + '\\}\\}', 'g'), params[name]);
+                    str = str.replace(_paramPattern(name), params[name]);
                 }
             }
         }
@@ -19,6 +19,11 @@
 // LAYOUT ENGINE
 // =============================================================================
 
+// Fixed angle dispatch tables for shape overrides — hoisted so the per-node
+// placement loop indexes into them instead of allocating a fresh array each call.
+var TREE_BRANCH_ANGLES = [-0.7, -0.3, 0.3, 0.7];
+var EXPLOSION_SUB_CENTERS = [-0.20, 0.18, 0];  // offsets as fractions of usableAngle
+
 // Log to SKSE log file via C++ bridge (visible in Documents/My Games/.../SKSE/SpellLearning.log)
 function _skseLog(msg) {
     if (window.callCpp) {
@@ -998,13 +1003,8 @@ var LayoutEngine = {
                         targetAngle += (rng() - 0.5) * 1.5;
                     } else if (depthRatio < 0.35) {
                         // SUB-EXPLOSIONS: cluster nodes into 3 smaller blast points
-                        var subCenters = [
-                            centerAngle - usableAngle * 0.20,  // Left sub-blast
-                            centerAngle + usableAngle * 0.18,  // Right sub-blast
-                            centerAngle                         // Center secondary
-                        ];
-                        var si = Math.floor(rng() * subCenters.length);
-                        targetAngle = subCenters[si] + (rng() - 0.5) * usableAngle * 0.12;
+                        var si = Math.floor(rng() * EXPLOSION_SUB_CENTERS.length);
+                        targetAngle = centerAngle + usableAngle * EXPLOSION_SUB_CENTERS[si] + (rng() - 0.5) * usableAngle * 0.12;
                     } else {
                         // MAIN BLAST: Push nodes to sector edges with hollow center
                         var blastProgress = (depthRatio - 0.35) / 0.65; // 0→1
@@ -1030,10 +1030,9 @@ var LayoutEngine = {
                     } else if (depthRatio < 0.50) {
                         // BRANCHES: spread children along 4 branch directions
                         var branchT = (depthRatio - 0.30) / 0.20;
-                        var branchAngles = [-0.7, -0.3, 0.3, 0.7];
                         var branchSpread = usableAngle * 0.35 * branchT;
-                        var bi = Math.floor(rng() * branchAngles.length);
-                        targetAngle = centerAngle + branchAngles[bi] * branchSpread;
+                        var bi = Math.floor(rng() * TREE_BRANCH_ANGLES.length);
+                        targetAngle = centerAngle + TREE_BRANCH_ANGLES[bi] * branchSpread;
                         targetAngle += (rng() - 0.5) * 3.0;
                     } else if (depthRatio < 0.72) {
                         // CANOPY: wide dense fill
@@ -1378,11 +1377,11 @@ var LayoutEngine = {
                 // Build tier buckets (non-root only — roots are pinned)
                 var tierBuckets = {};
                 var schoolNodeById = {};
-                var schoolAdj = {};
                 var schoolMaxTier = 0;
 
-                schoolNodes.forEach(function(n) {
+                schoolNodes.forEach(function(n, i) {
                     schoolNodeById[n.formId] = n;
+                    n._baryIdx = i;
                     var t = n._gridTier || 0;
                     if (t > schoolMaxTier) schoolMaxTier = t;
 
@@ -1391,17 +1390,27 @@ var LayoutEngine = {
                         tierBuckets[t].push(n);
                     }
 
-                    // Adjacency within this school
-                    schoolAdj[n.formId] = [];
+                    // Initial order = current angle
+                    n._baryOrder = n.angle || 0;
+                });
+
+                // Adjacency as dense index arrays — the sweep loop below reads
+                // them 20 times per node, so resolve the formId strings once
+                // here instead of hashing them on every lookup. Cross-school
+                // neighbours were always skipped at use time, so they are
+                // dropped at build time.
+                var schoolAdjIdx = [];
+                schoolNodes.forEach(function(n) {
+                    var adj = [];
                     (n.children || []).forEach(function(cid) {
-                        if (nodeByFormId[cid]) schoolAdj[n.formId].push(cid);
+                        var nb = schoolNodeById[cid];
+                        if (nb) adj.push(nb._baryIdx);
                     });
                     (n.prerequisites || []).forEach(function(pid) {
-                        if (nodeByFormId[pid]) schoolAdj[n.formId].push(pid);
+                        var nb = schoolNodeById[pid];
+                        if (nb) adj.push(nb._baryIdx);
                     });
-
-                    // Initial order = current angle
-                    n._baryOrder = n.angle || 0;
+                    schoolAdjIdx.push(adj);
                 });
 
                 // 20 barycenter sweeps alternating direction
@@ -1417,17 +1426,17 @@ var LayoutEngine = {
 
                         // Compute barycenter for each node from its neighbors' order
                         bucket.forEach(function(node) {
-                            var neighbors = schoolAdj[node.formId] || [];
+                            var neighbors = schoolAdjIdx[node._baryIdx];
                             var sum = 0, cnt = 0;
-                            neighbors.forEach(function(nid) {
-                                var nb = schoolNodeById[nid];
-                                if (!nb || nb.x === undefined) return;
+                            for (var ni = 0; ni < neighbors.length; ni++) {
+                                var nb = schoolNodes[neighbors[ni]];
+                                if (nb.x === undefined) continue;
                                 var nbTier = nb._gridTier || 0;
                                 if (Math.abs(nbTier - tier) <= 1) {
                                     sum += nb._baryOrder;
                                     cnt++;
                                 }
-                            });
+                            }
                             node._barycenter = cnt > 0 ? sum / cnt : node._baryOrder;
                         });
 
@@ -215,13 +215,18 @@ function generateFullGrid(sliceInfo, spellCount, shape, config) {
         var angleStep = candidateCount > 1 ? usableAngle / (candidateCount - 1) : 0;
         
         var addedThisTier = 0;
+        // Loop invariants hoisted: these only depend on the tier/config, and
+        // the rng draws below are data-dependent (shape mask + conditional
+        // jitter), so the draw sequence itself must stay per-candidate
+        var tierProgress = tier / numTiers;
+        var minNodesPerTier = Math.max(2, Math.floor(candidateCount * 0.3));
+        var jitterAmount = (config.jitter || 20) * (profile.jitterMult || 1);
+        var applyJitter = jitterAmount > 0 && shape !== 'grid' && tier > 2;
         for (var i = 0; i < candidateCount; i++) {
             var angleNorm = candidateCount > 1 ? i / (candidateCount - 1) : 0.5;
-            var tierProgress = tier / numTiers;
-            
+
             // APPLY SHAPE MASK - Skip nodes that don't fit the shape
             // But always keep some minimum nodes per tier for connectivity
-            var minNodesPerTier = Math.max(2, Math.floor(candidateCount * 0.3));
             var passesShapeMask = shapeMask(tierProgress, angleNorm, rng);
             
             // Force include if we haven't met minimum OR if early tiers (for connectivity)
@@ -233,8 +238,7 @@ function generateFullGrid(sliceInfo, spellCount, shape, config) {
             var baseRadius2 = radius;
             
             // Light jitter for organic look (but not too much)
-            var jitterAmount = (config.jitter || 20) * (profile.jitterMult || 1);
-            if (jitterAmount > 0 && shape !== 'grid' && tier > 2) {
+            if (applyJitter) {
                 var angleJitter = (rng() - 0.5) * 4 * (jitterAmount / 100);
                 var radiusJitter = (rng() - 0.5) * tierSpacing * 0.2 * (jitterAmount / 100);
                 baseAngle += angleJitter;
@@ -196,16 +196,22 @@ function findMissingSpells(treeData, schoolName, expectedFormIds, fullSpellData)
         });
     }
     
-    // Find missing formIds
+    // Find missing formIds as a set difference (expected - received) -
+    // indexOf scans were O(expected x received) on large schools
+    var receivedSet = {};
+    receivedFormIds.forEach(function(id) { receivedSet[id] = true; });
+
     var missingFormIds = expectedFormIds.filter(function(id) {
-        return receivedFormIds.indexOf(id) === -1;
+        return receivedSet[id] !== true;
     });
-    
+
     // Get full spell objects for missing spells
     var missingSpells = [];
     if (missingFormIds.length > 0 && fullSpellData) {
+        var missingSet = {};
+        missingFormIds.forEach(function(id) { missingSet[id] = true; });
         missingSpells = fullSpellData.filter(function(spell) {
-            return missingFormIds.indexOf(spell.formId) !== -1;
+            return missingSet[spell.formId] === true;
         });
     }
     
@@ -97,6 +97,7 @@ function classifySpellElementsWithLLM(spells, callback) {
                     llmClassificationCache.elements[formId] = classifications[formId];
                 });
                 llmClassificationCache.lastUpdated = new Date().toISOString();
+                if (typeof invalidateElementCache === 'function') invalidateElementCache();
                 console.log('[LLMTreeFeatures] Classified ' + Object.keys(classifications).length + ' spells');
                 callback(llmClassificationCache.elements);
             } catch (e) {
@@ -283,6 +284,10 @@ function expandElementKeywordsWithLLM(spells, callback) {
                     }
                 });
                 console.log('[LLMTreeFeatures] Expanded keywords:', llmClassificationCache.keywords);
+                // New keywords change the merged table and any memoized
+                // element detections derived from it
+                _mergedKeywordsCache = null;
+                if (typeof invalidateElementCache === 'function') invalidateElementCache();
                 callback(llmClassificationCache.keywords);
             } catch (e) {
                 console.error('[LLMTreeFeatures] Failed to parse keyword response:', e);
@@ -296,8 +301,17 @@ function expandElementKeywordsWithLLM(spells, callback) {
 
 /**
  * Get all known keywords (base + LLM-discovered)
+ *
+ * The merged table is cached and only rebuilt after a keyword expansion.
+ * Returning a fresh object per call defeated edgeScoring's pattern cache
+ * (keyed on table identity), which recompiled every element regex for
+ * every spell whenever LLM keyword expansion was enabled.
  */
+var _mergedKeywordsCache = null;
+
 function getAllElementKeywords() {
+    if (_mergedKeywordsCache) return _mergedKeywordsCache;
+
     var base = {
         fire: ['fire', 'flame', 'burn', 'inferno', 'blaze', 'fireball', 'incinerate', 'scorch', 'heat', 'ember', 'ignite', 'magma', 'lava', 'immolate', 'pyre', 'conflagrat'],
         frost: ['frost', 'ice', 'cold', 'freeze', 'frozen', 'blizzard', 'frostbite', 'chill', 'glacial', 'snow', 'icicle', 'icy', 'arctic', 'winter'],
@@ -313,6 +327,7 @@ function getAllElementKeywords() {
         });
     });
 
+    _mergedKeywordsCache = base;
     return base;
 }
 
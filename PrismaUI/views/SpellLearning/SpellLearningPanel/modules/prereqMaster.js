@@ -173,8 +173,11 @@
             queue.push(startNode.children[i]);
         }
 
-        while (queue.length > 0) {
-            var curId = queue.shift();
+        // Head-index queue: Array.shift() is O(n) per pop in Ultralight,
+        // turning each BFS quadratic on deep trees
+        var head = 0;
+        while (head < queue.length) {
+            var curId = queue[head++];
             if (descendants[curId]) continue;
             descendants[curId] = true;
             var curNode = allNodes.get(curId);
@@ -202,8 +205,9 @@
         }
 
         var visited = {};
-        while (queue.length > 0) {
-            var curId = queue.shift();
+        var head = 0;
+        while (head < queue.length) {
+            var curId = queue[head++];
             if (curId === candidateId) return true;
             if (visited[curId]) continue;
             visited[curId] = true;
@@ -233,8 +237,9 @@
         }
 
         var visited = {};
-        while (queue.length > 0) {
-            var curId = queue.shift();
+        var head = 0;
+        while (head < queue.length) {
+            var curId = queue[head++];
             if (curId === candidateId) return true;
             if (visited[curId]) continue;
             visited[curId] = true;
@@ -271,8 +276,9 @@
             // BFS from root following children
             var reachable = {};
             var queue = [rootId];
-            while (queue.length > 0) {
-                var curId = queue.shift();
+            var head = 0;
+            while (head < queue.length) {
+                var curId = queue[head++];
                 if (reachable[curId]) continue;
                 reachable[curId] = true;
                 var curNode = allNodes.get(curId);
@@ -297,28 +303,29 @@
     }
 
     /**
-     * Check if candidate is reachable from any root WITHOUT going through spellId.
-     * If removing spellId from the tree makes candidate unreachable, then locking
-     * spellId with candidate would create a deadlock (candidate can't be learned
-     * without first progressing through spellId's branch).
-     * @param {string} spellId - The spell being locked
-     * @param {string} candidateId - The candidate lock target
+     * BFS from all roots skipping spellId entirely, returning the map of
+     * nodes still reachable without it. A candidate missing from the map
+     * can only be learned through spellId's branch, so locking spellId
+     * behind it would create a deadlock. Computed once per spell so
+     * per-candidate deadlock checks are O(1) map lookups.
+     * @param {string} spellId - The spell being locked (excluded from BFS)
      * @param {Map} allNodes - All tree nodes
-     * @returns {boolean} True if candidate is ONLY reachable through spellId
+     * @returns {Object|null} Map of reachable formIds, or null if no roots
      */
-    function _isOnlyReachableThrough(spellId, candidateId, allNodes) {
+    function _reachableWithout(spellId, allNodes) {
         // Find all roots
         var roots = [];
         allNodes.forEach(function(node, id) {
             if (node.isRoot) roots.push(id);
         });
-        if (roots.length === 0) return false;
+        if (roots.length === 0) return null;
 
         // BFS from all roots, skipping spellId entirely
         var reachable = {};
         var queue = roots.slice();
-        while (queue.length > 0) {
-            var curId = queue.shift();
+        var head = 0;
+        while (head < queue.length) {
+            var curId = queue[head++];
             if (curId === spellId) continue; // Skip the spell being locked
             if (reachable[curId]) continue;
             reachable[curId] = true;
@@ -329,9 +336,7 @@
                 }
             }
         }
-
-        // If candidate is NOT reachable without spellId, this lock would deadlock
-        return !reachable[candidateId];
+        return reachable;
     }
 
     /**
@@ -394,8 +399,9 @@
         }
 
         var sorted = 0;
-        while (queue.length > 0) {
-            var cur = queue.shift();
+        var head = 0;
+        while (head < queue.length) {
+            var cur = queue[head++];
             sorted++;
             if (adjList[cur]) {
                 for (var j = 0; j < adjList[cur].length; j++) {
@@ -616,23 +622,20 @@
         var spellDescendants = _getDescendants(spellId, allNodes);
 
         // Pre-compute reachability WITHOUT this spell (single BFS replaces N per-candidate calls)
-        var reachableWithoutSpell = {};
-        var roots = [];
-        allNodes.forEach(function(node, nid) {
-            if (node.isRoot) roots.push(nid);
-        });
-        var bfsQueue = roots.slice();
-        while (bfsQueue.length > 0) {
-            var curId = bfsQueue.shift();
-            if (curId === spellId) continue;
-            if (reachableWithoutSpell[curId]) continue;
-            reachableWithoutSpell[curId] = true;
-            var curNode = allNodes.get(curId);
-            if (curNode && curNode.children) {
-                for (var ci = 0; ci < curNode.children.length; ci++) {
-                    bfsQueue.push(curNode.children[ci]);
-                }
-            }
+        var reachableWithoutSpell = _reachableWithout(spellId, allNodes) || {};
+
+        // Ids this spell already depends on (prereqs, hard prereqs, existing
+        // locks) - built once so the per-candidate checks below are a single
+        // map lookup instead of three list scans
+        var excludedIds = {};
+        if (spellNode.prerequisites) {
+            for (var pri = 0; pri < spellNode.prerequisites.length; pri++) excludedIds[spellNode.prerequisites[pri]] = true;
+        }
+        if (spellNode.hardPrereqs) {
+            for (var hpi = 0; hpi < spellNode.hardPrereqs.length; hpi++) excludedIds[spellNode.hardPrereqs[hpi]] = true;
+        }
+        if (spellNode.locks) {
+            for (var li = 0; li < spellNode.locks.length; li++) excludedIds[spellNode.locks[li].nodeId] = true;
         }
 
         allNodes.forEach(function(candidate, id) {
@@ -659,18 +662,9 @@
                 if (candidate.locks && candidate.locks.length > 0) return;
             }
 
-            // Can't pick a node that's already a regular prerequisite (redundant)
-            if (spellNode.prerequisites && spellNode.prerequisites.indexOf(id) !== -1) return;
-            if (spellNode.hardPrereqs && spellNode.hardPrereqs.indexOf(id) !== -1) return;
-
-            // Can't pick a node that's already a lock
-            if (spellNode.locks) {
-                var alreadyLocked = false;
-                for (var i = 0; i < spellNode.locks.length; i++) {
-                    if (spellNode.locks[i].nodeId === id) { alreadyLocked = true; break; }
-                }
-                if (alreadyLocked) return;
-            }
+            // Can't pick a node that's already a prerequisite, hard prereq,
+            // or lock (redundant / duplicate)
+            if (excludedIds[id]) return;
 
             // --- Pre-computed graph checks (O(1) lookups) ---
             // Can't lock to a descendant (creates deadlock)
@@ -1156,6 +1150,12 @@
 
                 var spellId = node.id || node.formId;
 
+                // One descendant walk + one skip-spell reachability BFS per
+                // spell; the per-candidate deadlock checks below are then
+                // O(1) lookups instead of full traversals per candidate
+                var spellDescendants = _getDescendants(spellId, nlpNodes);
+                var reachableWithoutSpell = _reachableWithout(spellId, nlpNodes);
+
                 // Use topCandidates if available (new format), fall back to bestMatch
                 var topCandidates = item.topCandidates || [{ nodeId: item.bestMatch, score: item.score }];
 
@@ -1169,7 +1169,7 @@
                         var candNode = nlpNodes ? nlpNodes.get(cId) : null;
                         if (candNode && candNode.locks && candNode.locks.length > 0) continue;
                     }
-                    if (!_isDescendant(spellId, cId, nlpNodes) && !_isOnlyReachableThrough(spellId, cId, nlpNodes)) {
+                    if (!spellDescendants[cId] && (!reachableWithoutSpell || reachableWithoutSpell[cId])) {
                         validCandidates.push(topCandidates[vi]);
                     }
                 }
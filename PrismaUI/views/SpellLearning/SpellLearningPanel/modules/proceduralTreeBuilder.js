@@ -48,6 +48,11 @@ var STOP_WORDS = [
     'novice', 'apprentice', 'adept', 'expert', 'master', 'restore', 'restores'
 ];
 
+// Hash-set form of STOP_WORDS, built once — theme discovery checks every
+// word of every spell, and indexOf rescanned the whole list per word
+var STOP_WORD_SET = {};
+STOP_WORDS.forEach(function(w) { STOP_WORD_SET[w] = true; });
+
 // =============================================================================
 // BLACKLIST FILTER
 // =============================================================================
@@ -147,6 +152,13 @@ window.filterWhitelistedSpells = filterWhitelistedSpells;
 // =============================================================================
 
 function extractSpellText(spell) {
+    // Memoized on the spell: theme discovery extracts this once per spell,
+    // then theme scoring re-extracts it for every spell x theme pair.
+    if (spell._themeText !== undefined) return spell._themeText;
+    return (spell._themeText = extractSpellTextImpl(spell));
+}
+
+function extractSpellTextImpl(spell) {
     var parts = [];
     if (spell.name) parts.push(spell.name);
     if (spell.effectNames && Array.isArray(spell.effectNames)) {
@@ -180,7 +192,7 @@ function discoverThemes(spells, topN) {
         var seenInDoc = {};
         
         words.forEach(function(word) {
-            if (STOP_WORDS.indexOf(word) !== -1) return;
+            if (STOP_WORD_SET[word] === true) return;
             wordCounts[word] = (wordCounts[word] || 0) + 1;
             if (!seenInDoc[word]) {
                 seenInDoc[word] = true;
@@ -189,29 +201,46 @@ function discoverThemes(spells, topN) {
         });
     });
     
-    var scores = [];
+    // Top-N selection without sorting the whole vocabulary: keep a small
+    // descending list and insert each word where it belongs. Inserting after
+    // equal scores matches the tie order of the previous stable full sort.
+    var top = [];
     var totalDocs = spells.length;
-    
+
     for (var word in wordCounts) {
         var tf = wordCounts[word];
         var df = docCounts[word];
         var idf = Math.log((totalDocs + 1) / (df + 1));
         var score = tf * idf;
         if (df >= 2 && df < totalDocs * 0.8) score *= 1.5;
-        scores.push({ word: word, score: score, count: tf });
+
+        if (top.length === topN && score <= top[top.length - 1].score) continue;
+        var pos = top.length;
+        while (pos > 0 && top[pos - 1].score < score) pos--;
+        top.splice(pos, 0, { word: word, score: score });
+        if (top.length > topN) top.pop();
     }
-    
-    scores.sort(function(a, b) { return b.score - a.score; });
-    return scores.slice(0, topN).map(function(s) { return s.word; });
+
+    return top.map(function(s) { return s.word; });
+}
+
+/**
+ * Sentinel "school" strings that stringified JSON nulls leave behind.
+ * One map lookup per spell replaces the chained string comparisons the
+ * school-grouping loops used to run (with slightly different chains at
+ * each site - this is the union).
+ */
+var BAD_SCHOOL_NAMES = { 'null': true, 'undefined': true, 'None': true };
+
+function normalizeSchool(school) {
+    if (!school) return 'Unknown';
+    return BAD_SCHOOL_NAMES[school] === true ? 'Hedge Wizard' : school;
 }
 
 function discoverThemesPerSchool(spells) {
     var schoolSpells = {};
     spells.forEach(function(spell) {
-        var school = spell.school || 'Unknown';
-        if (!school || school === 'null' || school === 'undefined' || school === 'None') {
-            school = 'Hedge Wizard';
-        }
+        var school = normalizeSchool(spell.school);
         if (!schoolSpells[school]) schoolSpells[school] = [];
         schoolSpells[school].push(spell);
     });
@@ -230,45 +259,31 @@ function discoverThemesPerSchool(spells) {
 
 function calculateThemeScore(spell, theme) {
     var text = extractSpellText(spell);
-    var name = (spell.name || '').toLowerCase();
+    // Lowercased name is invariant per spell but this runs once per
+    // (spell, theme) pair, so cache it like the word list below
+    var name = spell._themeName !== undefined ? spell._themeName
+        : (spell._themeName = (spell.name || '').toLowerCase());
     var score = 0;
-    
-    if (text.indexOf(theme) !== -1) score += 40;
-    if (name.indexOf(theme) !== -1) score += 50;
-    
-    var words = text.match(/[a-z]+/g) || [];
+
+    // One name scan instead of three: the name is part of the extracted
+    // text, so a name hit implies the text hit (+40) on top of the name
+    // bonus (+50), and the prefix bonus reuses the same match index
+    var nameIdx = name.indexOf(theme);
+    if (nameIdx !== -1) {
+        score += 90;
+        if (nameIdx === 0) score += 20;
+    } else if (text.indexOf(theme) !== -1) {
+        score += 40;
+    }
+
+    // Word list is invariant per spell — cache it alongside the text so the
+    // per-theme scoring loop doesn't re-tokenize on every call
+    var words = spell._themeWords || (spell._themeWords = text.match(/[a-z]+/g) || []);
     words.forEach(function(word) {
         if (word.indexOf(theme) !== -1 || theme.indexOf(word) !== -1) score += 15;
     });
-    
-    if (name.indexOf(theme) === 0) score += 20;
-    return Math.min(100, score);
-}
 
-function groupSpellsByThemes(spells, themes) {
-    var groups = {};
-    themes.forEach(function(theme) { groups[theme] = []; });
-    groups['_unassigned'] = [];
-    
-    spells.forEach(function(spell) {
-        var bestTheme = '_unassigned';
-        var bestScore = 0;
-        
-        themes.forEach(function(theme) {
-            var score = calculateThemeScore(spell, theme);
-            if (score > bestScore) {
-                bestScore = score;
-                bestTheme = theme;
-            }
-        });
-        
-        if (bestScore >= PROCEDURAL_CONFIG.minThemeScore) {
-            groups[bestTheme].push(spell);
-        } else {
-            groups['_unassigned'].push(spell);
-        }
-    });
-    return groups;
+    return Math.min(100, score);
 }
 
 // =============================================================================
@@ -280,10 +295,13 @@ function TreeNode(spell) {
     this.formId = spell.formId;
     this.name = spell.name || spell.formId;
     this.tier = spell.skillLevel || 'Unknown';
+    this.tierDepth = getSpellTierDepth(spell);  // Resolved once; readers skip the per-call map lookup
     this.children = [];
+    this.childCount = 0;  // Mirror of children.length; the capacity scans read one property instead of two
     this.prerequisites = [];
     this.depth = 0;
     this.theme = null;
+    this.themeId = 0;  // Interned theme (0 = '_unassigned'); hot filters compare this instead of the string
 }
 
 TreeNode.prototype.toDict = function() {
@@ -295,36 +313,54 @@ TreeNode.prototype.toDict = function() {
     };
 };
 
+// Tier name -> index map built once; getTierIndex runs inside sort
+// comparators, where the old indexOf was a list scan per call
+var TIER_INDEX = {};
+PROCEDURAL_CONFIG.tierOrder.forEach(function(t, i) { TIER_INDEX[t] = i; });
+
 function getTierIndex(tier) {
-    var idx = PROCEDURAL_CONFIG.tierOrder.indexOf(tier);
-    return idx >= 0 ? idx : PROCEDURAL_CONFIG.tierOrder.length;
+    var idx = TIER_INDEX[tier];
+    return idx !== undefined ? idx : PROCEDURAL_CONFIG.tierOrder.length;
+}
+
+/**
+ * Tier depth memoized on the spell object: sortByTier runs over the same
+ * spell lists several times per build (theme buckets, unassigned pass,
+ * orphan pass), and the tier never changes for a given spell.
+ */
+function getSpellTierDepth(spell) {
+    if (spell._tierDepth !== undefined) return spell._tierDepth;
+    return (spell._tierDepth = getTierIndex(spell.skillLevel));
 }
 
 function sortByTier(spells) {
-    return spells.slice().sort(function(a, b) {
-        return getTierIndex(a.skillLevel) - getTierIndex(b.skillLevel);
+    // Decorate-sort-undecorate: the tier key is resolved once per spell
+    // instead of twice per comparison inside the sort
+    var keyed = spells.map(function(s) {
+        return { spell: s, key: getSpellTierDepth(s) };
     });
+    keyed.sort(function(a, b) { return a.key - b.key; });
+    return keyed.map(function(e) { return e.spell; });
 }
 
 function selectRoot(schoolName, spells) {
-    var spellIds = {};
-    spells.forEach(function(s) { spellIds[s.formId] = s; });
-    
-    if (PROCEDURAL_CONFIG.preferVanillaRoots && VANILLA_ROOTS[schoolName]) {
-        if (spellIds[VANILLA_ROOTS[schoolName]]) return VANILLA_ROOTS[schoolName];
-    }
-    
+    // Single pass: the old version built a formId map only to answer one
+    // membership test, then swept the spell list twice more for the
+    // fallbacks. Priority is unchanged: preferred vanilla root, first
+    // vanilla-plugin Novice, first Novice, first spell.
+    var wantVanilla = PROCEDURAL_CONFIG.preferVanillaRoots ? VANILLA_ROOTS[schoolName] : undefined;
+    var firstVanillaNovice = null;
+    var firstNovice = null;
     for (var i = 0; i < spells.length; i++) {
         var spell = spells[i];
-        if (spell.formId.indexOf('0x00') === 0 && spell.skillLevel === 'Novice') {
-            return spell.formId;
+        if (wantVanilla && spell.formId === wantVanilla) return wantVanilla;
+        if (spell.skillLevel === 'Novice') {
+            if (!firstNovice) firstNovice = spell;
+            if (!firstVanillaNovice && spell.formId.indexOf('0x00') === 0) firstVanillaNovice = spell;
         }
     }
-    
-    for (var i = 0; i < spells.length; i++) {
-        if (spells[i].skillLevel === 'Novice') return spells[i].formId;
-    }
-    
+    if (firstVanillaNovice) return firstVanillaNovice.formId;
+    if (firstNovice) return firstNovice.formId;
     return spells[0].formId;
 }
 
@@ -332,78 +368,110 @@ function buildProceduralSchoolTree(schoolName, spells, themes) {
     if (!spells || spells.length === 0) return null;
     console.log('[Procedural] Building ' + schoolName + ' with ' + spells.length + ' spells');
     
+    // Single pass over the spells: score each one against the themes once
+    // and use the result for both the node's theme tag and the theme
+    // grouping. These used to be two separate O(spells x themes) scoring
+    // passes (node construction + groupSpellsByThemes).
     var nodes = {};
-    spells.forEach(function(spell) {
+    var grouped = {};
+    // Intern themes to small ints so the per-candidate comparisons in
+    // findParent and maybeAddConvergence are integer equality instead of
+    // string equality. '_unassigned' keeps the TreeNode default of 0.
+    var themeIdOf = { '_unassigned': 0 };
+    themes.forEach(function(theme, ti) {
+        grouped[theme] = [];
+        themeIdOf[theme] = ti + 1;
+    });
+    grouped['_unassigned'] = [];
+
+    // Indexed loops: this O(spells x themes) kernel runs in the
+    // interpreter, where each forEach level allocates a closure per
+    // outer iteration and dispatches a call per element. Plain loops
+    // keep the scoring pass free of that overhead.
+    var minThemeScore = PROCEDURAL_CONFIG.minThemeScore;
+    for (var si = 0; si < spells.length; si++) {
+        var spell = spells[si];
         var node = new TreeNode(spell);
         var bestTheme = '_unassigned';
         var bestScore = 0;
-        themes.forEach(function(theme) {
-            var score = calculateThemeScore(spell, theme);
-            if (score > bestScore) { bestScore = score; bestTheme = theme; }
-        });
-        node.theme = bestScore >= PROCEDURAL_CONFIG.minThemeScore ? bestTheme : '_unassigned';
+        for (var thi = 0; thi < themes.length; thi++) {
+            var score = calculateThemeScore(spell, themes[thi]);
+            if (score > bestScore) { bestScore = score; bestTheme = themes[thi]; }
+        }
+        node.theme = bestScore >= minThemeScore ? bestTheme : '_unassigned';
+        node.themeId = themeIdOf[node.theme];
+        grouped[node.theme].push(spell);
         nodes[node.formId] = node;
-    });
-    
+    }
+
     var rootId = selectRoot(schoolName, spells);
     if (!nodes[rootId]) return null;
-    
+
     var rootNode = nodes[rootId];
     rootNode.depth = 0;
-    
-    var grouped = groupSpellsByThemes(spells, themes);
+
     var connected = {};
     connected[rootId] = true;
     
     var availableParents = {};
     availableParents[0] = [rootNode];
     
+    // Pull '_unassigned' out before sorting: every remaining key is a real
+    // theme, so the comparator and the loop skip the existence fallbacks
+    // and the per-theme branch.
+    var unassignedSpells = grouped['_unassigned'];
+    delete grouped['_unassigned'];
+
     var sortedThemes = Object.keys(grouped).sort(function(a, b) {
-        return (grouped[b] || []).length - (grouped[a] || []).length;
+        return grouped[b].length - grouped[a].length;
     });
-    
-    sortedThemes.forEach(function(theme) {
-        if (theme === '_unassigned') return;
-        var themeSpells = sortByTier(grouped[theme] || []);
+
+    var maxChildren = PROCEDURAL_CONFIG.maxChildrenPerNode;
+    var convergenceAtTier = PROCEDURAL_CONFIG.convergenceAtTier;
+
+    for (var ti = 0; ti < sortedThemes.length; ti++) {
+        var themeSpells = sortByTier(grouped[sortedThemes[ti]]);
         var themeParent = null;
-        
-        themeSpells.forEach(function(spell) {
-            if (connected[spell.formId]) { themeParent = nodes[spell.formId]; return; }
-            
+
+        for (var tsi = 0; tsi < themeSpells.length; tsi++) {
+            var spell = themeSpells[tsi];
+            if (connected[spell.formId]) { themeParent = nodes[spell.formId]; continue; }
+
             var node = nodes[spell.formId];
-            var tierDepth = getTierIndex(node.tier);
-            var parent = findParent(node, themeParent, availableParents, tierDepth, theme);
-            
+            var tierDepth = node.tierDepth;
+            var parent = findParent(node, themeParent, availableParents, tierDepth);
+
             if (parent) {
                 linkNodes(parent, node);
                 connected[node.formId] = true;
-                if (node.children.length < PROCEDURAL_CONFIG.maxChildrenPerNode) {
+                if (node.childCount < maxChildren) {
                     if (!availableParents[node.depth]) availableParents[node.depth] = [];
                     availableParents[node.depth].push(node);
                 }
                 themeParent = node;
-                if (tierDepth >= PROCEDURAL_CONFIG.convergenceAtTier) {
-                    maybeAddConvergence(node, availableParents, connected, nodes);
+                if (tierDepth >= convergenceAtTier) {
+                    maybeAddConvergence(node, availableParents);
                 }
             }
-        });
-    });
-    
-    var unassigned = sortByTier(grouped['_unassigned'] || []);
-    unassigned.forEach(function(spell) {
-        if (connected[spell.formId]) return;
+        }
+    }
+
+    var unassigned = sortByTier(unassignedSpells);
+    for (var ui = 0; ui < unassigned.length; ui++) {
+        var spell = unassigned[ui];
+        if (connected[spell.formId]) continue;
         var node = nodes[spell.formId];
-        var tierDepth = getTierIndex(node.tier);
-        var parent = findParent(node, null, availableParents, tierDepth, '_unassigned');
+        var tierDepth = node.tierDepth;
+        var parent = findParent(node, null, availableParents, tierDepth);
         if (parent) {
             linkNodes(parent, node);
             connected[node.formId] = true;
-            if (node.children.length < PROCEDURAL_CONFIG.maxChildrenPerNode) {
+            if (node.childCount < maxChildren) {
                 if (!availableParents[node.depth]) availableParents[node.depth] = [];
                 availableParents[node.depth].push(node);
             }
         }
-    });
+    }
     
     connectOrphans(rootNode, nodes, connected);
     
@@ -413,90 +481,141 @@ function buildProceduralSchoolTree(schoolName, spells, themes) {
     return { root: rootId, layoutStyle: 'radial', nodes: nodeList };
 }
 
-function findParent(node, preferredParent, availableParents, targetDepth, theme) {
-    if (preferredParent && preferredParent.children.length < PROCEDURAL_CONFIG.maxChildrenPerNode) {
+function findParent(node, preferredParent, availableParents, targetDepth) {
+    // Loop-invariant config read hoisted out of the candidate scans
+    var maxChildren = PROCEDURAL_CONFIG.maxChildrenPerNode;
+    if (preferredParent && preferredParent.childCount < maxChildren) {
         return preferredParent;
     }
     
+    // Only the least-loaded candidate is ever used, so each depth is a
+    // single min-scan instead of filter + sort. Strict < keeps the first
+    // minimal element, matching what the stable sort returned before.
+    // Parents that saturated since admission are swap-removed on sight so
+    // later searches (including the full-map fallback) stop rescanning them.
     var searchDepths = [targetDepth - 1, targetDepth - 2, targetDepth];
     for (var i = 0; i < searchDepths.length; i++) {
         var depth = searchDepths[i];
         if (depth < 0) continue;
-        var candidates = (availableParents[depth] || []).filter(function(p) {
-            return p.children.length < PROCEDURAL_CONFIG.maxChildrenPerNode;
-        });
-        if (candidates.length === 0) continue;
-        
-        var sameTheme = candidates.filter(function(p) { return p.theme === theme; });
-        if (sameTheme.length > 0) {
-            sameTheme.sort(function(a, b) { return a.children.length - b.children.length; });
-            return sameTheme[0];
+        var pool = availableParents[depth] || [];
+        var bestSame = null;
+        var bestAny = null;
+        for (var p = 0; p < pool.length; p++) {
+            var candidate = pool[p];
+            if (candidate.childCount >= maxChildren) {
+                pool[p] = pool[pool.length - 1];
+                pool.pop();
+                p--;
+                continue;
+            }
+            if (!bestAny || candidate.childCount < bestAny.childCount) bestAny = candidate;
+            if (candidate.themeId === node.themeId &&
+                (!bestSame || candidate.childCount < bestSame.childCount)) bestSame = candidate;
         }
-        candidates.sort(function(a, b) { return a.children.length - b.children.length; });
-        return candidates[0];
+        if (bestSame) return bestSame;
+        if (bestAny) return bestAny;
     }
-    
+
     for (var depth in availableParents) {
-        var candidates = (availableParents[depth] || []).filter(function(p) {
-            return p.children.length < PROCEDURAL_CONFIG.maxChildrenPerNode;
-        });
-        if (candidates.length > 0) {
-            candidates.sort(function(a, b) { return a.children.length - b.children.length; });
-            return candidates[0];
+        var pool = availableParents[depth] || [];
+        var best = null;
+        for (var p = 0; p < pool.length; p++) {
+            var candidate = pool[p];
+            if (candidate.childCount >= maxChildren) {
+                pool[p] = pool[pool.length - 1];
+                pool.pop();
+                p--;
+                continue;
+            }
+            if (!best || candidate.childCount < best.childCount) best = candidate;
         }
+        if (best) return best;
     }
     return null;
 }
 
 function linkNodes(parent, child) {
     parent.children.push(child.formId);
+    parent.childCount++;
     child.prerequisites.push(parent.formId);
     child.depth = parent.depth + 1;
 }
 
-function maybeAddConvergence(node, availableParents, connected, nodes) {
+function maybeAddConvergence(node, availableParents) {
     if (Math.random() > PROCEDURAL_CONFIG.convergenceChance) return;
     if (node.prerequisites.length >= 2) return;
     
+    // availableParents doubles as the incrementally-maintained reachable
+    // set: nodes are admitted to it only right after linkNodes marks them
+    // connected, so no per-candidate connectivity check is needed here.
     for (var depth = node.depth - 1; depth >= 0; depth--) {
         var candidates = (availableParents[depth] || []).filter(function(p) {
-            return p.theme !== node.theme && node.prerequisites.indexOf(p.formId) === -1 && connected[p.formId];
+            return p.themeId !== node.themeId && node.prerequisites.indexOf(p.formId) === -1;
         });
         if (candidates.length > 0) {
             var extraPrereq = candidates[Math.floor(Math.random() * candidates.length)];
             node.prerequisites.push(extraPrereq.formId);
             extraPrereq.children.push(node.formId);
-            console.log('[Procedural] Convergence: ' + node.name + ' now requires ' + extraPrereq.name);
+            extraPrereq.childCount++;
+            debugLog('[Procedural] Convergence: ' + node.name + ' now requires ' + extraPrereq.name);
             return;
         }
     }
 }
 
 function connectOrphans(rootNode, nodes, connected) {
+    var maxChildren = PROCEDURAL_CONFIG.maxChildrenPerNode;
     var orphans = [];
+    // Candidate parents bucketed by depth: each orphan only accepts
+    // parents at depth <= its tier depth, so the min-scan walks the
+    // eligible buckets instead of filtering the whole pool per orphan.
+    // Saturated parents are still swap-removed lazily on sight.
+    var poolByDepth = {};
+    var maxPoolDepth = 0;
     for (var formId in nodes) {
-        if (!connected[formId]) orphans.push(nodes[formId]);
+        if (!connected[formId]) {
+            orphans.push(nodes[formId]);
+        } else if (nodes[formId].childCount < maxChildren) {
+            var candidate = nodes[formId];
+            if (!poolByDepth[candidate.depth]) poolByDepth[candidate.depth] = [];
+            poolByDepth[candidate.depth].push(candidate);
+            if (candidate.depth > maxPoolDepth) maxPoolDepth = candidate.depth;
+        }
     }
     if (orphans.length > 0) console.log('[Procedural] Connecting ' + orphans.length + ' orphan nodes');
-    
+
     orphans = sortByTier(orphans.map(function(n) { return n.spell; }));
-    orphans.forEach(function(spell) {
-        var orphanNode = nodes[spell.formId];
-        var tierDepth = getTierIndex(orphanNode.tier);
+    for (var oi = 0; oi < orphans.length; oi++) {
+        var orphanNode = nodes[orphans[oi].formId];
+        var tierDepth = orphanNode.tierDepth;
         var bestParent = null;
-        
-        for (var formId in nodes) {
-            if (!connected[formId]) continue;
-            var node = nodes[formId];
-            if (node.children.length >= PROCEDURAL_CONFIG.maxChildrenPerNode) continue;
-            if (node.depth > tierDepth) continue;
-            if (!bestParent || node.children.length < bestParent.children.length) bestParent = node;
+
+        var depthLimit = tierDepth < maxPoolDepth ? tierDepth : maxPoolDepth;
+        for (var d = 0; d <= depthLimit; d++) {
+            var bucket = poolByDepth[d];
+            if (!bucket) continue;
+            for (var i = 0; i < bucket.length; i++) {
+                var node = bucket[i];
+                if (node.childCount >= maxChildren) {
+                    // Saturated since admission - swap-remove and recheck slot
+                    bucket[i] = bucket[bucket.length - 1];
+                    bucket.pop();
+                    i--;
+                    continue;
+                }
+                if (!bestParent || node.childCount < bestParent.childCount) bestParent = node;
+            }
         }
         if (!bestParent) bestParent = rootNode;
-        
+
         linkNodes(bestParent, orphanNode);
         connected[orphanNode.formId] = true;
-    });
+        // Freshly attached orphans become candidates for later orphans,
+        // as they did when the scan walked the whole node map
+        if (!poolByDepth[orphanNode.depth]) poolByDepth[orphanNode.depth] = [];
+        poolByDepth[orphanNode.depth].push(orphanNode);
+        if (orphanNode.depth > maxPoolDepth) maxPoolDepth = orphanNode.depth;
+    }
 }
 
 // =============================================================================
@@ -511,10 +630,7 @@ function buildProceduralTrees(spells) {
     
     var schoolSpells = {};
     spells.forEach(function(spell) {
-        var school = spell.school || 'Unknown';
-        if (!school || school === 'null' || school === 'undefined' || school === 'None' || school === '') {
-            school = 'Hedge Wizard';
-        }
+        var school = normalizeSchool(spell.school);
         if (!schoolSpells[school]) schoolSpells[school] = [];
         schoolSpells[school].push(spell);
     });
@@ -875,17 +991,20 @@ function updateNodeConnections(nodes, nodeById, edges) {
         n.prerequisites = [];
     });
     
+    // Duplicate (from, to) pairs are the only source of duplicate children/
+    // prerequisites, so one hash set of edge keys replaces the indexOf scans
+    // over the growing arrays. First occurrence wins, preserving order.
+    var seenEdge = {};
     edges.forEach(function(e) {
         var fromNode = nodeById[e.from];
         var toNode = nodeById[e.to];
-        
+
         if (fromNode && toNode) {
-            if (fromNode.children.indexOf(e.to) === -1) {
-                fromNode.children.push(e.to);
-            }
-            if (toNode.prerequisites.indexOf(e.from) === -1) {
-                toNode.prerequisites.push(e.from);
-            }
+            var key = e.from + '->' + e.to;
+            if (seenEdge[key]) return;
+            seenEdge[key] = true;
+            fromNode.children.push(e.to);
+            toNode.prerequisites.push(e.from);
         }
     });
 }
@@ -1770,6 +1889,17 @@ var FALLBACK_AUTO_CONFIG_PROMPT =
     'Return JSON with ALL schools:\n' +
     '{"SchoolName": {"shape": "...", "growth_behavior": "...", "branching_mode": "fuzzy_groups", "slice_weight": 1.0, "density": 0.6, "branch_chance": 0.25, "branch_energy_gain": 0.12, "branch_energy_threshold": 1.8, "branch_subdivide_pool": true, "alt_path_min_distance": 4, "alt_path_max_distance": 4, "alt_path_probability": 0.3, "alt_path_max_per_node": 2, "reasoning": "..."}, ...}';
 
+// Theme words for the all-schools summary. Substring matching is intentional
+// ("Firebolt" counts as fire, "Lightning Bolt" counts both lightning and
+// light), so each word is scanned independently rather than via one
+// tokenized-set intersection.
+var SUMMARY_THEME_WORDS = ['fire', 'frost', 'ice', 'shock', 'lightning', 'flame', 'burn',
+                           'heal', 'restore', 'ward', 'cure', 'protect', 'bless',
+                           'summon', 'conjure', 'bound', 'soul', 'reanimate', 'call',
+                           'calm', 'fear', 'frenzy', 'invisible', 'muffle', 'illusion',
+                           'flesh', 'armor', 'detect', 'transmute', 'paralyze', 'light',
+                           'undead', 'daedra', 'atronach', 'familiar', 'zombie'];
+
 /**
  * Build a summary of all schools with spell counts and sample spells.
  * Used to populate the {{ALL_SCHOOLS_DATA}} placeholder in the LLM prompt.
@@ -1779,9 +1909,8 @@ function buildAllSchoolsSummary(spells) {
     
     // Group spells by school
     spells.forEach(function(spell) {
-        var school = spell.school || 'Unknown';
-        if (!school || school === 'null' || school === 'None') school = 'Hedge Wizard';
-        
+        var school = normalizeSchool(spell.school);
+
         if (!schoolData[school]) {
             schoolData[school] = {
                 count: 0,
@@ -1795,18 +1924,13 @@ function buildAllSchoolsSummary(spells) {
         
         // Extract simple themes from spell name for fuzzy context
         var name = (spell.name || '').toLowerCase();
-        var themeWords = ['fire', 'frost', 'ice', 'shock', 'lightning', 'flame', 'burn', 
-                         'heal', 'restore', 'ward', 'cure', 'protect', 'bless',
-                         'summon', 'conjure', 'bound', 'soul', 'reanimate', 'call',
-                         'calm', 'fear', 'frenzy', 'invisible', 'muffle', 'illusion',
-                         'flesh', 'armor', 'detect', 'transmute', 'paralyze', 'light',
-                         'undead', 'daedra', 'atronach', 'familiar', 'zombie'];
-        
-        themeWords.forEach(function(theme) {
-            if (name.indexOf(theme) >= 0) {
-                schoolData[school].themes[theme] = (schoolData[school].themes[theme] || 0) + 1;
-            }
-        });
+        if (name) {
+            SUMMARY_THEME_WORDS.forEach(function(theme) {
+                if (name.indexOf(theme) >= 0) {
+                    schoolData[school].themes[theme] = (schoolData[school].themes[theme] || 0) + 1;
+                }
+            });
+        }
     });
     
     // Build summary text
@@ -1857,26 +1981,32 @@ function startVisualFirstTreeConfig() {
     var llmAutoConfigCheck = visualFirstLLMCheck || document.getElementById('llmAutoConfigCheck');
     var llmGroupsCheck = document.getElementById('llmGroupsCheck');
     
+    var llmConfigEnabled = llmAutoConfigCheck ? llmAutoConfigCheck.checked : true;  // Default ON for visual-first
+
     // Build all-schools summary for LLM context
     var schoolsSummary = buildAllSchoolsSummary(state.lastSpellData.spells);
     console.log('[VisualFirst] Schools found:', schoolsSummary.schools.join(', '));
-    
-    // Get prompt template - use fallback if UI not available
+
+    // Get prompt template - use fallback if UI not available.
+    // Only consumed by the C++ LLM path, so skip the template fetch and
+    // placeholder substitution entirely when auto-config is off.
     var autoConfigPrompt = '';
-    if (typeof getAutoConfigPrompt === 'function') {
-        autoConfigPrompt = getAutoConfigPrompt();
-    }
-    if (!autoConfigPrompt || autoConfigPrompt.length < 50) {
-        console.warn('[VisualFirst] Auto-config prompt empty or too short, using fallback');
-        autoConfigPrompt = FALLBACK_AUTO_CONFIG_PROMPT;
+    if (llmConfigEnabled) {
+        if (typeof getAutoConfigPrompt === 'function') {
+            autoConfigPrompt = getAutoConfigPrompt();
+        }
+        if (!autoConfigPrompt || autoConfigPrompt.length < 50) {
+            console.warn('[VisualFirst] Auto-config prompt empty or too short, using fallback');
+            autoConfigPrompt = FALLBACK_AUTO_CONFIG_PROMPT;
+        }
+
+        // Replace {{ALL_SCHOOLS_DATA}} placeholder with actual data
+        autoConfigPrompt = autoConfigPrompt.replace('{{ALL_SCHOOLS_DATA}}', schoolsSummary.text);
+
+        console.log('[VisualFirst] Auto-config prompt length:', autoConfigPrompt.length);
+        console.log('[VisualFirst] Prompt includes', schoolsSummary.schools.length, 'schools context');
     }
     
-    // Replace {{ALL_SCHOOLS_DATA}} placeholder with actual data
-    autoConfigPrompt = autoConfigPrompt.replace('{{ALL_SCHOOLS_DATA}}', schoolsSummary.text);
-    
-    console.log('[VisualFirst] Auto-config prompt length:', autoConfigPrompt.length);
-    console.log('[VisualFirst] Prompt includes', schoolsSummary.schools.length, 'schools context');
-    
     // Build config for C++ - enable fuzzy analysis AND LLM config
     var config = {
         shape: 'organic',
@@ -1888,7 +2018,7 @@ function startVisualFirstTreeConfig() {
         
         // LLM auto-configuration for school shapes (uses checkbox setting)
         llm_auto_configure: {
-            enabled: llmAutoConfigCheck ? llmAutoConfigCheck.checked : true,  // Default ON for visual-first
+            enabled: llmConfigEnabled,
             prompt_template: autoConfigPrompt,
             // Process ALL schools in ONE LLM call for full context
             all_schools_at_once: true,
@@ -1916,8 +2046,8 @@ function startVisualFirstTreeConfig() {
         // Include fuzzy relationship data in response
         return_fuzzy_data: true,
         
-        // Pass school summary for LLM context
-        schools_summary: schoolsSummary.text
+        // Pass school summary for LLM context (only used by the LLM path)
+        schools_summary: llmConfigEnabled ? schoolsSummary.text : ''
     };
     
     // Pass API credentials to C++ for LLM calls
@@ -2070,10 +2200,7 @@ function doVisualFirstGenerate(schoolConfigs, fuzzyData) {
             
             // Group spells by school (filter blacklisted and whitelisted)
             filterWhitelistedSpells(filterBlacklistedSpells(state.lastSpellData.spells)).forEach(function(spell) {
-                var school = spell.school || 'Unknown';
-                if (!school || school === 'null' || school === 'None' || school === '') {
-                    school = 'Hedge Wizard';
-                }
+                var school = normalizeSchool(spell.school);
                 if (!spellsBySchool[school]) spellsBySchool[school] = [];
                 spellsBySchool[school].push(spell);
             });
@@ -328,6 +328,11 @@ function onLearnClick() {
     } else {
         // In "single" mode, clear ALL other learning targets first
         if (settings.learningMode === 'single') {
+            // Index nodes once instead of a linear scan per cleared target
+            var nodesById = {};
+            if (state.treeData && state.treeData.nodes) {
+                state.treeData.nodes.forEach(function(n) { nodesById[n.formId] = n; });
+            }
             for (var school in state.learningTargets) {
                 if (state.learningTargets[school]) {
                     var oldTargetId = state.learningTargets[school];
@@ -336,15 +341,13 @@ function onLearnClick() {
                     }
                     // C++ removes the early spell, update local state
                     state.playerKnownSpells.delete(oldTargetId);
-                    
+
                     // Reset old target node state from 'learning' back to 'available'
-                    if (state.treeData && state.treeData.nodes) {
-                        var oldNode = state.treeData.nodes.find(function(n) { return n.formId === oldTargetId; });
-                        if (oldNode && oldNode.state === 'learning') {
-                            oldNode.state = 'available';
-                        }
+                    var oldNode = nodesById[oldTargetId];
+                    if (oldNode && oldNode.state === 'learning') {
+                        oldNode.state = 'available';
                     }
-                    
+
                     console.log('[SpellLearning] Single mode: cleared learning target in ' + school + ' - spell removed');
                 }
             }
@@ -659,6 +662,11 @@ function autoAdvanceLearningTarget(masteredCanonId, school) {
 
     // In 'single' mode, clear ALL other learning targets first
     if (settings.learningMode === 'single') {
+        // Index nodes once instead of a linear scan per cleared target
+        var nodesById = {};
+        if (state.treeData && state.treeData.nodes) {
+            state.treeData.nodes.forEach(function(n) { nodesById[n.formId] = n; });
+        }
         for (var s in state.learningTargets) {
             if (state.learningTargets[s]) {
                 var oldTargetId = state.learningTargets[s];
@@ -668,11 +676,9 @@ function autoAdvanceLearningTarget(masteredCanonId, school) {
                 state.playerKnownSpells.delete(oldTargetId);
 
                 // Reset old target node state
-                if (state.treeData && state.treeData.nodes) {
-                    var oldNode = state.treeData.nodes.find(function(n) { return n.formId === oldTargetId; });
-                    if (oldNode && oldNode.state === 'learning') {
-                        oldNode.state = 'available';
-                    }
+                var oldNode = nodesById[oldTargetId];
+                if (oldNode && oldNode.state === 'learning') {
+                    oldNode.state = 'available';
                 }
             }
         }
@@ -79,16 +79,16 @@ function saveScannerPreset(name) {
     var s = preset.settings;
 
     // Tree Generation (~40 settings)
-    s.treeGeneration = JSON.parse(JSON.stringify(settings.treeGeneration));
+    s.treeGeneration = deepCopyPlain(settings.treeGeneration);
 
     // Root Base — Sun mode
     if (typeof TreePreviewSun !== 'undefined') {
-        s.sunSettings = JSON.parse(JSON.stringify(TreePreviewSun.settings));
+        s.sunSettings = deepCopyPlain(TreePreviewSun.settings);
     }
 
     // Root Base — Flat mode
     if (typeof TreePreviewFlat !== 'undefined') {
-        s.flatSettings = JSON.parse(JSON.stringify(TreePreviewFlat.settings));
+        s.flatSettings = deepCopyPlain(TreePreviewFlat.settings);
     }
 
     // Active preview mode
@@ -105,7 +105,7 @@ function saveScannerPreset(name) {
 
     // Classic Growth settings
     if (typeof TreeGrowthClassic !== 'undefined') {
-        s.classicSettings = JSON.parse(JSON.stringify(TreeGrowthClassic.settings));
+        s.classicSettings = deepCopyPlain(TreeGrowthClassic.settings);
     }
 
     // Tree Growth active mode (Classic, Tree, etc.)
@@ -115,7 +115,7 @@ function saveScannerPreset(name) {
 
     // Tree Growth — Tree mode settings
     if (typeof TreeGrowthTree !== 'undefined') {
-        s.treeGrowthTreeSettings = JSON.parse(JSON.stringify(TreeGrowthTree.settings));
+        s.treeGrowthTreeSettings = deepCopyPlain(TreeGrowthTree.settings);
     }
 
     // Pre Req Master (lock) settings
@@ -184,6 +184,25 @@ function _scoreEdge(fromSpell, toSpell, settings) {
 // EDGE CREATION GATE - THE SINGLE ENTRY POINT
 // =============================================================================
 
+/**
+ * Record an edge in the duplicate-tracking map.
+ * Edges are tracked as existingEdges[fromId][toId] = true — a nested map —
+ * so membership checks don't allocate a 'from->to' string key per test.
+ */
+function markEdge(existingEdges, fromId, toId) {
+    var targets = existingEdges[fromId];
+    if (!targets) targets = existingEdges[fromId] = {};
+    targets[toId] = true;
+}
+
+/**
+ * Check whether an edge is already recorded.
+ */
+function hasEdge(existingEdges, fromId, toId) {
+    var targets = existingEdges[fromId];
+    return targets !== undefined && targets[toId] === true;
+}
+
 /**
  * Attempt to create an edge. Returns true if edge was created.
  * This is THE ONLY function that adds edges to the tree.
@@ -192,17 +211,18 @@ function _scoreEdge(fromSpell, toSpell, settings) {
  * @param {Object} toNode - Target node
  * @param {Array} edges - Edge array to add to
  * @param {Object} settings - Tree generation settings
- * @param {Object} existingEdges - Set of existing edge keys
+ * @param {Object} existingEdges - Nested map of existing edges (see markEdge)
  * @param {string} edgeType - Type of edge ('primary', 'prerequisite', 'alternate')
  * @returns {boolean} - True if edge was created
  */
-function tryCreateEdge(fromNode, toNode, edges, settings, existingEdges, edgeType) {
+function tryCreateEdge(fromNode, toNode, edges, settings, existingEdges, edgeType, knownScore) {
     // Check for duplicate
-    var key = fromNode.formId + '->' + toNode.formId;
-    if (existingEdges[key]) return false;
+    if (hasEdge(existingEdges, fromNode.formId, toNode.formId)) return false;
 
-    // Score the edge
-    var edgeScore = _scoreEdge(fromNode.spell, toNode.spell, settings);
+    // Score the edge. Callers that already ran _scoreEdge while picking
+    // the candidate pass the result as knownScore so the most expensive
+    // per-edge call is not repeated just to re-confirm it is >= 0.
+    var edgeScore = knownScore !== undefined ? knownScore : _scoreEdge(fromNode.spell, toNode.spell, settings);
 
     // Reject if score is negative (forbidden by settings)
     if (edgeScore < 0) {
@@ -217,7 +237,7 @@ function tryCreateEdge(fromNode, toNode, edges, settings, existingEdges, edgeTyp
         score: edgeScore
     });
 
-    existingEdges[key] = true;
+    markEdge(existingEdges, fromNode.formId, toNode.formId);
     return true;
 }
 
@@ -351,9 +371,13 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
     // Find root (first novice spell)
     var rootSpell = sortedSpells.find(function(s) { return _getSpellTier(s) === 0; }) || sortedSpells[0];
 
-    // Create nodes
+    // Create nodes, building the formId lookup and tier grouping in the same
+    // pass instead of re-traversing the node list for each structure
+    var nodeByFormId = {};
+    var nodesByTier = {};
     spells.forEach(function(spell, idx) {
-        nodes.push({
+        var node = {
+            idx: idx,  // Monotonic index — lets hot loops use array lookups instead of formId keys
             formId: spell.formId,
             name: spell.name,
             spell: spell,
@@ -365,18 +389,11 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
             children: [],
             x: 0,  // Placeholder - will be set by LayoutEngine
             y: 0   // Placeholder - will be set by LayoutEngine
-        });
-    });
-
-    // Build node lookup
-    var nodeByFormId = {};
-    nodes.forEach(function(n) { nodeByFormId[n.formId] = n; });
-
-    // Group nodes by tier
-    var nodesByTier = {};
-    nodes.forEach(function(n) {
-        if (!nodesByTier[n.tier]) nodesByTier[n.tier] = [];
-        nodesByTier[n.tier].push(n);
+        };
+        nodes.push(node);
+        nodeByFormId[node.formId] = node;
+        if (!nodesByTier[node.tier]) nodesByTier[node.tier] = [];
+        nodesByTier[node.tier].push(node);
     });
 
     var tierNums = Object.keys(nodesByTier).map(Number).sort(function(a, b) { return a - b; });
@@ -431,7 +448,7 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                     return;
                 }
                 edges.push({ from: mainRoot.formId, to: elementRoot.formId, type: 'element-root' });
-                existingEdges[mainRoot.formId + '->' + elementRoot.formId] = true;
+                markEdge(existingEdges, mainRoot.formId, elementRoot.formId);
                 elementRoot.prerequisites.push(mainRoot.formId);
                 mainRoot.children.push(elementRoot.formId);
                 elementRoot.isElementRoot = true;
@@ -444,7 +461,7 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                 var elementRoot = tier0Elements[elem];
                 if (elementRoot && elementRoot !== node) {
                     edges.push({ from: elementRoot.formId, to: node.formId, type: 'element-sibling' });
-                    existingEdges[elementRoot.formId + '->' + node.formId] = true;
+                    markEdge(existingEdges, elementRoot.formId, node.formId);
                     node.prerequisites.push(elementRoot.formId);
                     elementRoot.children.push(node.formId);
                     stats.totalEdges++;
@@ -572,16 +589,19 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
             });
 
             if (!bestParent) {
-                // All parents full - pick any parent from pool with fewest children
-                var sorted = parentPool.slice().sort(function(a, b) {
-                    return a.children.length - b.children.length;
-                });
-                bestParent = sorted[0];
+                // All parents full - pick the pool parent with fewest children
+                // (tracked-best pass instead of copying and sorting the pool)
+                bestParent = parentPool[0];
+                for (var ppIdx = 1; ppIdx < parentPool.length; ppIdx++) {
+                    if (parentPool[ppIdx].children.length < bestParent.children.length) {
+                        bestParent = parentPool[ppIdx];
+                    }
+                }
             }
 
             // Connect node to parent
             edges.push({ from: bestParent.formId, to: node.formId, type: 'tier0-assign' });
-            existingEdges[bestParent.formId + '->' + node.formId] = true;
+            markEdge(existingEdges, bestParent.formId, node.formId);
             node.prerequisites.push(bestParent.formId);
             bestParent.children.push(node.formId);
             stats.totalEdges++;
@@ -604,64 +624,81 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
     // =================================================================
     console.log('[SettingsAwareBuilder] Phase 1: Building primary tree');
 
-    // Build root subtree tracking for multi-root balance
-    var nodeRootMap = {}; // formId -> root formId
-    var rootSubtreeSize = {}; // root formId -> count
+    // Build root subtree tracking for multi-root balance.
+    // Indexed by node.idx instead of formId so the per-candidate balance
+    // check in the scoring loop below is an array read, not a string-keyed
+    // lookup that re-hashes the formId for every candidate.
+    var nodeRootIdx = [];   // node idx -> root node idx (-1 = unassigned)
+    var subtreeSize = [];   // root node idx -> subtree node count
+    for (var szIdx = 0; szIdx < nodes.length; szIdx++) {
+        nodeRootIdx.push(-1);
+        subtreeSize.push(0);
+    }
     var multiRootBalance = (rootCount > 1);
     var idealSizePerRoot = Math.ceil(nodes.length / rootCount);
 
+    function _parentRootIdx(n) {
+        var parentNode = nodeByFormId[n.prerequisites[0]];
+        return parentNode ? nodeRootIdx[parentNode.idx] : -1;
+    }
+
     if (multiRootBalance) {
-        // Initialize from tier-0 distribution
+        // Build child lists along primary-parent pointers once, then assign
+        // roots with a single BFS from the root set. The old version relaxed
+        // to a fixed point by rescanning every node until nothing changed,
+        // O(depth x nodes); the BFS reaches the same assignment in one pass.
+        var primaryChildren = [];
+        for (var pcIdx = 0; pcIdx < nodes.length; pcIdx++) primaryChildren.push([]);
         nodes.forEach(function(n) {
-            if (n.isRoot) {
-                nodeRootMap[n.formId] = n.formId;
-                rootSubtreeSize[n.formId] = 1;
+            if (!n.isRoot && n.prerequisites.length > 0) {
+                var parentNode = nodeByFormId[n.prerequisites[0]];
+                if (parentNode) primaryChildren[parentNode.idx].push(n.idx);
             }
         });
-        // Map tier-0 children to their root
+
+        var rootQueue = [];
         nodes.forEach(function(n) {
-            if (!n.isRoot && n.prerequisites.length > 0) {
-                var parentId = n.prerequisites[0];
-                var rootId = nodeRootMap[parentId];
-                if (rootId) {
-                    nodeRootMap[n.formId] = rootId;
-                    rootSubtreeSize[rootId] = (rootSubtreeSize[rootId] || 0) + 1;
-                }
+            if (n.isRoot) {
+                nodeRootIdx[n.idx] = n.idx;
+                subtreeSize[n.idx] = 1;
+                rootQueue.push(n.idx);
             }
         });
-        // Walk deeper for cascaded tier-0 nodes
-        var changed = true;
-        while (changed) {
-            changed = false;
-            nodes.forEach(function(n) {
-                if (!nodeRootMap[n.formId] && n.prerequisites.length > 0) {
-                    var parentRoot = nodeRootMap[n.prerequisites[0]];
-                    if (parentRoot) {
-                        nodeRootMap[n.formId] = parentRoot;
-                        rootSubtreeSize[parentRoot] = (rootSubtreeSize[parentRoot] || 0) + 1;
-                        changed = true;
-                    }
+        var rootQueueHead = 0;
+        while (rootQueueHead < rootQueue.length) {
+            var curIdx = rootQueue[rootQueueHead++];
+            var curRoot = nodeRootIdx[curIdx];
+            var childIdxs = primaryChildren[curIdx];
+            for (var ci = 0; ci < childIdxs.length; ci++) {
+                if (nodeRootIdx[childIdxs[ci]] < 0) {
+                    nodeRootIdx[childIdxs[ci]] = curRoot;
+                    subtreeSize[curRoot]++;
+                    rootQueue.push(childIdxs[ci]);
                 }
-            });
+            }
         }
-        console.log('[SettingsAwareBuilder] Initial subtree sizes:', Object.keys(rootSubtreeSize).map(function(rid) {
-            var rn = nodeByFormId[rid];
-            return (rn ? rn.name : rid) + '=' + rootSubtreeSize[rid];
+        console.log('[SettingsAwareBuilder] Initial subtree sizes:', nodes.filter(function(n) {
+            return n.isRoot;
+        }).map(function(rn) {
+            return rn.name + '=' + subtreeSize[rn.idx];
         }).join(', '));
     }
 
+    // Root set is fixed once root configuration is done — collect it once
+    // instead of rescanning all nodes in the per-orphan rescue path below
+    var rootNodes = nodes.filter(function(n) { return n.isRoot; });
+
+    // Parent candidates grow incrementally: each tier adds the previous
+    // tier's nodes instead of rebuilding the whole lower-tier list per tier
+    var parentCandidates = [];
+
     for (var tIdx = 1; tIdx < tierNums.length; tIdx++) {
         var currentTier = tierNums[tIdx];
         var currentNodes = nodesByTier[currentTier] || [];
 
-        // Get all potential parents (lower tiers)
-        var parentCandidates = [];
-        for (var pIdx = 0; pIdx < tIdx; pIdx++) {
-            var parentTier = tierNums[pIdx];
-            (nodesByTier[parentTier] || []).forEach(function(n) {
-                parentCandidates.push(n);
-            });
-        }
+        (nodesByTier[tierNums[tIdx - 1]] || []).forEach(function(n) {
+            parentCandidates.push(n);
+        });
 
         // Connect each node to best parent
         currentNodes.forEach(function(node) {
@@ -669,50 +706,57 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
 
             // Score all candidates, respecting maxChildrenPerNode
             // NO EXEMPTIONS - all nodes respect child limits to enable cascading/branching
-            var scored = parentCandidates.map(function(parent) {
-                var baseScore = _scoreEdge(parent.spell, node.spell, settings);
+            // Single argmax scan: only the best valid candidate and the
+            // rejection count are ever used, so there is no need to
+            // materialize, filter, and sort a scored array per node. Ties
+            // keep the earlier candidate with fewer children, matching the
+            // old stable sort order.
+            var best = null;
+            var bestScore = 0;
+            var bestRawScore = 0;
+            var bestChildCount = 0;
+            var validCount = 0;
+            for (var candIdx = 0; candIdx < parentCandidates.length; candIdx++) {
+                var cand = parentCandidates[candIdx];
+                var candChildren = cand.children.length;
+                if (candChildren >= maxChildrenPerNode) continue;
+
+                var rawScore = _scoreEdge(cand.spell, node.spell, settings);
+                var baseScore = rawScore;
 
                 // Apply subtree balance penalty in multi-root mode
-                if (multiRootBalance && nodeRootMap[parent.formId]) {
-                    var parentRootId = nodeRootMap[parent.formId];
-                    var subtreeSize = rootSubtreeSize[parentRootId] || 0;
+                if (multiRootBalance && nodeRootIdx[cand.idx] >= 0) {
+                    var parentSubtreeSize = subtreeSize[nodeRootIdx[cand.idx]];
                     // Start penalizing at 80% of ideal, escalate non-linearly
                     var threshold = idealSizePerRoot * 0.8;
-                    if (subtreeSize > threshold) {
-                        var overload = (subtreeSize - threshold) / idealSizePerRoot;
+                    if (parentSubtreeSize > threshold) {
+                        var overload = (parentSubtreeSize - threshold) / idealSizePerRoot;
                         baseScore -= Math.floor(overload * 80 + overload * overload * 120);
                     }
                 }
 
-                return {
-                    node: parent,
-                    score: baseScore,
-                    childCount: parent.children.length
-                };
-            }).filter(function(s) {
-                // Only valid edges AND hasn't reached max children
-                return s.score >= 0 && s.childCount < maxChildrenPerNode;
-            }).sort(function(a, b) {
-                // Primary sort: score (higher is better)
-                if (b.score !== a.score) {
-                    return b.score - a.score;
+                if (baseScore < 0) continue;
+                validCount++;
+                if (best === null || baseScore > bestScore ||
+                    (baseScore === bestScore && candChildren < bestChildCount)) {
+                    best = cand;
+                    bestScore = baseScore;
+                    bestRawScore = rawScore;
+                    bestChildCount = candChildren;
                 }
-                // Tie-breaker: prefer parent with fewer children (load balance)
-                return a.childCount - b.childCount;
-            });
+            }
 
             // Track rejections for stats
-            var rejected = parentCandidates.length - scored.length;
+            var rejected = parentCandidates.length - validCount;
             if (settings.elementIsolationStrict || settings.elementIsolation) {
                 stats.rejectedCrossElement += rejected;
             }
 
             // Connect to best parent
-            if (scored.length > 0) {
-                var best = scored[0];
-                if (tryCreateEdge(best.node, node, edges, settings, existingEdges, 'primary')) {
-                    node.prerequisites.push(best.node.formId);
-                    best.node.children.push(node.formId);
+            if (best !== null) {
+                if (tryCreateEdge(best, node, edges, settings, existingEdges, 'primary', bestRawScore)) {
+                    node.prerequisites.push(best.formId);
+                    best.children.push(node.formId);
                     stats.totalEdges++;
                     nodesSinceLastHub++;
 
@@ -725,7 +769,7 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                                 node.isHub = true;
                                 nodesSinceLastHub = 0;
                                 stats.hubsCreated++;
-                                console.log('[SettingsAwareBuilder] Created hub:', node.name);
+                                debugLog('[SettingsAwareBuilder] Created hub:', node.name);
                             }
                         }
                     }
@@ -746,7 +790,7 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                     if (hubCandidate) {
                         hubCandidate.isHub = true;
                         stats.hubsCreated++;
-                        console.log('[SettingsAwareBuilder] Promoted to hub (cascade):', hubCandidate.name);
+                        debugLog('[SettingsAwareBuilder] Promoted to hub (cascade):', hubCandidate.name);
                         availableFallbacks = [hubCandidate];
                     } else {
                         // All are already hubs - use the one with fewest children
@@ -763,11 +807,11 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                     type: 'cascaded',
                     score: 0
                 });
-                existingEdges[fallback.formId + '->' + node.formId] = true;
+                markEdge(existingEdges, fallback.formId, node.formId);
                 node.prerequisites.push(fallback.formId);
                 fallback.children.push(node.formId);
                 stats.totalEdges++;
-                console.log('[SettingsAwareBuilder] Cascaded (non-strict):', node.name, '-> ' + fallback.name);
+                debugLog('[SettingsAwareBuilder] Cascaded (non-strict):', node.name, '-> ' + fallback.name);
             } else if (parentCandidates.length > 0 && settings.elementIsolationStrict) {
                 // In strict mode: NO exemptions - cascade through same-element chain
                 // Find any same-element node that has room for children
@@ -798,7 +842,7 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                         node.prerequisites.push(availableParent.formId);
                         availableParent.children.push(node.formId);
                         stats.totalEdges++;
-                        console.log('[SettingsAwareBuilder] Cascaded:', node.name, '-> ' + availableParent.name + ' (children: ' + availableParent.children.length + ')');
+                        debugLog('[SettingsAwareBuilder] Cascaded:', node.name, '-> ' + availableParent.name + ' (children: ' + availableParent.children.length + ')');
                     }
                 } else if (sameElementNodes.length > 0) {
                     // All same-element parents are FULL - need to promote one to hub
@@ -819,7 +863,7 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                         if (hubCandidate) {
                             hubCandidate.isHub = true;
                             stats.hubsCreated++;
-                            console.log('[SettingsAwareBuilder] Promoted to hub (overflow):', hubCandidate.name, '(' + node.element + ')');
+                            debugLog('[SettingsAwareBuilder] Promoted to hub (overflow):', hubCandidate.name, '(' + node.element + ')');
 
                             // Now connect to the new hub
                             if (tryCreateEdge(hubCandidate, node, edges, settings, existingEdges, 'hub-connect')) {
@@ -833,7 +877,7 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                             if (anyCandidate) {
                                 anyCandidate.isHub = true;
                                 stats.hubsCreated++;
-                                console.log('[SettingsAwareBuilder] Promoted to hub (last resort):', anyCandidate.name);
+                                debugLog('[SettingsAwareBuilder] Promoted to hub (last resort):', anyCandidate.name);
                                 if (tryCreateEdge(anyCandidate, node, edges, settings, existingEdges, 'hub-connect')) {
                                     node.prerequisites.push(anyCandidate.formId);
                                     anyCandidate.children.push(node.formId);
@@ -844,47 +888,45 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                     }
                 } else {
                     // No same-element nodes at all - connect to a node with room
-                    console.log('[SettingsAwareBuilder] No same-element nodes for', node.name, '(' + node.element + ') - finding available parent');
+                    debugLog('[SettingsAwareBuilder] No same-element nodes for', node.name, '(' + node.element + ') - finding available parent');
 
                     // Find any node with room (prefer same-element root, then any root, then any node)
-                    var rescueParent = nodes.find(function(n) { return n.isRoot && n.element === node.element && n.children.length < maxChildrenPerNode; }) ||
-                                       nodes.find(function(n) { return n.isRoot && n.children.length < maxChildrenPerNode; }) ||
+                    var rescueParent = rootNodes.find(function(n) { return n.element === node.element && n.children.length < maxChildrenPerNode; }) ||
+                                       rootNodes.find(function(n) { return n.children.length < maxChildrenPerNode; }) ||
                                        nodes.find(function(n) { return n.tier < node.tier && n.children.length < maxChildrenPerNode; });
 
                     if (rescueParent) {
-                        var key = rescueParent.formId + '->' + node.formId;
-                        if (!existingEdges[key]) {
+                        if (!hasEdge(existingEdges, rescueParent.formId, node.formId)) {
                             edges.push({
                                 from: rescueParent.formId,
                                 to: node.formId,
                                 type: 'orphan-rescue',
                                 score: 0
                             });
-                            existingEdges[key] = true;
+                            markEdge(existingEdges, rescueParent.formId, node.formId);
                             node.prerequisites.push(rescueParent.formId);
                             rescueParent.children.push(node.formId);
                             stats.totalEdges++;
-                            console.log('[SettingsAwareBuilder] Orphan rescue:', node.name, '(' + node.element + ') -> ' + rescueParent.name);
+                            debugLog('[SettingsAwareBuilder] Orphan rescue:', node.name, '(' + node.element + ') -> ' + rescueParent.name);
                         }
                     }
                 }
             }
 
             // Catch-all root subtree tracking: if node got connected, map it to parent's root
-            if (multiRootBalance && node.prerequisites.length > 0 && !nodeRootMap[node.formId]) {
-                var parentRoot = nodeRootMap[node.prerequisites[0]];
-                if (parentRoot) {
-                    nodeRootMap[node.formId] = parentRoot;
-                    rootSubtreeSize[parentRoot] = (rootSubtreeSize[parentRoot] || 0) + 1;
+            if (multiRootBalance && node.prerequisites.length > 0 && nodeRootIdx[node.idx] < 0) {
+                var parentRoot = _parentRootIdx(node);
+                if (parentRoot >= 0) {
+                    nodeRootIdx[node.idx] = parentRoot;
+                    subtreeSize[parentRoot]++;
                 }
             }
         });
     }
 
     if (multiRootBalance) {
-        console.log('[SettingsAwareBuilder] Final subtree sizes:', Object.keys(rootSubtreeSize).map(function(rid) {
-            var rn = nodeByFormId[rid];
-            return (rn ? rn.name : rid) + '=' + rootSubtreeSize[rid];
+        console.log('[SettingsAwareBuilder] Final subtree sizes:', rootNodes.map(function(rn) {
+            return rn.name + '=' + subtreeSize[rn.idx];
         }).join(', '));
     }
 
@@ -908,25 +950,34 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
             if (rng() > convergenceChance) return;
             if (node.prerequisites.length >= 2) return;  // Already has multiple
 
-            // Find additional parent candidates (respecting maxChildrenPerNode)
+            // Find additional parent candidates (respecting maxChildrenPerNode).
+            // Scan only the lower-tier buckets instead of all nodes - the
+            // tier filter rejected most of the full scan anyway. Ties sort
+            // on creation index so bucket order matches the old full-scan
+            // order.
             var candidates = [];
-            nodes.forEach(function(other) {
-                if (other.tier >= node.tier) return;
-                if (node.prerequisites.indexOf(other.formId) >= 0) return;
-                // Skip parents that have reached max children
-                if (other.children.length >= maxChildrenPerNode) return;
-
-                var edgeScore = _scoreEdge(other.spell, node.spell, settings);
-                if (edgeScore >= 0) {
-                    candidates.push({ node: other, score: edgeScore });
+            for (var bIdx = 0; bIdx < tierNums.length && tierNums[bIdx] < node.tier; bIdx++) {
+                var bucket = nodesByTier[tierNums[bIdx]];
+                for (var oIdx = 0; oIdx < bucket.length; oIdx++) {
+                    var other = bucket[oIdx];
+                    if (node.prerequisites.indexOf(other.formId) >= 0) continue;
+                    // Skip parents that have reached max children
+                    if (other.children.length >= maxChildrenPerNode) continue;
+
+                    var edgeScore = _scoreEdge(other.spell, node.spell, settings);
+                    if (edgeScore >= 0) {
+                        candidates.push({ node: other, score: edgeScore });
+                    }
                 }
-            });
+            }
 
-            candidates.sort(function(a, b) { return b.score - a.score; });
+            candidates.sort(function(a, b) {
+                return (b.score - a.score) || (a.node.idx - b.node.idx);
+            });
 
             if (candidates.length > 0) {
                 var pick = candidates[Math.floor(rng() * Math.min(3, candidates.length))];
-                if (tryCreateEdge(pick.node, node, edges, settings, existingEdges, 'convergence')) {
+                if (tryCreateEdge(pick.node, node, edges, settings, existingEdges, 'convergence', pick.score)) {
                     node.prerequisites.push(pick.node.formId);
                     pick.node.children.push(node.formId);
                     stats.totalEdges++;
@@ -969,20 +1020,23 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
                 stats.totalEdges, 'edges,',
                 stats.rejectedCrossElement, 'rejected for cross-element');
 
-    // DIAGNOSTIC: Verify children arrays are populated
-    var nodesWithChildren = outputNodes.filter(function(n) { return n.children && n.children.length > 0; });
-    var nodesWithPrereqs = outputNodes.filter(function(n) { return n.prerequisites && n.prerequisites.length > 0; });
-    console.log('[SettingsAwareBuilder] DIAGNOSTIC: Nodes with children:', nodesWithChildren.length + '/' + outputNodes.length);
-    console.log('[SettingsAwareBuilder] DIAGNOSTIC: Nodes with prerequisites:', nodesWithPrereqs.length + '/' + outputNodes.length);
-    if (outputNodes.length > 0) {
-        var rootNode = outputNodes.find(function(n) { return n.isRoot; });
-        if (rootNode) {
-            console.log('[SettingsAwareBuilder] DIAGNOSTIC: Root node children count:', rootNode.children ? rootNode.children.length : 0);
-        }
+    // DIAGNOSTIC: Verify children arrays are populated - one pass for the
+    // tallies and the root pick instead of two filters plus two finds
+    var nodesWithChildren = 0;
+    var nodesWithPrereqs = 0;
+    var actualRoot = null;
+    outputNodes.forEach(function(n) {
+        if (n.children && n.children.length > 0) nodesWithChildren++;
+        if (n.prerequisites && n.prerequisites.length > 0) nodesWithPrereqs++;
+        if (!actualRoot && n.isRoot) actualRoot = n;
+    });
+    console.log('[SettingsAwareBuilder] DIAGNOSTIC: Nodes with children:', nodesWithChildren + '/' + outputNodes.length);
+    console.log('[SettingsAwareBuilder] DIAGNOSTIC: Nodes with prerequisites:', nodesWithPrereqs + '/' + outputNodes.length);
+    if (actualRoot) {
+        console.log('[SettingsAwareBuilder] DIAGNOSTIC: Root node children count:', actualRoot.children ? actualRoot.children.length : 0);
     }
 
     // Use the first actual root node (may differ from initial rootSpell in multi-root mode)
-    var actualRoot = outputNodes.find(function(n) { return n.isRoot; });
     var rootFormId = actualRoot ? actualRoot.formId : rootSpell.formId;
 
     return {
@@ -993,6 +1047,18 @@ function buildSchoolTree(spells, settings, seed, schoolName, schoolConfig, nlpDa
     };
 }
 
+/**
+ * Map sentinel "school" strings (stringified JSON nulls) to 'Unknown'.
+ * One lookup per spell instead of a chain of string comparisons in the
+ * school-grouping loops.
+ */
+var _SCHOOL_SENTINELS = { 'null': true, 'None': true };
+
+function _normalizeSchool(school) {
+    if (!school || _SCHOOL_SENTINELS[school] === true) return 'Unknown';
+    return school;
+}
+
 /**
  * Simple seeded random number generator
  */
@@ -1035,6 +1101,7 @@ function buildAllTreesSettingsAware(allSpells, schoolConfigs, treeGeneration, fu
     // Store NLP fuzzy data for EdgeScoring to use
     var nlpData = fuzzyData || {};
     window._nlpFuzzyData = nlpData;  // Global for EdgeScoring access
+    if (typeof invalidateElementCache === 'function') invalidateElementCache();
 
     if (nlpData.themes && Object.keys(nlpData.themes).length > 0) {
         console.log('[SettingsAwareBuilder] NLP THEMES AVAILABLE:');
@@ -1061,8 +1128,7 @@ function buildAllTreesSettingsAware(allSpells, schoolConfigs, treeGeneration, fu
     // Group spells by school
     var spellsBySchool = {};
     allSpells.forEach(function(spell) {
-        var school = spell.school || 'Unknown';
-        if (!school || school === 'null' || school === 'None') school = 'Unknown';
+        var school = _normalizeSchool(spell.school);
         if (!spellsBySchool[school]) spellsBySchool[school] = [];
         spellsBySchool[school].push(spell);
     });
@@ -1072,25 +1138,18 @@ function buildAllTreesSettingsAware(allSpells, schoolConfigs, treeGeneration, fu
     var totalStats = { totalEdges: 0, rejectedCrossElement: 0, hubsCreated: 0 };
 
     for (var schoolName in spellsBySchool) {
-        var spells = spellsBySchool[schoolName];
-        var schoolSeed = seed + hashString(schoolName);
-        var schoolConfig = schoolConfigs ? schoolConfigs[schoolName] : null;
-
-        console.log('[SettingsAwareBuilder] Processing', schoolName, '(' + spells.length + ' spells)');
-
-        var result = buildSchoolTree(spells, treeGeneration, schoolSeed, schoolName, schoolConfig, nlpData);
-
-        schools[schoolName] = {
-            root: result.root,
-            nodes: result.nodes,
-            links: result.links
-        };
-
-        totalStats.totalEdges += result.stats.totalEdges;
-        totalStats.rejectedCrossElement += result.stats.rejectedCrossElement;
-        totalStats.hubsCreated += result.stats.hubsCreated || 0;
+        _buildOneSchool(schoolName, spellsBySchool[schoolName], schools, totalStats,
+                        treeGeneration, seed, schoolConfigs, nlpData);
     }
 
+    return _finalizeBuild(schools, totalStats, treeGeneration, schoolConfigs, seed);
+}
+
+/**
+ * Assemble the final tree object and apply positions.
+ * Shared by the synchronous build and the chunked scheduler.
+ */
+function _finalizeBuild(schools, totalStats, treeGeneration, schoolConfigs, seed) {
     console.log('[SettingsAwareBuilder] COMPLETE');
     console.log('  Total edges:', totalStats.totalEdges);
     console.log('  Rejected cross-element:', totalStats.rejectedCrossElement);
@@ -1129,6 +1188,78 @@ function buildAllTreesSettingsAware(allSpells, schoolConfigs, treeGeneration, fu
     return result;
 }
 
+/**
+ * Chunked build: each school is built on its own event-loop tick.
+ *
+ * Per-school builds are independent, but Ultralight has no worker threads,
+ * so the closest we can get to running them in parallel is not blocking the
+ * UI thread for the whole batch — one school per tick lets the view stay
+ * responsive during large-load-order builds. Results are identical to
+ * buildAllTreesSettingsAware for the same inputs.
+ *
+ * @param {Array} allSpells - All spells to build trees for
+ * @param {Object} schoolConfigs - Per-school configurations
+ * @param {Object} treeGeneration - Tree generation settings
+ * @param {Object} fuzzyData - NLP fuzzy data (or null)
+ * @param {Function} callback - Called with the finished tree object
+ */
+function buildAllTreesSettingsAwareChunked(allSpells, schoolConfigs, treeGeneration, fuzzyData, callback) {
+    var nlpData = fuzzyData || {};
+    window._nlpFuzzyData = nlpData;
+    if (typeof invalidateElementCache === 'function') invalidateElementCache();
+
+    var seed = Date.now();
+
+    var spellsBySchool = {};
+    allSpells.forEach(function(spell) {
+        var school = _normalizeSchool(spell.school);
+        if (!spellsBySchool[school]) spellsBySchool[school] = [];
+        spellsBySchool[school].push(spell);
+    });
+
+    var schoolNames = Object.keys(spellsBySchool);
+    var schools = {};
+    var totalStats = { totalEdges: 0, rejectedCrossElement: 0, hubsCreated: 0 };
+    var next = 0;
+
+    function buildNext() {
+        if (next >= schoolNames.length) {
+            var result = _finalizeBuild(schools, totalStats, treeGeneration, schoolConfigs, seed);
+            if (callback) callback(result);
+            return;
+        }
+        var schoolName = schoolNames[next++];
+        _buildOneSchool(schoolName, spellsBySchool[schoolName], schools, totalStats,
+                        treeGeneration, seed, schoolConfigs, nlpData);
+        setTimeout(buildNext, 0);
+    }
+
+    buildNext();
+}
+
+/**
+ * Build one school's tree and accumulate it into the shared results.
+ * Shared by the synchronous loop above and the chunked scheduler below.
+ */
+function _buildOneSchool(schoolName, spells, schools, totalStats, treeGeneration, seed, schoolConfigs, nlpData) {
+    var schoolSeed = seed + hashString(schoolName);
+    var schoolConfig = schoolConfigs ? schoolConfigs[schoolName] : null;
+
+    console.log('[SettingsAwareBuilder] Processing', schoolName, '(' + spells.length + ' spells)');
+
+    var result = buildSchoolTree(spells, treeGeneration, schoolSeed, schoolName, schoolConfig, nlpData);
+
+    schools[schoolName] = {
+        root: result.root,
+        nodes: result.nodes,
+        links: result.links
+    };
+
+    totalStats.totalEdges += result.stats.totalEdges;
+    totalStats.rejectedCrossElement += result.stats.rejectedCrossElement;
+    totalStats.hubsCreated += result.stats.hubsCreated || 0;
+}
+
 /**
  * Simple string hash for seeding
  */
@@ -1186,6 +1317,7 @@ window.SettingsAwareTreeBuilder = {
     buildSchoolTree: buildSchoolTree,
     buildAllTrees: buildAllTreesSettingsAware,
     buildAllTreesAsync: buildAllTreesSettingsAwareAsync,
+    buildAllTreesChunked: buildAllTreesSettingsAwareChunked,
     scoreEdge: _scoreEdge,
     detectSpellElement: _detectSpellElement,
     hasElementConflict: _hasElementConflict
@@ -1194,5 +1326,6 @@ window.SettingsAwareTreeBuilder = {
 // Also export for direct use
 window.buildAllTreesSettingsAware = buildAllTreesSettingsAware;
 window.buildAllTreesSettingsAwareAsync = buildAllTreesSettingsAwareAsync;
+window.buildAllTreesSettingsAwareChunked = buildAllTreesSettingsAwareChunked;
 
 console.log('[SettingsAwareBuilder] Module loaded v' + SETTINGS_AWARE_BUILDER_VERSION);
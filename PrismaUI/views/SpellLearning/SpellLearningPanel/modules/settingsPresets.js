@@ -238,7 +238,7 @@ function initializeSettingsPresets() {
         for (var key in BUILT_IN_SETTINGS_PRESETS) {
             if (!BUILT_IN_SETTINGS_PRESETS.hasOwnProperty(key)) continue;
             if (!settingsPresets[key]) {
-                settingsPresets[key] = JSON.parse(JSON.stringify(BUILT_IN_SETTINGS_PRESETS[key]));
+                settingsPresets[key] = deepCopyPlain(BUILT_IN_SETTINGS_PRESETS[key]);
             }
         }
         updateSettingsPresetsUI();
@@ -287,10 +287,10 @@ function saveSettingsPreset(name) {
         discoveryMode: settings.discoveryMode,
         showRootSpellNames: settings.showRootSpellNames,
         // Nested objects (deep copy)
-        earlySpellLearning: JSON.parse(JSON.stringify(settings.earlySpellLearning)),
-        spellTomeLearning: JSON.parse(JSON.stringify(settings.spellTomeLearning)),
-        notifications: JSON.parse(JSON.stringify(settings.notifications || {})),
-        moddedXPSources: JSON.parse(JSON.stringify(settings.moddedXPSources || {}))
+        earlySpellLearning: deepCopyPlain(settings.earlySpellLearning),
+        spellTomeLearning: deepCopyPlain(settings.spellTomeLearning),
+        notifications: deepCopyPlain(settings.notifications || {}),
+        moddedXPSources: deepCopyPlain(settings.moddedXPSources || {})
     };
 
     settingsPresets[name] = preset;
@@ -352,7 +352,7 @@ function applySettingsPreset(name) {
         for (var k in src) {
             if (!src.hasOwnProperty(k)) continue;
             if (k === 'powerSteps') {
-                settings.earlySpellLearning.powerSteps = JSON.parse(JSON.stringify(src.powerSteps));
+                settings.earlySpellLearning.powerSteps = deepCopyPlain(src.powerSteps);
             } else {
                 settings.earlySpellLearning[k] = src[k];
             }
@@ -379,7 +379,7 @@ function applySettingsPreset(name) {
 
     // --- Modded XP Sources ---
     if (ps.moddedXPSources) {
-        settings.moddedXPSources = JSON.parse(JSON.stringify(ps.moddedXPSources));
+        settings.moddedXPSources = deepCopyPlain(ps.moddedXPSources);
         if (typeof rebuildModdedXPSourcesUI === 'function') {
             rebuildModdedXPSourcesUI();
         }
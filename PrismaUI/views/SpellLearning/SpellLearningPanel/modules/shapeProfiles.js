@@ -264,6 +264,15 @@ var SHAPE_PROFILES = {
 // SHAPE MASKS
 // =============================================================================
 
+// Baked mask geometry — these masks run once per candidate position, so the
+// constant arrays are hoisted to module level instead of rebuilt per call
+var TREE_MASK_BRANCHES = [0.15, 0.35, 0.65, 0.85];  // Branch positions (in angleNorm)
+var EXPLOSION_SUB_BLASTS = [
+    {d: 0.18, a: 0.25, r: 0.10},  // Left sub-explosion
+    {d: 0.22, a: 0.72, r: 0.09},  // Right sub-explosion
+    {d: 0.32, a: 0.50, r: 0.08}   // Center sub-explosion (secondary)
+];
+
 /**
  * Shape masks are functions that determine whether a node should be placed
  * at a given position within the layout grid.
@@ -361,8 +370,7 @@ var SHAPE_MASKS = {
             // BRANCHES: 4 distinct branch lines spreading from trunk
             var branchT = (depth - trunkEnd) / (branchEnd - trunkEnd); // 0→1
             var branchWidth = trunkWidth + branchT * 0.30; // Gradually widen
-            // 4 branch positions: 0.15, 0.35, 0.65, 0.85 (in angleNorm)
-            var branches = [0.15, 0.35, 0.65, 0.85];
+            var branches = TREE_MASK_BRANCHES;
             var onBranch = false;
             for (var bi = 0; bi < branches.length; bi++) {
                 var bd = Math.abs(angleNorm - branches[bi]);
@@ -413,11 +421,7 @@ var SHAPE_MASKS = {
         // SUB-EXPLOSIONS near base (depth 0.10-0.35): 3 smaller blast clusters
         // These are circles of acceptance at specific off-center positions
         if (depth >= 0.10 && depth <= 0.40) {
-            var subBlasts = [
-                {d: 0.18, a: 0.25, r: 0.10},  // Left sub-explosion
-                {d: 0.22, a: 0.72, r: 0.09},  // Right sub-explosion
-                {d: 0.32, a: 0.50, r: 0.08}   // Center sub-explosion (secondary)
-            ];
+            var subBlasts = EXPLOSION_SUB_BLASTS;
             for (var si = 0; si < subBlasts.length; si++) {
                 var sb = subBlasts[si];
                 var dd = depth - sb.d;
@@ -325,6 +325,17 @@ var settings = {
     }
 };
 
+/**
+ * Gated log for per-node/per-edge diagnostics in the tree builder hot
+ * loops. Forwards its arguments to console.log only when the Verbose
+ * Logging toggle is on, so large load orders skip the console I/O
+ * that otherwise fires once per node during tree builds.
+ */
+function debugLog() {
+    if (!settings.verboseLogging) return;
+    console.log.apply(console, arguments);
+}
+
 // Settings presets (user-saved progression/early spell/tome configurations)
 var settingsPresets = {};
 
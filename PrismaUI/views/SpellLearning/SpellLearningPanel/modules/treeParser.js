@@ -41,6 +41,7 @@ var TreeParser = {
         this.nodes.clear();
         this.edges = [];
         this.schools = {};
+        this._unlockableCache = null;
 
         if (typeof data === 'string') {
             try { data = JSON.parse(data); }
@@ -169,15 +170,36 @@ var TreeParser = {
                 }
             });
 
+            // Edge-existence index (from -> {to: true}), built alongside the
+            // edge list. The prerequisite pass below previously rescanned the
+            // whole edge list per prereq — O(E^2) on dense trees.
+            var edgeIndex = {};
+            function indexEdge(fromId, toId) {
+                var targets = edgeIndex[fromId];
+                if (!targets) targets = edgeIndex[fromId] = {};
+                targets[toId] = true;
+            }
+
+            // Prereq membership sets (id -> {prereqId: true}), so the
+            // reconciliation below checks membership in O(1) instead of
+            // scanning each prerequisite list per edge
+            var prereqSet = {};
+            this.nodes.forEach(function(node) {
+                var set = prereqSet[node.id] = {};
+                node.prerequisites.forEach(function(pid) { set[pid] = true; });
+            });
+
             // Build edges from children
             this.nodes.forEach(function(node) {
                 node.children.forEach(function(childId) {
                     var child = self.nodes.get(childId);
                     if (child) {
                         self.edges.push({ from: node.id, to: childId });
+                        indexEdge(node.id, childId);
                         // Never add prerequisites to root nodes - they are independent starting points
-                        if (!child.isRoot && child.prerequisites.indexOf(node.id) === -1) {
+                        if (!child.isRoot && !prereqSet[childId][node.id]) {
                             child.prerequisites.push(node.id);
+                            prereqSet[childId][node.id] = true;
                         }
                     }
                 });
@@ -188,30 +210,26 @@ var TreeParser = {
                 node.prerequisites.forEach(function(prereqId) {
                     var parent = self.nodes.get(prereqId);
                     if (parent) {
-                        var edgeExists = self.edges.some(function(e) {
-                            return e.from === prereqId && e.to === node.id;
-                        });
+                        var edgeExists = edgeIndex[prereqId] !== undefined &&
+                                         edgeIndex[prereqId][node.id] === true;
                         if (!edgeExists) {
-                            logTreeParser('Adding missing edge: ' + prereqId + ' -> ' + node.id);
-                            self.edges.push({ from: prereqId, to: node.id });
-                            if (parent.children.indexOf(node.id) === -1) {
-                                parent.children.push(node.id);
+                            // Per-edge diagnostic: gated, fires once per repaired edge
+                            if (settings.verboseLogging) {
+                                logTreeParser('Adding missing edge: ' + prereqId + ' -> ' + node.id);
                             }
+                            self.edges.push({ from: prereqId, to: node.id });
+                            indexEdge(prereqId, node.id);
+                            // No membership scan needed: the children pass
+                            // above indexed an edge for every child that
+                            // resolves to a node, so a missing edge means
+                            // node.id is not in parent.children either
+                            parent.children.push(node.id);
                         }
                     }
                 });
             });
         }
 
-        // Detect unobtainable spells per school (no auto-fix - user must regenerate)
-        for (var schoolName in this.schools) {
-            var schoolData = this.schools[schoolName];
-            var unobtainableCount = this.detectAndFixCycles(schoolName, schoolData.root);
-            if (unobtainableCount > 0) {
-                logTreeParser(schoolName + ' has ' + unobtainableCount + ' unobtainable spells - regenerate tree', true);
-            }
-        }
-
         // Calculate depths via BFS from root
         for (var sName in this.schools) {
             var sData = this.schools[sName];
@@ -223,12 +241,15 @@ var TreeParser = {
             logTreeParser('BFS traversal for ' + sName + ' starting from root: ' + root.id +
                          ', root has ' + (root.children ? root.children.length : 0) + ' children');
 
+            // Head-index queues throughout this file: shift() is O(n) per
+            // dequeue in the interpreter, so BFS reads by cursor instead
             var queue = [{ node: root, depth: 0 }];
+            var qHead = 0;
             var visited = new Set();
             var depthCounts = {};
-            
-            while (queue.length) {
-                var item = queue.shift();
+
+            while (qHead < queue.length) {
+                var item = queue[qHead++];
                 var node = item.node;
                 var depth = item.depth;
                 if (visited.has(node.id)) continue;
@@ -268,8 +289,9 @@ var TreeParser = {
                     addRoot.state = 'available';
 
                     var addQueue = [{ node: addRoot, depth: 0 }];
-                    while (addQueue.length) {
-                        var item = addQueue.shift();
+                    var addHead = 0;
+                    while (addHead < addQueue.length) {
+                        var item = addQueue[addHead++];
                         var node = item.node;
                         var depth = item.depth;
                         if (node !== addRoot && visited.has(node.id)) continue;
@@ -310,6 +332,19 @@ var TreeParser = {
             root.state = 'available';
         }
 
+        // Detect unobtainable spells per school (no auto-fix - user must
+        // regenerate). Runs after the orphan fixer so the single unlock
+        // pass sees the final graph: it no longer reports nodes the fixer
+        // just reconnected, and its cached result stays valid for the
+        // validation calls that follow parse
+        for (var schoolName in this.schools) {
+            var schoolData = this.schools[schoolName];
+            var unobtainableCount = this.detectAndFixCycles(schoolName, schoolData.root);
+            if (unobtainableCount > 0) {
+                logTreeParser(schoolName + ' has ' + unobtainableCount + ' unobtainable spells - regenerate tree', true);
+            }
+        }
+
         return {
             success: true,
             nodes: Array.from(this.nodes.values()),
@@ -321,6 +356,24 @@ var TreeParser = {
 
     _fixOrphanedNodes: function(orphanedNodes, schoolName, schoolData, root, visited) {
         var self = this;
+        this._unlockableCache = null;  // Prereq graph is about to change
+
+        // Bucket the connected set by tier once, so each orphan's parent
+        // search only touches the two tiers it can attach to instead of
+        // rescanning every visited node. Newly connected orphans join
+        // their bucket immediately so later orphans can attach to them.
+        var connectedByTier = {};
+        function addConnected(node) {
+            var t = node.tier || 0;
+            if (!connectedByTier[t]) connectedByTier[t] = [];
+            connectedByTier[t].push(node);
+        }
+        visited.forEach(function(connectedId) {
+            var connected = self.nodes.get(connectedId);
+            if (connected && connected.school === schoolName) {
+                addConnected(connected);
+            }
+        });
 
         orphanedNodes.forEach(function(orphanId) {
             var orphan = self.nodes.get(orphanId);
@@ -328,8 +381,11 @@ var TreeParser = {
 
             // Safety check: Never connect nodes marked as roots - they are intentional roots
             if (orphan.isRoot) {
-                logTreeParser('SKIP orphan fix for root node: ' + orphanId + ' (' + (orphan.name || 'unnamed') + ')');
+                if (settings.verboseLogging) {
+                    logTreeParser('SKIP orphan fix for root node: ' + orphanId + ' (' + (orphan.name || 'unnamed') + ')');
+                }
                 visited.add(orphanId);
+                addConnected(orphan);
                 orphan.depth = 0;
                 orphan.state = 'available';
                 return;
@@ -337,18 +393,20 @@ var TreeParser = {
 
             var orphanTier = orphan.tier || 0;
             var potentialParents = [];
-            
-            visited.forEach(function(connectedId) {
-                var connected = self.nodes.get(connectedId);
-                if (connected && connected.school === schoolName) {
-                    var connectedTier = connected.tier || 0;
-                    if (connectedTier <= orphanTier && connectedTier >= orphanTier - 1) {
-                        var childCount = connected.children.length;
-                        potentialParents.push({ node: connected, childCount: childCount, tierDiff: orphanTier - connectedTier });
-                    }
+
+            for (var ct = orphanTier - 1; ct <= orphanTier; ct++) {
+                var tierBucket = connectedByTier[ct];
+                if (!tierBucket) continue;
+                for (var tb = 0; tb < tierBucket.length; tb++) {
+                    var connected = tierBucket[tb];
+                    potentialParents.push({
+                        node: connected,
+                        childCount: connected.children.length,
+                        tierDiff: orphanTier - ct
+                    });
                 }
-            });
-            
+            }
+
             // Respect maxChildren limit
             var maxCh = self._maxChildrenPerNode || 5;
             var withRoom = potentialParents.filter(function(p) { return p.childCount < maxCh; });
@@ -361,7 +419,11 @@ var TreeParser = {
 
             var bestParent = withRoom.length > 0 ? withRoom[0].node : root;
             
-            logTreeParser('Connecting orphan ' + orphanId + ' (tier ' + orphanTier + ') to ' + bestParent.id);
+            // Per-orphan log also round-trips to the SKSE log via callCpp,
+            // so keep it behind the verbose toggle
+            if (settings.verboseLogging) {
+                logTreeParser('Connecting orphan ' + orphanId + ' (tier ' + orphanTier + ') to ' + bestParent.id);
+            }
             
             if (bestParent.children.indexOf(orphanId) === -1) {
                 bestParent.children.push(orphanId);
@@ -374,6 +436,7 @@ var TreeParser = {
             orphan.depth = bestParent.depth + 1;
             schoolData.maxDepth = Math.max(schoolData.maxDepth, orphan.depth);
             visited.add(orphanId);
+            addConnected(orphan);
         });
         
         // Re-process children of newly connected nodes
@@ -382,8 +445,9 @@ var TreeParser = {
             if (!orphan) return;
             
             var childQueue = [{ node: orphan, depth: orphan.depth }];
-            while (childQueue.length > 0) {
-                var item = childQueue.shift();
+            var cqHead = 0;
+            while (cqHead < childQueue.length) {
+                var item = childQueue[cqHead++];
                 item.node.children.forEach(function(cid) {
                     var child = self.nodes.get(cid);
                     if (child && !visited.has(cid)) {
@@ -399,66 +463,162 @@ var TreeParser = {
         logTreeParser('Fixed ' + orphanedNodes.length + ' orphaned nodes in ' + schoolName);
     },
 
+    /**
+     * Compute the set of unlockable node IDs for a school in a single pass.
+     *
+     * Kahn-style BFS: each node tracks how many of its prerequisites are
+     * still locked, and unlocking a node decrements that count on its
+     * dependents. Replaces the old fixed-point loop that rescanned every
+     * node per iteration (O(V*E) worst case) with one O(V+E) pass.
+     * Nodes with no prerequisites (e.g. extra roots in multi-root trees)
+     * are inherently unlockable.
+     */
+    computeUnlockableSet: function(schoolName, rootId) {
+        // Single-entry result cache: the LLM validation path runs
+        // getUnreachableNodesInfo and detectAndFixCycles back to back on
+        // the same unchanged school, each needing this same set. Cleared
+        // by parse() and by the orphan fixer whenever the graph changes.
+        var cache = this._unlockableCache;
+        if (cache && cache.set && cache.school === schoolName && cache.root === rootId) {
+            return cache.set;
+        }
+
+        var self = this;
+        var schoolNodeIds = this.schools[schoolName].nodeIds;
+
+        // Index-encode the school: formId strings -> dense ints, so the BFS
+        // below runs over flat typed arrays (counts, queue) instead of
+        // string-keyed maps. Prereqs without an index (missing nodes or
+        // other-school references) simply never unlock their dependents.
+        var indexOf = {};
+        var idByIndex = [rootId];
+        indexOf[rootId] = 0;
+        schoolNodeIds.forEach(function(nodeId) {
+            if (indexOf[nodeId] === undefined) {
+                indexOf[nodeId] = idByIndex.length;
+                idByIndex.push(nodeId);
+            }
+        });
+
+        var total = idByIndex.length;
+
+        // Scratch buffers reused across calls (cycle detection and
+        // reachability analysis both run this per school) — grown when a
+        // bigger school shows up, zeroed otherwise. The queue needs no
+        // clearing since head/tail bound what is read.
+        var scratch = this._unlockScratch;
+        if (!scratch || scratch.remaining.length < total) {
+            scratch = this._unlockScratch = {
+                remaining: new Int32Array(total),
+                state: new Int8Array(total),
+                queue: new Int32Array(total)
+            };
+        } else {
+            scratch.remaining.fill(0, 0, total);
+            scratch.state.fill(0, 0, total);
+        }
+        var remaining = scratch.remaining;       // locked prereq count per node
+        var state = scratch.state;               // 1 = unlocked
+        var queue = scratch.queue;
+        var tail = 0;
+
+        state[0] = 1;
+        queue[tail++] = 0;
+
+        // node index -> dependent node indices (holes read as undefined,
+        // which the !waiting checks below treat the same as null)
+        var dependents = new Array(total);
+
+        schoolNodeIds.forEach(function(nodeId) {
+            var idx = indexOf[nodeId];
+            if (state[idx] === 1) return;
+
+            var node = self.nodes.get(nodeId);
+            if (!node) return;
+
+            var prereqs = node.prerequisites;
+            if (prereqs.length === 0) {
+                state[idx] = 1;
+                queue[tail++] = idx;
+                return;
+            }
+
+            // Dedupe so a repeated prereq ID can't inflate the count
+            var seen = {};
+            var uniqueCount = 0;
+            prereqs.forEach(function(prereqId) {
+                if (seen[prereqId]) return;
+                seen[prereqId] = true;
+                uniqueCount++;
+
+                var prereqIdx = indexOf[prereqId];
+                if (prereqIdx !== undefined) {
+                    var waiting = dependents[prereqIdx];
+                    if (!waiting) waiting = dependents[prereqIdx] = [];
+                    waiting.push(idx);
+                }
+            });
+            remaining[idx] = uniqueCount;
+        });
+
+        var head = 0;
+        while (head < tail) {
+            var unlockedIdx = queue[head++];
+            var waiting = dependents[unlockedIdx];
+            if (!waiting) continue;
+
+            for (var w = 0; w < waiting.length; w++) {
+                var depIdx = waiting[w];
+                if (state[depIdx] === 1) continue;
+                if (--remaining[depIdx] === 0) {
+                    state[depIdx] = 1;
+                    queue[tail++] = depIdx;
+                }
+            }
+        }
+
+        // Every unlocked node is enqueued exactly once, so tail === total
+        // means the whole school is reachable — callers use the flag to
+        // skip their per-node "which ones are blocked" sweeps entirely.
+        var unlocked = new Set();
+        for (var ui = 0; ui < total; ui++) {
+            if (state[ui] === 1) unlocked.add(idByIndex[ui]);
+        }
+        this._unlockableCache = {
+            school: schoolName,
+            root: rootId,
+            set: unlocked,
+            complete: tail === total
+        };
+        return unlocked;
+    },
+
     detectAndFixCycles: function(schoolName, rootId) {
         var self = this;
         var fixesMade = 0;
-        
+
         var rootNode = this.nodes.get(rootId);
         if (!rootNode) return 0;
-        
+
         var schoolNodeIds = this.schools[schoolName].nodeIds;
         var totalNodes = schoolNodeIds.length;
-        
-        function simulateUnlocks() {
-            var unlocked = new Set();
-            unlocked.add(rootId);
-            
-            var changed = true;
-            var iterations = 0;
-            var maxIterations = totalNodes + 10;
-            
-            while (changed && iterations < maxIterations) {
-                changed = false;
-                iterations++;
-                
-                schoolNodeIds.forEach(function(nodeId) {
-                    if (unlocked.has(nodeId)) return;
-                    
-                    var node = self.nodes.get(nodeId);
-                    if (!node) return;
-                    
-                    var prereqs = node.prerequisites;
-                    if (prereqs.length === 0) {
-                        // Nodes with no prerequisites are inherently unlockable
-                        // This includes additional root nodes in multi-root trees
-                        unlocked.add(nodeId);
-                        changed = true;
-                        return;
-                    }
 
-                    var allPrereqsUnlocked = prereqs.every(function(prereqId) {
-                        return unlocked.has(prereqId);
-                    });
+        var unlockable = this.computeUnlockableSet(schoolName, rootId);
 
-                    if (allPrereqsUnlocked) {
-                        unlocked.add(nodeId);
-                        changed = true;
-                    }
-                });
-            }
-
-            return unlocked;
+        // Healthy-input early-out: the unlock pass already proved every
+        // node reachable, so skip the per-node blocked sweep
+        if (this._unlockableCache.complete) {
+            logTreeParser(schoolName + ': All ' + totalNodes + ' spells are obtainable');
+            return 0;
         }
 
-        var unlockable = simulateUnlocks();
-
         var unobtainable = [];
         schoolNodeIds.forEach(function(nodeId) {
             if (!unlockable.has(nodeId)) {
                 unobtainable.push(nodeId);
             }
         });
-        
+
         if (unobtainable.length === 0) {
             logTreeParser(schoolName + ': All ' + totalNodes + ' spells are obtainable');
             return 0;
@@ -506,50 +666,22 @@ var TreeParser = {
         
         var schoolNodeIds = this.schools[schoolName].nodeIds;
         var totalNodes = schoolNodeIds.length;
-        
-        // Simulate unlocks
-        function simulateUnlocks() {
-            var unlocked = new Set();
-            unlocked.add(rootId);
-            
-            var changed = true;
-            var iterations = 0;
-            
-            while (changed && iterations < totalNodes + 10) {
-                changed = false;
-                iterations++;
-                
-                schoolNodeIds.forEach(function(nodeId) {
-                    if (unlocked.has(nodeId)) return;
-                    
-                    var node = self.nodes.get(nodeId);
-                    if (!node) return;
-                    
-                    var prereqs = node.prerequisites;
-                    if (prereqs.length === 0) {
-                        // Nodes with no prerequisites are inherently unlockable
-                        unlocked.add(nodeId);
-                        changed = true;
-                        return;
-                    }
-
-                    var allPrereqsUnlocked = prereqs.every(function(prereqId) {
-                        return unlocked.has(prereqId);
-                    });
 
-                    if (allPrereqsUnlocked) {
-                        unlocked.add(nodeId);
-                        changed = true;
-                    }
-                });
-            }
+        var unlockable = this.computeUnlockableSet(schoolName, rootId);
 
-            return unlocked;
+        // Same early-out as detectAndFixCycles: nothing to report when
+        // the unlock pass covered the whole school
+        if (this._unlockableCache.complete) {
+            return {
+                valid: true,
+                total: totalNodes,
+                reachable: unlockable.size,
+                unreachable: []
+            };
         }
 
-        var unlockable = simulateUnlocks();
         var unreachableInfo = [];
-        
+
         schoolNodeIds.forEach(function(nodeId) {
             if (unlockable.has(nodeId)) return;
             
@@ -602,6 +734,53 @@ var TreeParser = {
  */
 var lastOrphanStats = null;
 
+/**
+ * Reachability BFS shared by analyzeOrphans() and repairOrphans().
+ * Walks children from the school root, then from any additional element
+ * roots, recording BFS depth along the way. Both callers previously ran
+ * this same traversal with their own inline copies; computing it in one
+ * place keeps the two passes in sync and gives analysis the depth map
+ * for free.
+ *
+ * Returns { reachable: { id: true }, depth: { id: number } }
+ */
+function computeSchoolReachability(rootId, schoolNodes, nodeById) {
+    var reachable = {};
+    var depth = {};
+
+    function bfsFrom(startId) {
+        reachable[startId] = true;
+        depth[startId] = 0;
+        // Head-index queue: shift() re-indexes the whole array per
+        // dequeue, turning the BFS quadratic on large schools
+        var queue = [startId];
+        var head = 0;
+        while (head < queue.length) {
+            var cId = queue[head++];
+            var cNode = nodeById[cId];
+            if (!cNode) continue;
+            (cNode.children || []).forEach(function(childId) {
+                if (!reachable[childId] && nodeById[childId]) {
+                    reachable[childId] = true;
+                    depth[childId] = depth[cId] + 1;
+                    queue.push(childId);
+                }
+            });
+        }
+    }
+
+    bfsFrom(rootId);
+
+    // Additional element roots
+    schoolNodes.forEach(function(node) {
+        if (!reachable[node.id] && node.isRoot) {
+            bfsFrom(node.id);
+        }
+    });
+
+    return { reachable: reachable, depth: depth };
+}
+
 /**
  * Analyze the currently loaded tree for orphans and missing prerequisite refs.
  * Read-only — does NOT modify the tree.
@@ -617,9 +796,15 @@ function analyzeOrphans() {
     var nodes = state.treeData.nodes;
     var schools = state.treeData.schools;
 
-    // Build lookup
+    // Build lookups in one pass: the per-school loop below previously
+    // re-filtered the full node array once per school
     var nodeById = {};
-    nodes.forEach(function(n) { nodeById[n.id] = n; });
+    var nodesBySchool = {};
+    nodes.forEach(function(n) {
+        nodeById[n.id] = n;
+        if (!nodesBySchool[n.school]) nodesBySchool[n.school] = [];
+        nodesBySchool[n.school].push(n);
+    });
 
     var stats = { totalOrphans: 0, totalMissingPrereqs: 0, totalNodes: nodes.length, schools: {} };
 
@@ -628,7 +813,7 @@ function analyzeOrphans() {
         var rootId = sData.root;
         if (!nodeById[rootId]) continue;
 
-        var schoolNodes = nodes.filter(function(n) { return n.school === schoolName; });
+        var schoolNodes = nodesBySchool[schoolName] || [];
         var schoolIds = schoolNodes.map(function(n) { return n.id; });
         var schoolIdSet = {};
         schoolIds.forEach(function(id) { schoolIdSet[id] = true; });
@@ -651,55 +836,36 @@ function analyzeOrphans() {
         });
 
         // BFS from root(s) to find reachable nodes
-        var reachable = {};
-        var queue = [rootId];
-        reachable[rootId] = true;
-
-        while (queue.length > 0) {
-            var cId = queue.shift();
-            var cNode = nodeById[cId];
-            if (!cNode) continue;
-            (cNode.children || []).forEach(function(childId) {
-                if (!reachable[childId] && nodeById[childId]) {
-                    reachable[childId] = true;
-                    queue.push(childId);
-                }
-            });
-        }
-
-        // Additional element roots
-        schoolNodes.forEach(function(node) {
-            if (!reachable[node.id] && node.isRoot) {
-                reachable[node.id] = true;
-                var q = [node.id];
-                while (q.length > 0) {
-                    var id = q.shift();
-                    var n = nodeById[id];
-                    if (!n) continue;
-                    (n.children || []).forEach(function(childId) {
-                        if (!reachable[childId] && nodeById[childId]) {
-                            reachable[childId] = true;
-                            q.push(childId);
-                        }
-                    });
-                }
-            }
-        });
+        var reachable = computeSchoolReachability(rootId, schoolNodes, nodeById).reachable;
 
         // Count orphans
         var orphanIds = schoolIds.filter(function(id) { return !reachable[id]; });
         schoolStats.orphans = orphanIds.length;
         stats.totalOrphans += orphanIds.length;
 
-        // Group orphans into connected subtrees
+        // Group orphans into connected subtrees.
+        // Reverse index over the orphan set (child -> orphan parents), so
+        // the grouping walk follows parent links directly instead of
+        // rescanning every orphan's child list per dequeued node.
+        var orphanParentsOf = {};
+        orphanIds.forEach(function(oid) {
+            var oNode = nodeById[oid];
+            if (!oNode) return;
+            (oNode.children || []).forEach(function(cid) {
+                if (!orphanParentsOf[cid]) orphanParentsOf[cid] = [];
+                orphanParentsOf[cid].push(oid);
+            });
+        });
+
         var visited = {};
         orphanIds.forEach(function(orphanId) {
             if (visited[orphanId]) return;
             var component = [];
             var compQ = [orphanId];
+            var compHead = 0;
             visited[orphanId] = true;
-            while (compQ.length > 0) {
-                var id = compQ.shift();
+            while (compHead < compQ.length) {
+                var id = compQ[compHead++];
                 component.push(id);
                 var node = nodeById[id];
                 if (!node) continue;
@@ -709,15 +875,16 @@ function analyzeOrphans() {
                         compQ.push(childId);
                     }
                 });
-                // Reverse: find orphans whose children include this id
-                orphanIds.forEach(function(otherId) {
-                    if (visited[otherId]) return;
-                    var otherNode = nodeById[otherId];
-                    if (otherNode && (otherNode.children || []).indexOf(id) !== -1) {
-                        visited[otherId] = true;
-                        compQ.push(otherId);
+                // Reverse: orphans whose children include this id
+                var parentList = orphanParentsOf[id];
+                if (parentList) {
+                    for (var pl = 0; pl < parentList.length; pl++) {
+                        if (!visited[parentList[pl]]) {
+                            visited[parentList[pl]] = true;
+                            compQ.push(parentList[pl]);
+                        }
                     }
-                });
+                }
             }
             schoolStats.subtrees.push({ size: component.length });
         });
@@ -751,9 +918,15 @@ function repairOrphans() {
     var schools = state.treeData.schools;
     var repairStats = { removedPrereqs: 0, reconnectedSubtrees: 0, nodesRecovered: 0 };
 
-    // Build lookup
+    // Build lookups in one pass: the per-school loop below previously
+    // re-filtered the full node array once per school
     var nodeById = {};
-    nodes.forEach(function(n) { nodeById[n.id] = n; });
+    var nodesBySchool = {};
+    nodes.forEach(function(n) {
+        nodeById[n.id] = n;
+        if (!nodesBySchool[n.school]) nodesBySchool[n.school] = [];
+        nodesBySchool[n.school].push(n);
+    });
 
     // Step 1: Strip non-existent prereqs and children from ALL nodes
     nodes.forEach(function(node) {
@@ -764,7 +937,7 @@ function repairOrphans() {
         var removed = origPrereqLen - node.prerequisites.length;
         if (removed > 0) {
             repairStats.removedPrereqs += removed;
-            console.log('[OrphanRepair] Stripped ' + removed + ' missing prereqs from ' + (node.name || node.id));
+            debugLog('[OrphanRepair] Stripped ' + removed + ' missing prereqs from ' + (node.name || node.id));
         }
 
         node.children = (node.children || []).filter(function(cid) {
@@ -802,57 +975,32 @@ function repairOrphans() {
         var rootNode = nodeById[rootId];
         if (!rootNode) continue;
 
-        var schoolNodes = nodes.filter(function(n) { return n.school === schoolName; });
+        var schoolNodes = nodesBySchool[schoolName] || [];
         var schoolIds = schoolNodes.map(function(n) { return n.id; });
         var schoolIdSet = {};
         schoolIds.forEach(function(id) { schoolIdSet[id] = true; });
 
         // BFS from root(s)
-        var reachable = {};
-        var depthMap = {};
-        var queue = [{ id: rootId, depth: 0 }];
-        reachable[rootId] = true;
-        depthMap[rootId] = 0;
-
-        while (queue.length > 0) {
-            var item = queue.shift();
-            var cNode = nodeById[item.id];
-            if (!cNode) continue;
-            (cNode.children || []).forEach(function(childId) {
-                if (!reachable[childId] && nodeById[childId]) {
-                    reachable[childId] = true;
-                    depthMap[childId] = item.depth + 1;
-                    queue.push({ id: childId, depth: item.depth + 1 });
-                }
-            });
-        }
-
-        // Additional element roots
-        schoolNodes.forEach(function(node) {
-            if (!reachable[node.id] && node.isRoot) {
-                reachable[node.id] = true;
-                depthMap[node.id] = 0;
-                var q = [{ id: node.id, depth: 0 }];
-                while (q.length > 0) {
-                    var it = q.shift();
-                    var n = nodeById[it.id];
-                    if (!n) continue;
-                    (n.children || []).forEach(function(childId) {
-                        if (!reachable[childId] && nodeById[childId]) {
-                            reachable[childId] = true;
-                            depthMap[childId] = it.depth + 1;
-                            q.push({ id: childId, depth: it.depth + 1 });
-                        }
-                    });
-                }
-            }
-        });
+        var reach = computeSchoolReachability(rootId, schoolNodes, nodeById);
+        var reachable = reach.reachable;
+        var depthMap = reach.depth;
 
         // Find orphans
         var orphanIds = schoolIds.filter(function(id) { return !reachable[id]; });
         if (orphanIds.length === 0) continue;
 
-        // Group into connected subtrees
+        // Group into connected subtrees (same reverse-index idea as
+        // analyzeOrphans: child -> orphan parents, built once)
+        var orphanParentsOf = {};
+        orphanIds.forEach(function(oid) {
+            var oNode = nodeById[oid];
+            if (!oNode) return;
+            (oNode.children || []).forEach(function(cid) {
+                if (!orphanParentsOf[cid]) orphanParentsOf[cid] = [];
+                orphanParentsOf[cid].push(oid);
+            });
+        });
+
         var visited = {};
         var subtrees = [];
 
@@ -860,9 +1008,10 @@ function repairOrphans() {
             if (visited[orphanId]) return;
             var component = [];
             var compQ = [orphanId];
+            var compHead = 0;
             visited[orphanId] = true;
-            while (compQ.length > 0) {
-                var id = compQ.shift();
+            while (compHead < compQ.length) {
+                var id = compQ[compHead++];
                 component.push(id);
                 var node = nodeById[id];
                 if (!node) continue;
@@ -872,28 +1021,39 @@ function repairOrphans() {
                         compQ.push(childId);
                     }
                 });
-                orphanIds.forEach(function(otherId) {
-                    if (visited[otherId]) return;
-                    var otherNode = nodeById[otherId];
-                    if (otherNode && (otherNode.children || []).indexOf(id) !== -1) {
-                        visited[otherId] = true;
-                        compQ.push(otherId);
+                // Reverse: orphans whose children include this id
+                var parentList = orphanParentsOf[id];
+                if (parentList) {
+                    for (var pl = 0; pl < parentList.length; pl++) {
+                        if (!visited[parentList[pl]]) {
+                            visited[parentList[pl]] = true;
+                            compQ.push(parentList[pl]);
+                        }
                     }
-                });
+                }
             }
 
-            // Find subtree root: node with no parent in this component, lowest tier
+            // Find subtree root: node with no parent in this component, lowest tier.
+            // One forward pass over member children marks which members have an
+            // in-component parent - asking component.some(...indexOf...) per
+            // member was quadratic in component size.
+            var inComponent = {};
+            component.forEach(function(cId) { inComponent[cId] = true; });
+            var hasParentIn = {};
+            component.forEach(function(cId) {
+                var cNode = nodeById[cId];
+                if (!cNode) return;
+                (cNode.children || []).forEach(function(childId) {
+                    if (childId !== cId && inComponent[childId]) hasParentIn[childId] = true;
+                });
+            });
+
             var stRoot = null;
             var lowestTier = Infinity;
             component.forEach(function(cId) {
                 var cNode = nodeById[cId];
                 if (!cNode) return;
-                var hasParent = component.some(function(otherId) {
-                    if (otherId === cId) return false;
-                    var oNode = nodeById[otherId];
-                    return oNode && (oNode.children || []).indexOf(cId) !== -1;
-                });
-                if (!hasParent && (cNode.tier || 0) < lowestTier) {
+                if (!hasParentIn[cId] && (cNode.tier || 0) < lowestTier) {
                     lowestTier = cNode.tier || 0;
                     stRoot = cId;
                 }
@@ -902,35 +1062,70 @@ function repairOrphans() {
             subtrees.push({ root: stRoot, members: component });
         });
 
-        // Reconnect each subtree
+        // Reachable same-school nodes bucketed by tier: each subtree only
+        // considers parents in [stTier-1, stTier], so the per-subtree walk
+        // over the entire reachable map collapses to two bucket reads.
+        // Nodes recovered by earlier subtrees are added to their buckets
+        // below, so later subtrees can still pick them, as the full scan
+        // allowed.
+        var reachableByTier = {};
+        var bestByTier = {};
+        function bucketReachable(id) {
+            var rNode = nodeById[id];
+            if (!rNode || rNode.school !== schoolName) return;
+            var rTier = rNode.tier || 0;
+            if (!reachableByTier[rTier]) reachableByTier[rTier] = [];
+            reachableByTier[rTier].push(rNode);
+            delete bestByTier[rTier];
+        }
+        for (var reachId in reachable) bucketReachable(reachId);
+
         var maxCh = 5;
+
+        // Memoized per-tier best parent: a bucket's minimum-childCount
+        // entry only changes when the bucket gains a node or one of its
+        // nodes gains a child, so recompute lazily on those events
+        // instead of re-collecting and sorting candidates per subtree.
+        function bestInTier(t) {
+            var memo = bestByTier[t];
+            if (memo !== undefined) return memo;
+            var bucket = reachableByTier[t];
+            memo = null;
+            if (bucket) {
+                var bestRoom = null;
+                var bestAny = null;
+                for (var bi = 0; bi < bucket.length; bi++) {
+                    var conn = bucket[bi];
+                    var cc = (conn.children || []).length;
+                    if (!bestAny || cc < bestAny.childCount) {
+                        bestAny = { node: conn, childCount: cc };
+                    }
+                    if (cc < maxCh && (!bestRoom || cc < bestRoom.childCount)) {
+                        bestRoom = { node: conn, childCount: cc };
+                    }
+                }
+                memo = { withRoom: bestRoom, any: bestAny };
+            }
+            bestByTier[t] = memo;
+            return memo;
+        }
+
+        // Reconnect each subtree
         subtrees.forEach(function(subtree) {
             var stRootNode = nodeById[subtree.root];
             if (!stRootNode) return;
             var stTier = stRootNode.tier || 0;
 
-            // Find best parent in reachable set
-            var candidates = [];
-            for (var connId in reachable) {
-                var conn = nodeById[connId];
-                if (!conn || conn.school !== schoolName) continue;
-                var connTier = conn.tier || 0;
-                if (connTier > stTier) continue;
-                if (connTier < stTier - 1) continue;
-                candidates.push({ node: conn, childCount: (conn.children || []).length, tierDiff: stTier - connTier });
-            }
-
-            var withRoom = candidates.filter(function(c) { return c.childCount < maxCh; });
-            if (withRoom.length === 0) withRoom = candidates;
-            if (withRoom.length === 0) withRoom = [{ node: rootNode, childCount: (rootNode.children || []).length, tierDiff: stTier }];
-
-            withRoom.sort(function(a, b) {
-                if (a.tierDiff !== b.tierDiff) return a.tierDiff - b.tierDiff;
-                return a.childCount - b.childCount;
-            });
+            // Same priority as the old (tierDiff, childCount) sort:
+            // same-tier parent with room, then tier-1 with room, then the
+            // same pair ignoring capacity, then the school root
+            var memo0 = bestInTier(stTier);
+            var memo1 = bestInTier(stTier - 1);
+            var best = (memo0 && memo0.withRoom) || (memo1 && memo1.withRoom) ||
+                       (memo0 && memo0.any) || (memo1 && memo1.any) || null;
 
-            var bestParent = withRoom[0].node;
-            console.log('[OrphanRepair] Reconnecting subtree (' + subtree.members.length + ' nodes) ' +
+            var bestParent = best ? best.node : rootNode;
+            debugLog('[OrphanRepair] Reconnecting subtree (' + subtree.members.length + ' nodes) ' +
                 (stRootNode.name || subtree.root) + ' (tier ' + stTier + ') -> ' +
                 (bestParent.name || bestParent.id) + ' (tier ' + (bestParent.tier || 0) + ')');
 
@@ -938,6 +1133,7 @@ function repairOrphans() {
             if (!bestParent.children) bestParent.children = [];
             if (bestParent.children.indexOf(subtree.root) === -1) {
                 bestParent.children.push(subtree.root);
+                delete bestByTier[bestParent.tier || 0];
             }
             if (!stRootNode.prerequisites) stRootNode.prerequisites = [];
             if (stRootNode.prerequisites.indexOf(bestParent.id) === -1) {
@@ -948,19 +1144,22 @@ function repairOrphans() {
             // BFS to recover subtree depths
             var parentDepth = depthMap[bestParent.id] || bestParent.depth || 0;
             reachable[subtree.root] = true;
+            bucketReachable(subtree.root);
             depthMap[subtree.root] = parentDepth + 1;
             stRootNode.depth = parentDepth + 1;
 
             var recQ = [{ id: subtree.root, depth: parentDepth + 1 }];
+            var recHead = 0;
             var recovered = 0;
-            while (recQ.length > 0) {
-                var rItem = recQ.shift();
+            while (recHead < recQ.length) {
+                var rItem = recQ[recHead++];
                 var rNode = nodeById[rItem.id];
                 if (!rNode) continue;
                 recovered++;
                 (rNode.children || []).forEach(function(childId) {
                     if (!reachable[childId] && nodeById[childId]) {
                         reachable[childId] = true;
+                        bucketReachable(childId);
                         var cd = rItem.depth + 1;
                         depthMap[childId] = cd;
                         nodeById[childId].depth = cd;
@@ -553,7 +553,7 @@ var TreePreviewFlat = {
      * Return current settings for external consumption
      */
     getSettings: function() {
-        return JSON.parse(JSON.stringify(this.settings));
+        return deepCopyPlain(this.settings);
     },
 
     /**
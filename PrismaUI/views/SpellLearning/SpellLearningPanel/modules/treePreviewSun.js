@@ -803,7 +803,7 @@ var TreePreviewSun = {
      * Return current settings for external consumption
      */
     getSettings: function() {
-        return JSON.parse(JSON.stringify(this.settings));
+        return deepCopyPlain(this.settings);
     },
 
     /**
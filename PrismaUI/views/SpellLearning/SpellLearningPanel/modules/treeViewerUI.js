@@ -428,31 +428,9 @@ function importTreeFromModal() {
     }
 }
 
-/**
- * Simple deep copy for plain data objects (no functions, no circular refs).
- * Avoids the overhead of JSON.parse(JSON.stringify()) serialization round-trip.
- */
-function _deepCopyPlain(obj) {
-    if (obj === null || typeof obj !== 'object') return obj;
-    if (Array.isArray(obj)) {
-        var arrCopy = [];
-        for (var i = 0; i < obj.length; i++) {
-            arrCopy[i] = _deepCopyPlain(obj[i]);
-        }
-        return arrCopy;
-    }
-    var objCopy = {};
-    for (var key in obj) {
-        if (obj.hasOwnProperty(key)) {
-            objCopy[key] = _deepCopyPlain(obj[key]);
-        }
-    }
-    return objCopy;
-}
-
 function mergeTreeData(existing, newData) {
-    // Create a deep copy of existing data
-    var merged = _deepCopyPlain(existing);
+    // Create a deep copy of existing data (deepCopyPlain from uiHelpers.js)
+    var merged = deepCopyPlain(existing);
 
     if (!merged.schools) merged.schools = {};
     
@@ -9,6 +9,16 @@
 // STATUS UPDATES
 // =============================================================================
 
+// Read-only theme-variable lookup for the school breakdown - module level so
+// it is not rebuilt on every primed-count refresh
+var SCHOOL_BREAKDOWN_COLORS = {
+    'Destruction': 'var(--destruction)',
+    'Restoration': 'var(--restoration)',
+    'Alteration': 'var(--alteration)',
+    'Conjuration': 'var(--conjuration)',
+    'Illusion': 'var(--illusion)'
+};
+
 function updateStatus(message) {
     var statusText = document.getElementById('statusText');
     if (statusText) {
@@ -308,13 +318,7 @@ function updatePrimedCount() {
 
     var breakdownEl = document.getElementById('scanSchoolBreakdown');
     if (breakdownEl) {
-        var schoolColors = {
-            'Destruction': 'var(--destruction)',
-            'Restoration': 'var(--restoration)',
-            'Alteration': 'var(--alteration)',
-            'Conjuration': 'var(--conjuration)',
-            'Illusion': 'var(--illusion)'
-        };
+        var schoolColors = SCHOOL_BREAKDOWN_COLORS;
         var html = '';
         var sortedSchools = Object.keys(schoolCounts).sort(function(a, b) {
             return schoolCounts[b] - schoolCounts[a];
@@ -497,6 +501,33 @@ window.onPresetsLoaded = function(resultStr) {
     }
 };
 
+// =============================================================================
+// GENERAL UTILITIES
+// =============================================================================
+
+/**
+ * Simple deep copy for plain data objects (no functions, no circular refs).
+ * Avoids the overhead of the JSON.parse(JSON.stringify()) serialization
+ * round-trip used for settings/preset snapshots.
+ */
+function deepCopyPlain(obj) {
+    if (obj === null || typeof obj !== 'object') return obj;
+    if (Array.isArray(obj)) {
+        var arrCopy = [];
+        for (var i = 0; i < obj.length; i++) {
+            arrCopy[i] = deepCopyPlain(obj[i]);
+        }
+        return arrCopy;
+    }
+    var objCopy = {};
+    for (var key in obj) {
+        if (obj.hasOwnProperty(key)) {
+            objCopy[key] = deepCopyPlain(obj[key]);
+        }
+    }
+    return objCopy;
+}
+
 // =============================================================================
 // XP UTILITIES
 // =============================================================================
@@ -10,6 +10,17 @@
  * Depends on: layoutGenerator.js, state.js
  */
 
+// =============================================================================
+// CONSTANTS
+// =============================================================================
+
+// Degree→radian factor, computed once instead of Math.PI / 180 at every call site
+var DEG_TO_RAD = Math.PI / 180;
+
+// Shared empty list for lookup misses — avoids allocating a fresh [] on every
+// miss in hot helpers like areRelated. Read-only by convention; never push to it.
+var EMPTY_LIST = [];
+
 // =============================================================================
 // VANILLA ROOT SPELLS (preferred starting points)
 // =============================================================================
@@ -71,29 +82,31 @@ function assignSpellsToPositions(positions, spells, seed) {
     
     var assignedCount = 0;
     
-    // Step 1: Assign root positions - PREFER vanilla root spell first
+    // Step 1: Assign root positions - PREFER vanilla root spell first.
+    // Spells are consumed through index cursors rather than shift(),
+    // which re-indexed the whole remaining array on every assignment
     var noviceSpells = spellsByTier[0] || [];
+    var noviceIdx = 0;
     for (var i = 0; i < rootPositions.length; i++) {
         if (i === 0 && vanillaRootSpell) {
             // First root position gets vanilla root spell (Flames, Healing, etc.)
             rootPositions[i].spell = vanillaRootSpell;
             console.log('[VisualFirstBuilder] Assigned vanilla root:', vanillaRootSpell.name, 'to', school);
-        } else if (noviceSpells.length > 0) {
-            rootPositions[i].spell = noviceSpells.shift();
+        } else if (noviceIdx < noviceSpells.length) {
+            rootPositions[i].spell = noviceSpells[noviceIdx++];
         }
         if (rootPositions[i].spell) assignedCount++;
     }
-    
+
     // Step 2: Collect all remaining spells in tier order
-    var allSpellsOrdered = [];
-    allSpellsOrdered = allSpellsOrdered.concat(noviceSpells);  // Remaining novice
+    var allSpellsOrdered = noviceSpells.slice(noviceIdx);  // Remaining novice
     for (var t = 1; t < 5; t++) {
         allSpellsOrdered = allSpellsOrdered.concat(spellsByTier[t] || []);
     }
-    
+
     // Step 3: Assign to regular positions (inner to outer)
-    for (var i = 0; i < regularPositions.length && allSpellsOrdered.length > 0; i++) {
-        regularPositions[i].spell = allSpellsOrdered.shift();
+    for (var i = 0, spellIdx = 0; i < regularPositions.length && spellIdx < allSpellsOrdered.length; i++) {
+        regularPositions[i].spell = allSpellsOrdered[spellIdx++];
         assignedCount++;
     }
     
@@ -106,12 +119,15 @@ function assignSpellsToPositions(positions, spells, seed) {
 
 /**
  * Convert tier name to index.
+ * Map lookup instead of allocating and scanning the tier list per call -
+ * this runs for every spell during position assignment.
  */
+var TIER_NAME_INDEX = { 'Novice': 0, 'Apprentice': 1, 'Adept': 2, 'Expert': 3, 'Master': 4 };
+
 function getTierIndex(tier) {
     if (typeof tier === 'number') return tier;
-    var tiers = ['Novice', 'Apprentice', 'Adept', 'Expert', 'Master'];
-    var idx = tiers.indexOf(tier);
-    return idx >= 0 ? idx : 0;
+    var idx = TIER_NAME_INDEX[tier];
+    return idx !== undefined ? idx : 0;
 }
 
 // =============================================================================
@@ -161,8 +177,8 @@ function buildEdges(positions, config, seed, fuzzyData) {
     
     // Helper to check if spells are fuzzy-related
     function areRelated(formId1, formId2) {
-        var related1 = relationships[formId1] || [];
-        var related2 = relationships[formId2] || [];
+        var related1 = relationships[formId1] || EMPTY_LIST;
+        var related2 = relationships[formId2] || EMPTY_LIST;
         return related1.indexOf(formId2) >= 0 || related2.indexOf(formId1) >= 0;
     }
     
@@ -662,13 +678,17 @@ function buildEdgesFuzzyGroups(positions, config, seed, fuzzyData) {
  * @param {Function} rng - Random number generator
  * @returns {Array} - Array of {theme, spells: [...]} objects
  */
+// Module-level stop list so the array (and the _set / per-spell keyword
+// caches keyed on its identity) survives across builds
+var GROUP_STOP_WORDS = ['the', 'of', 'and', 'a', 'to', 'in', 'for', 'is', 'on', 'that', 'by', 'this', 'with', 'i', 'you', 'it', 'not', 'or', 'be', 'are', 'from', 'at', 'as', 'your', 'all', 'have', 'new', 'more', 'an', 'was', 'we', 'will', 'can', 'us', 'about', 'if', 'my', 'has', 'but', 'our', 'one', 'other', 'do', 'no', 'time', 'very', 'when', 'come', 'could', 'now', 'than', 'like', 'only', 'into', 'its', 'also', 'after', 'use', 'two', 'how', 'which', 'way', 'well', 'may', 'then', 'any', 'through', 'during', 'each', 'where', 'spell', 'magic', 'magicka', 'target', 'effect', 'points', 'second', 'seconds', 'level', 'caster', 'concentration'];
+
 function discoverFuzzyGroups(nodesWithSpells, rng) {
     // Extract keywords from all spells using UNIFIED extraction (includes description)
     var keywordCounts = {};
     var spellKeywords = {};
-    
-    var stopWords = ['the', 'of', 'and', 'a', 'to', 'in', 'for', 'is', 'on', 'that', 'by', 'this', 'with', 'i', 'you', 'it', 'not', 'or', 'be', 'are', 'from', 'at', 'as', 'your', 'all', 'have', 'new', 'more', 'an', 'was', 'we', 'will', 'can', 'us', 'about', 'if', 'my', 'has', 'but', 'our', 'one', 'other', 'do', 'no', 'time', 'very', 'when', 'come', 'could', 'now', 'than', 'like', 'only', 'into', 'its', 'also', 'after', 'use', 'two', 'how', 'which', 'way', 'well', 'may', 'then', 'any', 'through', 'during', 'each', 'where', 'spell', 'magic', 'magicka', 'target', 'effect', 'points', 'second', 'seconds', 'level', 'caster', 'concentration'];
-    
+
+    var stopWords = GROUP_STOP_WORDS;
+
     nodesWithSpells.forEach(function(node) {
         var spell = node.spell;
         
@@ -720,7 +740,7 @@ function discoverFuzzyGroups(nodesWithSpells, rng) {
     
     nodesWithSpells.forEach(function(node) {
         var spell = node.spell;
-        var words = spellKeywords[spell.formId] || [];
+        var words = spellKeywords[spell.formId] || EMPTY_LIST;
         
         // Find best matching theme
         var bestTheme = null;
@@ -830,6 +850,28 @@ function distance(a, b) {
 // ORGANIC GROWTH SYSTEM - Shape-constrained growth with NLP clustering
 // =============================================================================
 
+// Per-school cache of discovered NLP groups (see growOrganicTree step 1)
+var _groupDiscoveryCache = {};
+
+// Organic growth root lookup tables - module level so they are not rebuilt
+// per school build. Note: Illusion differs from VANILLA_ROOTS on purpose
+// (organic growth prefers Clairvoyance over Courage as the entry point).
+var VANILLA_ROOT_FORMIDS = {
+    'Destruction': '0x00012FCD',
+    'Restoration': '0x00012FCC',
+    'Alteration': '0x0005AD5C',
+    'Conjuration': '0x000640B6',
+    'Illusion': '0x00021143'
+};
+
+var VANILLA_ROOT_NAMES = {
+    'Destruction': 'flames',
+    'Restoration': 'healing',
+    'Alteration': 'oakflesh',
+    'Conjuration': 'conjure familiar',
+    'Illusion': 'clairvoyance'
+};
+
 /**
  * Grow a tree organically within shape constraints.
  * 
@@ -893,7 +935,24 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
     }
     
     // Step 1: Discover NLP groups
-    var groups = discoverFuzzyGroupsFromSpells(spells.slice(), rng);
+    // Discovery depends only on the spell list - not on shape, density,
+    // convergence or seed - so reuse the mined groups when the same school
+    // is regenerated with different settings. Key on the formId sequence
+    // plus the first spell's identity so a fresh scan misses the cache.
+    var discoveryKey = spells.map(function(s) { return s.formId; }).join(',');
+    var cachedDiscovery = _groupDiscoveryCache[config.schoolName || ''];
+    var groups;
+    if (cachedDiscovery && cachedDiscovery.key === discoveryKey && cachedDiscovery.firstSpell === spells[0]) {
+        groups = cachedDiscovery.groups;
+        console.log('[OrganicGrowth] Reusing cached NLP groups for ' + (config.schoolName || 'school'));
+    } else {
+        groups = discoverFuzzyGroupsFromSpells(spells.slice(), rng);
+        _groupDiscoveryCache[config.schoolName || ''] = {
+            key: discoveryKey,
+            firstSpell: spells[0],
+            groups: groups
+        };
+    }
     console.log('[OrganicGrowth] Groups:', groups.map(function(g) { return g.theme + '(' + g.spells.length + ')'; }).join(', '));
     
     // Assign angular regions to groups
@@ -903,6 +962,8 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
     
     groups.forEach(function(group, idx) {
         var laneWidth = usableSector / groupCount;
+        // Numeric id so hot loops compare ints instead of theme strings
+        group.id = idx;
         group.preferredAngle = sectorStart + (idx + 0.5) * laneWidth;
         group.angleMin = sectorStart + idx * laneWidth;
         group.angleMax = sectorStart + (idx + 1) * laneWidth;
@@ -917,22 +978,6 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
     });
     
     // Step 2: Find and place root spell
-    var VANILLA_ROOT_FORMIDS = {
-        'Destruction': '0x00012FCD',
-        'Restoration': '0x00012FCC',
-        'Alteration': '0x0005AD5C',
-        'Conjuration': '0x000640B6',
-        'Illusion': '0x00021143'
-    };
-    
-    var VANILLA_ROOT_NAMES = {
-        'Destruction': 'flames',
-        'Restoration': 'healing', 
-        'Alteration': 'oakflesh',
-        'Conjuration': 'conjure familiar',
-        'Illusion': 'clairvoyance'
-    };
-    
     var rootFormId = VANILLA_ROOT_FORMIDS[config.schoolName];
     var rootName = VANILLA_ROOT_NAMES[config.schoolName];
     var rootSpell = null;
@@ -952,7 +997,7 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
     if (!rootSpell) rootSpell = spellQueue.shift();
     
     // Place root
-    var rootRad = sliceInfo.spokeAngle * Math.PI / 180;
+    var rootRad = sliceInfo.spokeAngle * DEG_TO_RAD;
     var rootNode = {
         tier: 0,
         radius: baseRadius,
@@ -964,6 +1009,12 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
         spell: rootSpell,
         formId: rootSpell.formId,
         children: [],
+        // Predeclared so later passes (prereq links, prereq requirements,
+        // alternate paths) don't grow the object shape mid-build - same
+        // rationale as initSpellMemoSlots for spell objects
+        prerequisites: null,
+        prereqRequirements: null,
+        alternatePaths: null,
         _fromVisualFirst: true
     };
     positions.push(rootNode);
@@ -971,27 +1022,30 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
     hubNodes.push(rootNode);
     nodesByTier[0] = [rootNode];
     
-    // Step 3: Sort spells by group AND spell level (Novice → Master within each group)
-    spellQueue.sort(function(a, b) {
-        var groupA = spellToGroup[a.formId];
-        var groupB = spellToGroup[b.formId];
-        if (!groupA || !groupB) return 0;
-        
+    // Step 3: Sort spells by group AND spell level (Novice → Master within each group).
+    // Decorate-sort-undecorate: the comparator runs O(N log N) times and
+    // used to chase two spellToGroup hash lookups per comparison, so the
+    // sort keys are resolved once per spell up front
+    var queueKeys = spellQueue.map(function(s) {
+        return { spell: s, group: spellToGroup[s.formId], rank: getSpellRank(s), matchScore: s.matchScore || 0 };
+    });
+    queueKeys.sort(function(a, b) {
+        if (!a.group || !b.group) return 0;
+
         // First sort by group (angular position)
-        if (groupA.theme !== groupB.theme) {
-            return groupA.preferredAngle - groupB.preferredAngle;
+        if (a.group.theme !== b.group.theme) {
+            return a.group.preferredAngle - b.group.preferredAngle;
         }
-        
+
         // Within same group, sort by spell level (lower levels first)
-        var levelA = getSpellRank(a);
-        var levelB = getSpellRank(b);
-        if (levelA !== levelB) {
-            return levelA - levelB;  // Novice (0) before Apprentice (1) before Master (4)
+        if (a.rank !== b.rank) {
+            return a.rank - b.rank;  // Novice (0) before Apprentice (1) before Master (4)
         }
-        
+
         // Same level: use match score
-        return (b.matchScore || 0) - (a.matchScore || 0);
+        return b.matchScore - a.matchScore;
     });
+    for (var qi = 0; qi < queueKeys.length; qi++) spellQueue[qi] = queueKeys[qi].spell;
     
     // Step 4: Grow tree using behavior-driven placement with DYNAMIC tier-weighted selection
     var currentTier = 1;
@@ -1118,6 +1172,9 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
         params.crossConnectionDensity = 0.1;
     }
 
+    // Sector angle in radians — constant across the whole growth loop
+    var sectorRad = sliceInfo.sectorAngle * DEG_TO_RAD;
+
     while (spellQueue.length > 0) {
 
         // Calculate progress and get behavior parameters for this point
@@ -1140,7 +1197,7 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
         
         // Estimate tier capacity for fill threshold - use unified config
         var tierRadius = baseRadius + currentTier * gridCfg.tierSpacing;
-        var tierArc = (sliceInfo.sectorAngle * Math.PI / 180) * tierRadius;
+        var tierArc = sectorRad * tierRadius;
         var tierCapacity = Math.floor(tierArc / gridCfg.arcSpacing);
         var tierNodesPlaced = nodesByTier[currentTier] ? nodesByTier[currentTier].length : 0;
         
@@ -1187,8 +1244,13 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
             spell: spell,
             formId: spell.formId,
             fuzzyGroup: group ? group.theme : '_other',
+            fuzzyGroupId: group ? group.id : -1,
             parent: parentNode.formId,
             children: [],
+            // Predeclared for shape stability (see root node literal)
+            prerequisites: null,
+            prereqRequirements: null,
+            alternatePaths: null,
             _fromVisualFirst: true
         };
         
@@ -1255,12 +1317,19 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
     };
     var alternateResult = addAlternatePaths(positions, edges, spellToGroup, rng, altPathConfig);
     
+    // Positions are final after step 7 - build the formId lookup once and
+    // share it with the post-processing passes instead of each rebuilding it
+    var positionByFormId = {};
+    positions.forEach(function(p) {
+        if (p.spell) positionByFormId[p.spell.formId] = p;
+    });
+
     // Step 8: Assign hard/soft prerequisite requirements
-    var prereqStats = assignPrerequisiteRequirements(positions, edges, rng);
-    
+    var prereqStats = assignPrerequisiteRequirements(positions, edges, rng, positionByFormId);
+
     // Step 9: Fix thematic inconsistencies (post-processing)
     // This ensures spells have at least one thematically related prerequisite
-    var thematicStats = fixThematicInconsistencies(positions, edges, rng);
+    var thematicStats = fixThematicInconsistencies(positions, edges, rng, positionByFormId);
     
     console.log('[OrganicGrowth] Placed', positions.length, 'nodes,', edges.length, 'edges,', 
                 hubNodes.length, 'hubs,', prereqResult.count, 'prereqs,', 
@@ -1279,13 +1348,13 @@ function growOrganicTree(spells, sliceInfo, config, seed) {
 function findBehaviorParent(placedNodes, hubNodes, group, params, rng, childSpell) {
     var childLevel = childSpell ? getSpellRank(childSpell) : 0;
 
-    // LOG: Show element isolation settings for this parent search
+    // Isolation flags hoisted once — the scoring loop below reads them per
+    // candidate. The flags themselves are logged once per build in
+    // generateAllVisualFirstTrees, not per placed spell: every console.log
+    // crosses the JS/native bridge, and this runs for every placement
     var tg = params.treeGeneration || {};
-    if (childSpell && childSpell.name) {
-        console.log('[findBehaviorParent] Spell:', childSpell.name,
-                    '| elementIsolation:', tg.elementIsolation,
-                    '| strict:', tg.elementIsolationStrict);
-    }
+    var isoStrict = !!tg.elementIsolationStrict;
+    var isoSoft = !!tg.elementIsolation;
 
     // Branch limits
     var ROOT_MAX_CHILDREN = 5;       // Root can have max 5 direct children
@@ -1334,9 +1403,10 @@ function findBehaviorParent(placedNodes, hubNodes, group, params, rng, childSpel
     }
     
     // Find nodes in same group that pass all filters
+    // (int id compare — avoids per-candidate theme string comparisons)
     var candidates = group ? placedNodes.filter(function(n) {
         if (!candidateFilter(n)) return false;
-        return n.fuzzyGroup === group.theme || n.isRoot || n.isHub;
+        return n.fuzzyGroupId === group.id || n.isRoot || n.isHub;
     }) : placedNodes.filter(candidateFilter);
     
     // Fallback: if no group-matching candidates, try any that pass filter
@@ -1345,84 +1415,82 @@ function findBehaviorParent(placedNodes, hubNodes, group, params, rng, childSpel
     }
     
     // Last resort: find node with fewest children (ignoring level)
+    // Single tracked-best pass — no need to copy and sort the whole list
     if (candidates.length === 0) {
-        var sorted = placedNodes.slice().sort(function(a, b) {
-            return (a.children ? a.children.length : 0) - (b.children ? b.children.length : 0);
-        });
-        // Return the one with fewest children
-        return sorted[0];
+        var fewest = placedNodes[0];
+        var fewestCount = fewest.children ? fewest.children.length : 0;
+        for (var fi = 1; fi < placedNodes.length; fi++) {
+            var fCount = placedNodes[fi].children ? placedNodes[fi].children.length : 0;
+            if (fCount < fewestCount) {
+                fewest = placedNodes[fi];
+                fewestCount = fCount;
+            }
+        }
+        return fewest;
     }
     
-    // Score candidates: prefer appropriate parents with matching spell levels AND themes
-    candidates.sort(function(a, b) {
-        var aChildren = a.children ? a.children.length : 0;
-        var bChildren = b.children ? b.children.length : 0;
-        var aLevel = a.spell ? getSpellRank(a.spell) : 0;
-        var bLevel = b.spell ? getSpellRank(b.spell) : 0;
-        
+    // Score each candidate ONCE, then sort on the precomputed score.
+    // The scoring (especially calculateThematicSimilarity) is far too
+    // expensive to re-run inside a sort comparator, which evaluates it
+    // O(n log n) times instead of O(n).
+    var scored = [];
+    var strictBlocks = 0;
+    var softPenalties = 0;
+    for (var ci = 0; ci < candidates.length; ci++) {
+        var cand = candidates[ci];
+        var childCount = cand.children ? cand.children.length : 0;
+        var candLevel = cand.spell ? getSpellRank(cand.spell) : 0;
+
         // Heavy penalty for root if child level > 1
-        var aRootPenalty = (a.isRoot && childLevel > ROOT_MAX_CHILD_LEVEL) ? 1000 : 0;
-        var bRootPenalty = (b.isRoot && childLevel > ROOT_MAX_CHILD_LEVEL) ? 1000 : 0;
-        
+        var rootPenalty = (cand.isRoot && childLevel > ROOT_MAX_CHILD_LEVEL) ? 1000 : 0;
+
         // Prefer closer spell levels (same level best, 1 level lower also good)
-        var aLevelDiff = Math.abs(aLevel - childLevel);
-        var bLevelDiff = Math.abs(bLevel - childLevel);
-        
+        var levelDiff = Math.abs(candLevel - childLevel);
+
         // Penalize parents with higher level than child (hierarchy should go low → high)
-        var aLevelPenalty = (aLevel > childLevel) ? 10 : 0;
-        var bLevelPenalty = (bLevel > childLevel) ? 10 : 0;
-        
+        var levelPenalty = (candLevel > childLevel) ? 10 : 0;
+
         // Fuzzy group bonus: same group = better thematic connection
-        var aGroupBonus = (group && a.fuzzyGroup === group.theme) ? -5 : 0;
-        var bGroupBonus = (group && b.fuzzyGroup === group.theme) ? -5 : 0;
-        
+        var groupBonus = (group && cand.fuzzyGroupId === group.id) ? -5 : 0;
+
         // THEMATIC BONUS: Prefer parents with similar element/theme keywords
         // This is critical for avoiding illogical prereqs like fire->frost
-        var aThematicBonus = 0;
-        var bThematicBonus = 0;
-        var aElementPenalty = 0;
-        var bElementPenalty = 0;
-
-        if (childSpell && a.spell) {
-            var aSim = calculateThematicSimilarity(childSpell, a.spell);
-            aThematicBonus = aSim > 0.5 ? -10 : (aSim > 0.3 ? -5 : 0);
+        var thematicBonus = 0;
+        var elementPenalty = 0;
+        if (childSpell && cand.spell) {
+            var sim = calculateThematicSimilarity(childSpell, cand.spell);
+            thematicBonus = sim > 0.5 ? -10 : (sim > 0.3 ? -5 : 0);
 
             // Element isolation penalty (uses config.treeGeneration if available)
-            if (aSim <= 0.1) {  // Element conflict (fire vs frost etc)
-                if (params.treeGeneration && params.treeGeneration.elementIsolationStrict) {
-                    aElementPenalty = 10000;  // Effectively forbidden
-                    console.log('[ELEMENT CONFLICT] STRICT BLOCK:', childSpell.name, '<-', a.spell.name, '(penalty 10000)');
-                } else if (params.treeGeneration && params.treeGeneration.elementIsolation) {
-                    aElementPenalty = 100;  // Strong penalty
-                    console.log('[ELEMENT CONFLICT] penalty:', childSpell.name, '<-', a.spell.name, '(penalty 100)');
-                }
-            }
-        }
-        if (childSpell && b.spell) {
-            var bSim = calculateThematicSimilarity(childSpell, b.spell);
-            bThematicBonus = bSim > 0.5 ? -10 : (bSim > 0.3 ? -5 : 0);
-
-            // Element isolation penalty
-            if (bSim <= 0.1) {  // Element conflict
-                if (params.treeGeneration && params.treeGeneration.elementIsolationStrict) {
-                    bElementPenalty = 10000;
-                } else if (params.treeGeneration && params.treeGeneration.elementIsolation) {
-                    bElementPenalty = 100;
+            if (sim <= 0.1) {  // Element conflict (fire vs frost etc)
+                if (isoStrict) {
+                    elementPenalty = 10000;  // Effectively forbidden
+                    strictBlocks++;
+                } else if (isoSoft) {
+                    elementPenalty = 100;  // Strong penalty
+                    softPenalties++;
                 }
             }
         }
 
         // Combined score: lower = better
-        // child count * 3 + level diff * 2 + level penalty + root penalty + group bonus + thematic bonus + element penalty
-        var aScore = aChildren * 3 + aLevelDiff * 2 + aLevelPenalty + aRootPenalty + aGroupBonus + aThematicBonus + aElementPenalty;
-        var bScore = bChildren * 3 + bLevelDiff * 2 + bLevelPenalty + bRootPenalty + bGroupBonus + bThematicBonus + bElementPenalty;
-        
-        return aScore - bScore;
-    });
-    
+        scored.push({
+            node: cand,
+            score: childCount * 3 + levelDiff * 2 + levelPenalty + rootPenalty + groupBonus + thematicBonus + elementPenalty
+        });
+    }
+
+    // One summary line per child instead of one log per conflicting candidate
+    if (strictBlocks > 0 || softPenalties > 0) {
+        debugLog('[ELEMENT CONFLICT] ' + (childSpell ? childSpell.name : '?') + ': ' +
+                    strictBlocks + ' strict blocks, ' + softPenalties + ' penalized candidates');
+    }
+
+    scored.sort(function(a, b) { return a.score - b.score; });
+
     // Pick from top candidates with some randomness (but not too random)
-    var pickIdx = Math.floor(rng() * Math.min(3, candidates.length));
-    return candidates[pickIdx];
+    var pickIdx = Math.floor(rng() * Math.min(3, scored.length));
+    return scored[pickIdx].node;
 }
 
 /**
@@ -1464,17 +1532,32 @@ function findBehaviorPosition(parent, direction, group, placedNodes, sliceInfo,
         tiersToTry.push(parentTier);
     }
     
+    // Per-tier angular grid cache: radius, candidate count, and angle step
+    // depend only on the tier and the (fixed) sector/grid config, so compute
+    // them once per tier per school instead of on every placement.
+    var tierGrid = sliceInfo._tierGridCache || (sliceInfo._tierGridCache = {});
+
     for (var t = 0; t < tiersToTry.length; t++) {
         var tier = tiersToTry[t];
-        var radius = baseRadius + tier * tierSpacing;
-        
-        // Calculate angular grid positions for this tier
-        var arcLength = (sliceInfo.sectorAngle / 360) * 2 * Math.PI * radius;
-        var candidateCount = Math.max(3, Math.floor(arcLength / arcSpacing));
-        var usableAngle = sliceInfo.sectorAngle * 0.85;
-        var angleStep = candidateCount > 1 ? usableAngle / (candidateCount - 1) : 0;
-        var startAngle = sliceInfo.spokeAngle - usableAngle / 2;
-        
+
+        var grid = tierGrid[tier];
+        if (!grid) {
+            var gridRadius = baseRadius + tier * tierSpacing;
+            var arcLength = (sliceInfo.sectorAngle / 360) * 2 * Math.PI * gridRadius;
+            var gridCount = Math.max(3, Math.floor(arcLength / arcSpacing));
+            var usableAngle = sliceInfo.sectorAngle * 0.85;
+            grid = tierGrid[tier] = {
+                radius: gridRadius,
+                candidateCount: gridCount,
+                angleStep: gridCount > 1 ? usableAngle / (gridCount - 1) : 0,
+                startAngle: sliceInfo.spokeAngle - usableAngle / 2
+            };
+        }
+        var radius = grid.radius;
+        var candidateCount = grid.candidateCount;
+        var angleStep = grid.angleStep;
+        var startAngle = grid.startAngle;
+
         // Try each angular grid position
         for (var i = 0; i < candidateCount; i++) {
             var angle = candidateCount === 1 
@@ -1494,7 +1577,7 @@ function findBehaviorPosition(parent, direction, group, placedNodes, sliceInfo,
             if (!shapeMask(tierProgress, angleNorm, rng)) continue;
             
             // Calculate position
-            var rad = angle * Math.PI / 180;
+            var rad = angle * DEG_TO_RAD;
             var x = Math.cos(rad) * radius;
             var y = Math.sin(rad) * radius;
             
@@ -1558,10 +1641,15 @@ function findBehaviorPosition(parent, direction, group, placedNodes, sliceInfo,
     }
     
     if (candidates.length === 0) return null;
-    
-    // Sort by score, pick the BEST position (exact grid alignment)
-    candidates.sort(function(a, b) { return a.score - b.score; });
-    return candidates[0];
+
+    // Pick the BEST position (exact grid alignment) — single min scan,
+    // no need to sort the whole candidate list for one winner.
+    // First-on-tie matches what the previous stable sort returned.
+    var best = candidates[0];
+    for (var c = 1; c < candidates.length; c++) {
+        if (candidates[c].score < best.score) best = candidates[c];
+    }
+    return best;
 }
 
 /**
@@ -1587,7 +1675,7 @@ function placeTerminalCluster(cluster, positions, placedNodes, edges, nodesByTie
         // Clamp to sector
         clusterAngle = Math.max(sliceInfo.startAngle + 2, Math.min(sliceInfo.endAngle - 2, clusterAngle));
         
-        var rad = clusterAngle * Math.PI / 180;
+        var rad = clusterAngle * DEG_TO_RAD;
         var x = Math.cos(rad) * clusterR;
         var y = Math.sin(rad) * clusterR;
         
@@ -1621,8 +1709,13 @@ function placeTerminalCluster(cluster, positions, placedNodes, edges, nodesByTie
             spell: spell,
             formId: spell.formId,
             fuzzyGroup: parent.fuzzyGroup,
+            fuzzyGroupId: parent.fuzzyGroupId !== undefined ? parent.fuzzyGroupId : -1,
             parent: parent.formId,
             children: [],
+            // Predeclared for shape stability (see root node literal)
+            prerequisites: null,
+            prereqRequirements: null,
+            alternatePaths: null,
             _fromVisualFirst: true
         };
         
@@ -1661,7 +1754,14 @@ var PREREQ_COUNTS_BY_RANK = {
  */
 function getSpellRank(spell) {
     if (!spell) return 0;
-    
+    // Memoized on the spell object: parent search re-ranks the same spells
+    // for every candidate on every placement, and the string parse below
+    // is invariant per spell.
+    if (spell._cachedRank !== undefined) return spell._cachedRank;
+    return (spell._cachedRank = computeSpellRank(spell));
+}
+
+function computeSpellRank(spell) {
     var level = spell.skillLevel || spell.tier || 0;
     
     // Handle string levels
@@ -1696,20 +1796,61 @@ function getSpellRank(spell) {
  * @param {Object} treeGeneration - Tree generation settings (optional)
  * @returns {number} - Score (higher = better match)
  */
+/**
+ * Tier-difference bonus table, indexed by min(tierDiff, 9). Replaces the
+ * old if/else cascade in the scoring core - tierDiff is always >= 1 there
+ * (lower diffs bail out earlier), so index 0 is never hit.
+ * 1 -> 50 (immediate predecessor), 2 -> 40, 3-4 -> 30, 5-8 -> 15, 9+ -> 5.
+ */
+var TIER_DIFF_BONUS = [0, 50, 40, 30, 30, 15, 15, 15, 15, 5];
+
 function calculatePrereqScore(candidate, target, spellToGroup, treeGeneration) {
-    var score = 0;
     var treeGen = treeGeneration || {};
+    return calculatePrereqScoreImpl(candidate, target,
+        spellToGroup[target.formId], getSpellRank(target.spell), spellToGroup,
+        treeGen.elementIsolationStrict, treeGen.elementIsolation, GRID_CONFIG.nodeSize);
+}
+
+/**
+ * Scoring core with the per-target features and pass-invariant settings
+ * passed in as plain arguments. The candidate scan evaluates every target
+ * against O(N) candidates, so the target's group and rank are resolved
+ * once per target, and the isolation flags and node size once per pass,
+ * instead of chasing nested config objects on every pair.
+ *
+ * @param {Object} candidate - Potential prerequisite node
+ * @param {Object} target - Node that needs prerequisites
+ * @param {Object|undefined} targetGroup - Precomputed spellToGroup[target.formId]
+ * @param {number} targetRank - Precomputed getSpellRank(target.spell)
+ * @param {Object} spellToGroup - Spell to fuzzy group mapping
+ * @param {boolean} isoStrict - treeGeneration.elementIsolationStrict
+ * @param {boolean} isoSoft - treeGeneration.elementIsolation
+ * @param {number} nodeSize - GRID_CONFIG.nodeSize
+ * @returns {number} - Score (higher = better match)
+ */
+function calculatePrereqScoreImpl(candidate, target, targetGroup, targetRank, spellToGroup, isoStrict, isoSoft, nodeSize) {
+    var score = 0;
+
+    // 1. TIER FACTOR: Candidate must be lower tier (closer to root).
+    // Checked before anything else - it is a plain integer compare and a
+    // doomed candidate skips the thematic similarity work entirely.
+    // (Callers only distinguish positive from non-positive scores, so
+    // rejecting here before the strict-isolation check is equivalent.)
+    var tierDiff = target.tier - candidate.tier;
+    if (tierDiff <= 0) {
+        return -1000; // Invalid: prerequisite must be lower tier
+    }
 
     // 0. ELEMENT ISOLATION CHECK (highest priority)
-    // Must check this first - element conflicts cause massive penalties
+    // Element conflicts cause massive penalties
     if (candidate.spell && target.spell) {
         var thematicSim = calculateThematicSimilarity(candidate.spell, target.spell);
         var hasElementConflict = thematicSim <= 0.1;  // 0.1 = element conflict
 
         if (hasElementConflict) {
-            if (treeGen.elementIsolationStrict) {
+            if (isoStrict) {
                 return -10000;  // Forbidden - cross-element links not allowed
-            } else if (treeGen.elementIsolation) {
+            } else if (isoSoft) {
                 score -= 500;   // Heavy penalty but not forbidden
             }
         } else if (thematicSim >= 0.8) {
@@ -1718,21 +1859,11 @@ function calculatePrereqScore(candidate, target, spellToGroup, treeGeneration) {
         }
     }
 
-    // 1. TIER FACTOR: Candidate must be lower tier (closer to root)
     // Strong preference for 1-3 tiers below
-    var tierDiff = target.tier - candidate.tier;
-    if (tierDiff <= 0) {
-        return -1000; // Invalid: prerequisite must be lower tier
-    }
-    if (tierDiff === 1) score += 50;      // Immediate predecessor - best
-    else if (tierDiff === 2) score += 40;
-    else if (tierDiff <= 4) score += 30;
-    else if (tierDiff <= 8) score += 15;
-    else score += 5;                       // Very distant - still valid but not preferred
+    score += TIER_DIFF_BONUS[tierDiff < 9 ? tierDiff : 9];
 
     // 2. FUZZY GROUP FACTOR: Same thematic group is preferred
     var candidateGroup = spellToGroup[candidate.formId];
-    var targetGroup = spellToGroup[target.formId];
 
     if (candidateGroup && targetGroup) {
         if (candidateGroup.theme === targetGroup.theme) {
@@ -1746,7 +1877,6 @@ function calculatePrereqScore(candidate, target, spellToGroup, treeGeneration) {
     var dx = target.x - candidate.x;
     var dy = target.y - candidate.y;
     var distance = Math.sqrt(dx * dx + dy * dy);
-    var nodeSize = GRID_CONFIG.nodeSize;
 
     if (distance < nodeSize * 2) {
         score += 30; // Very close - strong spatial connection
@@ -1759,7 +1889,6 @@ function calculatePrereqScore(candidate, target, spellToGroup, treeGeneration) {
 
     // 4. RANK FACTOR: Prerequisite should be lower or equal rank
     var candidateRank = getSpellRank(candidate.spell);
-    var targetRank = getSpellRank(target.spell);
 
     if (candidateRank < targetRank) {
         score += 25; // Lower rank - appropriate prerequisite
@@ -1789,22 +1918,37 @@ function calculatePrereqScore(candidate, target, spellToGroup, treeGeneration) {
  */
 function addPrerequisiteLinks(positions, edges, spellToGroup, rng, treeGeneration) {
     var prereqsAdded = 0;
+
+    // Pass-invariant settings resolved once for the scoring core
+    var treeGen = treeGeneration || {};
+    var isoStrict = treeGen.elementIsolationStrict;
+    var isoSoft = treeGen.elementIsolation;
+    var nodeSize = GRID_CONFIG.nodeSize;
     
-    // Build existing edge set to avoid duplicates
+    // Build existing edge set (to avoid duplicates) and incoming-edge tally
+    // in a single pass over edges
     var existingEdges = {};
+    var incomingCount = {};
     edges.forEach(function(e) {
         var key = e.from + '->' + e.to;
         existingEdges[key] = true;
         // Also mark reverse (bidirectional check)
         existingEdges[e.to + '->' + e.from] = true;
+        incomingCount[e.to] = (incomingCount[e.to] || 0) + 1;
     });
     
-    // Build node lookup by formId
-    var nodeByFormId = {};
-    positions.forEach(function(node) {
-        nodeByFormId[node.formId] = node;
+    // Bucket nodes by tier so each target only visits lower tiers instead
+    // of scanning all positions and rejecting same/higher tiers one by one.
+    // Each entry keeps its index in the original scan order (tier-major
+    // would reorder ties after the score sort otherwise).
+    var tierBuckets = {};
+    positions.forEach(function(node, idx) {
+        var bucket = tierBuckets[node.tier];
+        if (!bucket) bucket = tierBuckets[node.tier] = [];
+        bucket.push({ node: node, idx: idx });
     });
-    
+    var tierKeys = Object.keys(tierBuckets).map(Number).sort(function(a, b) { return a - b; });
+
     // Process each non-root node
     positions.forEach(function(targetNode) {
         if (targetNode.isRoot) return; // Root has no prerequisites
@@ -1822,35 +1966,40 @@ function addPrerequisiteLinks(positions, edges, spellToGroup, rng, treeGeneratio
         if (targetPrereqCount <= 0) return;
         
         // Count existing prerequisites (incoming edges where this node is 'to')
-        var existingPrereqCount = 0;
-        edges.forEach(function(e) {
-            if (e.to === targetNode.formId) {
-                existingPrereqCount++;
-            }
-        });
+        var existingPrereqCount = incomingCount[targetNode.formId] || 0;
         
         // How many more do we need?
         var prereqsNeeded = Math.max(0, targetPrereqCount - existingPrereqCount);
         if (prereqsNeeded <= 0) return;
         
-        // Find and score all candidate prerequisites
+        // Find and score all candidate prerequisites. Plain indexed loop
+        // with hoisted locals - this is the O(N^2) hot path and the UI
+        // engine runs interpreter-only, so per-iteration closure calls
+        // and repeated property loads cost real time here
         var candidates = [];
-        positions.forEach(function(candidateNode) {
-            if (candidateNode.formId === targetNode.formId) return; // Skip self
-            if (candidateNode.tier >= targetNode.tier) return; // Must be lower tier
-            
-            // Skip if edge already exists
-            var edgeKey = candidateNode.formId + '->' + targetNode.formId;
-            if (existingEdges[edgeKey]) return;
-            
-            var score = calculatePrereqScore(candidateNode, targetNode, spellToGroup, treeGeneration);
-            if (score > 0) {
-                candidates.push({ node: candidateNode, score: score });
+        var targetFormId = targetNode.formId;
+        var targetTier = targetNode.tier;
+        var targetGroup = spellToGroup[targetFormId];
+        for (var tk = 0; tk < tierKeys.length && tierKeys[tk] < targetTier; tk++) {
+            var bucket = tierBuckets[tierKeys[tk]];
+            for (var ci = 0; ci < bucket.length; ci++) {
+                var candidateNode = bucket[ci].node;
+                // Lower tier implies not self, so no formId self-check needed
+
+                // Skip if edge already exists
+                if (existingEdges[candidateNode.formId + '->' + targetFormId]) continue;
+
+                var score = calculatePrereqScoreImpl(candidateNode, targetNode,
+                    targetGroup, rank, spellToGroup, isoStrict, isoSoft, nodeSize);
+                if (score > 0) {
+                    candidates.push({ node: candidateNode, score: score, idx: bucket[ci].idx });
+                }
             }
-        });
-        
-        // Sort by score (best first)
-        candidates.sort(function(a, b) { return b.score - a.score; });
+        }
+
+        // Sort by score (best first); break score ties on original scan
+        // order so tier-major enumeration doesn't reorder equal candidates
+        candidates.sort(function(a, b) { return (b.score - a.score) || (a.idx - b.idx); });
         
         // Add some randomness: don't always pick the absolute best
         // Shuffle top candidates slightly
@@ -1881,6 +2030,7 @@ function addPrerequisiteLinks(positions, edges, spellToGroup, rng, treeGeneratio
                     type: 'prerequisite'
                 });
                 existingEdges[edgeKey] = true;
+                incomingCount[targetNode.formId] = (incomingCount[targetNode.formId] || 0) + 1;
                 prereqsAdded++;
                 selectedCount++;
                 
@@ -1923,17 +2073,20 @@ var PREREQ_TIER_CONFIG = {
  * @param {Array} positions - All node positions with spell data
  * @param {Array} edges - All edges (primary + any added prereqs)
  * @param {Function} rng - Seeded random number generator
+ * @param {Object} [positionByFormId] - Prebuilt formId -> position lookup
  * @returns {Object} - Stats about prereq assignment
  */
-function assignPrerequisiteRequirements(positions, edges, rng) {
+function assignPrerequisiteRequirements(positions, edges, rng, positionByFormId) {
     var stats = { nodesProcessed: 0, hardAssigned: 0, softAssigned: 0, filteredOut: 0 };
-    
-    // Build position lookup by formId for tier/rank checking
-    var positionByFormId = {};
-    positions.forEach(function(p) {
-        if (p.spell) positionByFormId[p.spell.formId] = p;
-    });
-    
+
+    // Position lookup by formId for tier/rank checking (caller may pass one in)
+    if (!positionByFormId) {
+        positionByFormId = {};
+        positions.forEach(function(p) {
+            if (p.spell) positionByFormId[p.spell.formId] = p;
+        });
+    }
+
     // Build incoming edges map: formId -> [incoming edge objects]
     var incomingEdges = {};
     positions.forEach(function(p) {
@@ -1952,7 +2105,7 @@ function assignPrerequisiteRequirements(positions, edges, rng) {
         
         var formId = node.spell.formId;
         var targetRank = getSpellRank(node.spell);
-        var allIncoming = incomingEdges[formId] || [];
+        var allIncoming = incomingEdges[formId] || EMPTY_LIST;
         
         // CRITICAL: Filter prerequisites - only allow same tier or weaker spells
         // A Novice spell can only have Novice prereqs, Apprentice can have Novice/Apprentice, etc.
@@ -2043,7 +2196,7 @@ function assignPrerequisiteRequirements(positions, edges, rng) {
             hardPrereqs = hardPrereqs.concat(softPrereqs);
             softPrereqs = [];
             softNeeded = 0;
-            console.log('[PrereqSystem] Consolidated ' + node.spell.name + ': all prereqs now HARD (' + hardPrereqs.length + ')');
+            debugLog('[PrereqSystem] Consolidated ' + node.spell.name + ': all prereqs now HARD (' + hardPrereqs.length + ')');
         }
         
         node.prereqRequirements = {
@@ -2091,6 +2244,27 @@ var THEMATIC_KEYWORDS = {
     aoe: ['mass', 'circle', 'storm', 'nova', 'explosion', 'burst']
 };
 
+/**
+ * Per-group alternation regexes compiled once from THEMATIC_KEYWORDS.
+ * computeSpellThemes used to indexOf-scan every keyword of every group per
+ * spell (~150 substring scans); one compiled pattern per group does the same
+ * membership test in a single pass. Substring semantics are unchanged.
+ */
+var _thematicPatterns = null;
+
+function getThematicPatterns() {
+    if (_thematicPatterns) return _thematicPatterns;
+
+    _thematicPatterns = {};
+    for (var group in THEMATIC_KEYWORDS) {
+        var escaped = THEMATIC_KEYWORDS[group].map(function(kw) {
+            return String(kw).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+        });
+        _thematicPatterns[group] = new RegExp(escaped.join('|'));
+    }
+    return _thematicPatterns;
+}
+
 /**
  * UNIFIED: Extract all searchable text from a spell.
  * This is the SINGLE source of truth for spell text extraction used by ALL fuzzy/NLP logic.
@@ -2101,7 +2275,13 @@ var THEMATIC_KEYWORDS = {
  */
 function extractSpellText(spell) {
     if (!spell) return '';
-    
+    // Built once per spell: keyword extraction, theme detection and fuzzy
+    // grouping all re-read the same text blob many times per build
+    if (spell._searchText !== undefined) return spell._searchText;
+    return (spell._searchText = extractSpellTextImpl(spell));
+}
+
+function extractSpellTextImpl(spell) {
     var textParts = [];
     
     // Spell name (most important)
@@ -2142,14 +2322,33 @@ function extractSpellText(spell) {
  * @returns {Array} - Array of keyword strings
  */
 function extractSpellKeywords(spell, stopWords) {
+    stopWords = stopWords || EMPTY_LIST;
+
+    // Memoized per spell and stop list: the grouping passes call this for
+    // every spell on every build, and the stop lists are module constants.
+    // Callers treat the result as read-only.
+    if (spell._keywords !== undefined && spell._keywordsStop === stopWords) {
+        return spell._keywords;
+    }
+
     var text = extractSpellText(spell);
-    if (!text) return [];
-    
-    stopWords = stopWords || [];
-    
-    return text.split(/[^a-z]+/).filter(function(w) {
-        return w.length > 2 && stopWords.indexOf(w) < 0;
-    });
+    if (!text) {
+        spell._keywordsStop = stopWords;
+        return (spell._keywords = []);
+    }
+
+    // Hash-set form of the stop list, cached on the array: the filter below
+    // runs per word per spell, and indexOf rescanned the whole list each time
+    var stopSet = stopWords._set;
+    if (!stopSet) {
+        stopSet = stopWords._set = {};
+        for (var si = 0; si < stopWords.length; si++) stopSet[stopWords[si]] = true;
+    }
+
+    spell._keywordsStop = stopWords;
+    return (spell._keywords = text.split(/[^a-z]+/).filter(function(w) {
+        return w.length > 2 && stopSet[w] !== true;
+    }));
 }
 
 /**
@@ -2159,21 +2358,25 @@ function extractSpellKeywords(spell, stopWords) {
  * @returns {Array} - Array of thematic group names this spell belongs to
  */
 function getSpellThemes(spell) {
+    // Memoized on the spell: similarity scoring calls this twice per candidate
+    // pair during parent selection, and the keyword scan is invariant per spell.
+    if (spell._themes !== undefined) return spell._themes;
+    return (spell._themes = computeSpellThemes(spell));
+}
+
+function computeSpellThemes(spell) {
     var fullText = extractSpellText(spell);
     if (fullText.length === 0) return [];
-    
+
     var themes = [];
-    
-    for (var group in THEMATIC_KEYWORDS) {
-        var keywords = THEMATIC_KEYWORDS[group];
-        for (var i = 0; i < keywords.length; i++) {
-            if (fullText.indexOf(keywords[i]) !== -1) {
-                themes.push(group);
-                break; // Only add group once
-            }
+
+    var patterns = getThematicPatterns();
+    for (var group in patterns) {
+        if (patterns[group].test(fullText)) {
+            themes.push(group);
         }
     }
-    
+
     return themes;
 }
 
@@ -2182,55 +2385,87 @@ function getSpellThemes(spell) {
  * Elemental matches (fire-fire, frost-frost, shock-shock) get highest score.
  * @returns {number} 0-1 score (1 = perfect match)
  */
+// Elemental theme names checked by the similarity kernel
+var SIM_ELEMENTS = { fire: true, frost: true, shock: true };
+
+/**
+ * Bit index per theme group, assigned lazily in THEMATIC_KEYWORDS order.
+ * There are well under 32 groups, so a whole theme set packs into one
+ * 32-bit mask and pair overlap becomes a single AND instead of a hash
+ * lookup per theme.
+ */
+var _themeBits = null;
+var _simElementMask = 0;
+
+function getThemeBits() {
+    if (_themeBits) return _themeBits;
+
+    _themeBits = {};
+    var bit = 0;
+    for (var group in THEMATIC_KEYWORDS) {
+        _themeBits[group] = 1 << bit;
+        if (SIM_ELEMENTS[group] === true) _simElementMask |= 1 << bit;
+        bit++;
+    }
+    return _themeBits;
+}
+
+/**
+ * Count set bits in a 32-bit integer (SWAR popcount).
+ * @param {number} v - Integer mask
+ * @returns {number} - Number of set bits
+ */
+function popcount32(v) {
+    v = v - ((v >> 1) & 0x55555555);
+    v = (v & 0x33333333) + ((v >> 2) & 0x33333333);
+    return (((v + (v >> 4)) & 0x0F0F0F0F) * 0x01010101) >> 24;
+}
+
+/**
+ * Per-spell theme lookups for the pairwise similarity kernel. The theme
+ * and element bitmasks depend only on the spell, so compute them once
+ * instead of re-filtering theme arrays for every candidate pair in the
+ * O(N^2) prerequisite scoring loop.
+ */
+function getThemePairData(spell) {
+    if (spell._themePair !== undefined) return spell._themePair;
+
+    var themes = getSpellThemes(spell);
+    var bits = getThemeBits();
+    var mask = 0;
+    for (var i = 0; i < themes.length; i++) {
+        mask |= bits[themes[i]] || 0;
+    }
+    return (spell._themePair = { themes: themes, mask: mask, elemMask: mask & _simElementMask });
+}
+
 function calculateThematicSimilarity(spell1, spell2) {
-    var themes1 = getSpellThemes(spell1);
-    var themes2 = getSpellThemes(spell2);
-    
+    var d1 = getThemePairData(spell1);
+    var d2 = getThemePairData(spell2);
+    var themes1 = d1.themes;
+    var themes2 = d2.themes;
+
     if (themes1.length === 0 || themes2.length === 0) {
         return 0.3; // Lower neutral score - prefer known themes
     }
-    
+
     // Check for ELEMENTAL matches first (highest priority)
-    var elements = ['fire', 'frost', 'shock'];
-    var hasElementMatch = false;
-    var hasElementConflict = false;
-    
-    var spell1Elements = themes1.filter(function(t) { return elements.indexOf(t) !== -1; });
-    var spell2Elements = themes2.filter(function(t) { return elements.indexOf(t) !== -1; });
-    
-    if (spell1Elements.length > 0 && spell2Elements.length > 0) {
-        // Both spells have elements - check if they match
-        hasElementMatch = spell1Elements.some(function(e) {
-            return spell2Elements.indexOf(e) !== -1;
-        });
-        
-        if (!hasElementMatch) {
-            // Different elements = conflict (fire vs frost = bad)
-            hasElementConflict = true;
+    if (d1.elemMask !== 0 && d2.elemMask !== 0) {
+        if ((d1.elemMask & d2.elemMask) !== 0) {
+            return 0.9; // Elemental match = high score
         }
-    }
-    
-    // Elemental conflict = very low score
-    if (hasElementConflict) {
+        // Different elements = conflict (fire vs frost = bad)
         return 0.1;
     }
-    
-    // Elemental match = high score
-    if (hasElementMatch) {
-        return 0.9;
-    }
-    
-    // Count all overlapping themes
-    var overlap = 0;
-    themes1.forEach(function(t) {
-        if (themes2.indexOf(t) !== -1) overlap++;
-    });
-    
+
+    // Count all overlapping themes: AND the masks and popcount
+    var overlap = popcount32(d1.mask & d2.mask);
+
     // Score based on overlap ratio
     if (overlap === 0) {
         return 0.2; // No overlap but no element conflict
     }
-    
+
     var maxThemes = Math.max(themes1.length, themes2.length);
     return 0.4 + (overlap / maxThemes) * 0.5; // 0.4-0.9 range for non-elemental matches
 }
@@ -2240,18 +2475,14 @@ function calculateThematicSimilarity(spell1, spell2) {
  * @returns {boolean} true if they share at least one theme or one has no themes
  */
 function areThematicallyCompatible(spell1, spell2) {
-    var themes1 = getSpellThemes(spell1);
-    var themes2 = getSpellThemes(spell2);
-    
+    var d1 = getThemePairData(spell1);
+    var d2 = getThemePairData(spell2);
+
     // If either has no detected themes, consider compatible (generic spell)
-    if (themes1.length === 0 || themes2.length === 0) return true;
-    
-    // Check for any overlap
-    for (var i = 0; i < themes1.length; i++) {
-        if (themes2.indexOf(themes1[i]) !== -1) return true;
-    }
-    
-    return false;
+    if (d1.themes.length === 0 || d2.themes.length === 0) return true;
+
+    // Any shared theme bit means compatible
+    return (d1.mask & d2.mask) !== 0;
 }
 
 /**
@@ -2262,17 +2493,20 @@ function areThematicallyCompatible(spell1, spell2) {
  * @param {Array} positions - All positions with spell data
  * @param {Array} edges - All edges
  * @param {Function} rng - Seeded random
+ * @param {Object} [positionByFormId] - Prebuilt formId -> position lookup
  * @returns {Object} - Stats about fixes made
  */
-function fixThematicInconsistencies(positions, edges, rng) {
+function fixThematicInconsistencies(positions, edges, rng, positionByFormId) {
     var stats = { nodesChecked: 0, nodesFixed: 0, edgesRewired: 0 };
-    
-    // Build lookups
-    var positionByFormId = {};
-    positions.forEach(function(p) {
-        if (p.spell) positionByFormId[p.spell.formId] = p;
-    });
-    
+
+    // Position lookup by formId (caller may pass one in)
+    if (!positionByFormId) {
+        positionByFormId = {};
+        positions.forEach(function(p) {
+            if (p.spell) positionByFormId[p.spell.formId] = p;
+        });
+    }
+
     // Build incoming edges map
     var incomingEdges = {};
     positions.forEach(function(p) {
@@ -2309,7 +2543,7 @@ function fixThematicInconsistencies(positions, edges, rng) {
         
         stats.nodesChecked++;
         
-        var incoming = incomingEdges[formId] || [];
+        var incoming = incomingEdges[formId] || EMPTY_LIST;
         if (incoming.length === 0) return;
         
         // Check if ANY prerequisite is thematically compatible
@@ -2336,13 +2570,13 @@ function fixThematicInconsistencies(positions, edges, rng) {
         if (hasCompatiblePrereq) return;
         if (!worstIncompatibleEdge) return;
         
-        console.log('[ThematicFix] ' + getSpellDetails(node.spell) + ' has no compatible prereqs');
-        console.log('[ThematicFix]   Current prereqs:');
+        debugLog('[ThematicFix] ' + getSpellDetails(node.spell) + ' has no compatible prereqs');
+        debugLog('[ThematicFix]   Current prereqs:');
         incoming.forEach(function(e) {
             var src = positionByFormId[e.from];
             if (src && src.spell) {
                 var sim = calculateThematicSimilarity(node.spell, src.spell);
-                console.log('[ThematicFix]     - ' + getSpellDetails(src.spell) + ' (sim: ' + sim.toFixed(2) + ')');
+                debugLog('[ThematicFix]     - ' + getSpellDetails(src.spell) + ' (sim: ' + sim.toFixed(2) + ')');
             }
         });
         
@@ -2368,11 +2602,11 @@ function fixThematicInconsistencies(positions, edges, rng) {
         });
         
         if (!bestCandidate) {
-            console.log('[ThematicFix]   No better candidates found, keeping original prereqs');
+            debugLog('[ThematicFix]   No better candidates found, keeping original prereqs');
             return;
         }
         
-        console.log('[ThematicFix]   Best candidate: ' + getSpellDetails(bestCandidate.spell) + 
+        debugLog('[ThematicFix]   Best candidate: ' + getSpellDetails(bestCandidate.spell) + 
                     ' (sim: ' + bestSimilarity.toFixed(2) + ')');
         
         // ADD the thematically compatible prereq (don't remove the original)
@@ -2396,7 +2630,7 @@ function fixThematicInconsistencies(positions, edges, rng) {
         stats.nodesFixed++;
         stats.edgesRewired++;
         
-        console.log('[ThematicFix]   ADDED thematic prereq: ' + bestCandidate.spell.name + 
+        debugLog('[ThematicFix]   ADDED thematic prereq: ' + bestCandidate.spell.name + 
                     ' (kept existing: ' + incoming.map(function(e) { 
                         var s = positionByFormId[e.from]; 
                         return s && s.spell ? s.spell.name : e.from; 
@@ -2458,31 +2692,37 @@ window.DEFAULT_ALTERNATE_PATH_CONFIG = DEFAULT_ALTERNATE_PATH_CONFIG;
  */
 function calculatePathDistance(fromId, toId, adjacencyList, maxDepth) {
     if (fromId === toId) return 0;
-    
-    var visited = {};
-    var queue = [{ id: fromId, depth: 0 }];
-    visited[fromId] = true;
-    
-    while (queue.length > 0) {
-        var current = queue.shift();
-        
-        if (current.depth >= maxDepth) continue;
-        
-        var neighbors = adjacencyList[current.id] || [];
+
+    // Head-index queue: shift() re-indexes the whole array on every
+    // dequeue, turning the BFS quadratic. Depths ride in the visited map
+    // so no per-node wrapper objects are allocated either - this runs once
+    // per candidate pair in the alternate-path pass.
+    var depths = {};
+    var queue = [fromId];
+    var head = 0;
+    depths[fromId] = 0;
+
+    while (head < queue.length) {
+        var currentId = queue[head++];
+        var currentDepth = depths[currentId];
+
+        if (currentDepth >= maxDepth) continue;
+
+        var neighbors = adjacencyList[currentId] || EMPTY_LIST;
         for (var i = 0; i < neighbors.length; i++) {
             var neighborId = neighbors[i];
-            
+
             if (neighborId === toId) {
-                return current.depth + 1;
+                return currentDepth + 1;
             }
-            
-            if (!visited[neighborId]) {
-                visited[neighborId] = true;
-                queue.push({ id: neighborId, depth: current.depth + 1 });
+
+            if (depths[neighborId] === undefined) {
+                depths[neighborId] = currentDepth + 1;
+                queue.push(neighborId);
             }
         }
     }
-    
+
     return -1; // No path found within maxDepth
 }
 
@@ -2494,23 +2734,35 @@ function calculatePathDistance(fromId, toId, adjacencyList, maxDepth) {
  */
 function buildAdjacencyList(edges) {
     var adj = {};
-    
+    // Hash-set duplicate guard: indexOf rescanned the neighbor list on
+    // every append, which goes quadratic on hub nodes. Insertion order of
+    // the neighbor arrays is unchanged.
+    var seen = {};
+
     edges.forEach(function(e) {
         var from = e.from;
         var to = e.to;
-        
+
         // Handle edge objects that might have node references
         if (typeof from === 'object' && from.formId) from = from.formId;
         if (typeof to === 'object' && to.formId) to = to.formId;
-        
+
         if (!adj[from]) adj[from] = [];
         if (!adj[to]) adj[to] = [];
-        
+
         // Bidirectional for pathfinding
-        if (adj[from].indexOf(to) === -1) adj[from].push(to);
-        if (adj[to].indexOf(from) === -1) adj[to].push(from);
+        var fwdKey = from + '->' + to;
+        if (!seen[fwdKey]) {
+            seen[fwdKey] = true;
+            adj[from].push(to);
+        }
+        var revKey = to + '->' + from;
+        if (!seen[revKey]) {
+            seen[revKey] = true;
+            adj[to].push(from);
+        }
     });
-    
+
     return adj;
 }
 
@@ -2825,7 +3077,7 @@ function findBestPosition(spell, group, placedNodes, sliceInfo, shapeMask, curre
                     continue;
                 }
                 
-                var rad = angle * Math.PI / 180;
+                var rad = angle * DEG_TO_RAD;
                 var x = Math.cos(rad) * radius;
                 var y = Math.sin(rad) * radius;
                 
@@ -2862,10 +3114,14 @@ function findBestPosition(spell, group, placedNodes, sliceInfo, shapeMask, curre
     });
     
     if (candidates.length === 0) return null;
-    
-    // Sort by score (lower is better) and pick best
-    candidates.sort(function(a, b) { return a.score - b.score; });
-    return candidates[0];
+
+    // Only the best (lowest score) is used - min-scan instead of sorting.
+    // Strict < keeps the first minimal candidate, matching the stable sort.
+    var best = candidates[0];
+    for (var ci = 1; ci < candidates.length; ci++) {
+        if (candidates[ci].score < best.score) best = candidates[ci];
+    }
+    return best;
 }
 
 /**
@@ -2899,7 +3155,7 @@ function findFallbackPosition(sliceInfo, currentRadius, tier, rng, nodeSize, pla
             // Clamp to sector bounds
             if (angle < sliceInfo.startAngle + 3 || angle > sliceInfo.endAngle - 3) continue;
             
-            var rad = angle * Math.PI / 180;
+            var rad = angle * DEG_TO_RAD;
             var x = Math.cos(rad) * radius;
             var y = Math.sin(rad) * radius;
             
@@ -2992,15 +3248,22 @@ function findBestParent(node, placedNodes, group, maxEdgeLength) {
     });
     
     if (candidates.length === 0) {
-        // Fallback: find any node with fewest children
-        var sorted = placedNodes.slice().sort(function(a, b) {
-            return (a.children ? a.children.length : 0) - (b.children ? b.children.length : 0);
-        });
-        return sorted[0];
+        // Fallback: find any node with fewest children (min-scan, no sort)
+        var fewest = null;
+        var fewestCount = Infinity;
+        for (var fi = 0; fi < placedNodes.length; fi++) {
+            var fCount = placedNodes[fi].children ? placedNodes[fi].children.length : 0;
+            if (fCount < fewestCount) { fewest = placedNodes[fi]; fewestCount = fCount; }
+        }
+        return fewest;
     }
-    
-    candidates.sort(function(a, b) { return a.score - b.score; });
-    return candidates[0].node;
+
+    // Only the top candidate is used - min-scan instead of sorting
+    var best = candidates[0];
+    for (var ci = 1; ci < candidates.length; ci++) {
+        if (candidates[ci].score < best.score) best = candidates[ci];
+    }
+    return best.node;
 }
 
 /**
@@ -3034,19 +3297,23 @@ function addCrossGroupConnections(positions, edges, groups, rng, maxDist) {
         });
         
         if (candidates.length > 0) {
-            // Pick closest
-            candidates.sort(function(a, b) {
-                var da = Math.sqrt(Math.pow(node.x - a.x, 2) + Math.pow(node.y - a.y, 2));
-                var db = Math.sqrt(Math.pow(node.x - b.x, 2) + Math.pow(node.y - b.y, 2));
-                return da - db;
-            });
-            
+            // Pick closest - min-scan, one squared distance per candidate
+            // instead of two sqrts per sort comparison
+            var closest = candidates[0];
+            var closestDistSq = Infinity;
+            for (var ci = 0; ci < candidates.length; ci++) {
+                var cdx = node.x - candidates[ci].x;
+                var cdy = node.y - candidates[ci].y;
+                var distSq = cdx * cdx + cdy * cdy;
+                if (distSq < closestDistSq) { closest = candidates[ci]; closestDistSq = distSq; }
+            }
+
             edges.push({
-                from: candidates[0].formId,
+                from: closest.formId,
                 to: node.formId,
                 type: 'cross_branch'
             });
-            edgeSet[candidates[0].formId + '->' + node.formId] = true;
+            edgeSet[closest.formId + '->' + node.formId] = true;
             count++;
         }
     });
@@ -3124,13 +3391,16 @@ function getShapeMask(shapeName) {
 /**
  * Discover fuzzy groups from spell names/effects.
  */
+// Module-level stop list (same rationale as GROUP_STOP_WORDS)
+var FUZZY_STOP_WORDS = ['the', 'of', 'and', 'a', 'to', 'in', 'for', 'is', 'on', 'that', 'by', 'this', 'with', 'spell', 'magic', 'magicka', 'target', 'effect', 'damage', 'points', 'second', 'seconds', 'level', 'health', 'restore', 'greater', 'lesser', 'mass', 'caster', 'concentration', 'enemies', 'enemy', 'nearby', 'area'];
+
 function discoverFuzzyGroupsFromSpells(spells, rng) {
     // Extract keywords from all spells using UNIFIED extraction (includes description)
     var keywordCounts = {};
     var spellKeywords = {};
-    
-    var stopWords = ['the', 'of', 'and', 'a', 'to', 'in', 'for', 'is', 'on', 'that', 'by', 'this', 'with', 'spell', 'magic', 'magicka', 'target', 'effect', 'damage', 'points', 'second', 'seconds', 'level', 'health', 'restore', 'greater', 'lesser', 'mass', 'caster', 'concentration', 'enemies', 'enemy', 'nearby', 'area'];
-    
+
+    var stopWords = FUZZY_STOP_WORDS;
+
     spells.forEach(function(spell, idx) {
         // Use UNIFIED text extraction (name + effectNames + effects + description)
         var words = extractSpellKeywords(spell, stopWords);
@@ -3145,14 +3415,20 @@ function discoverFuzzyGroupsFromSpells(spells, rng) {
     var minCount = Math.max(2, Math.floor(spells.length * 0.08));
     var maxCount = Math.floor(spells.length * 0.45);
     
+    // Top-k selection instead of sorting every candidate: only the six most
+    // common themes survive, so keep a bounded insertion-sorted list.
+    // Ties keep first-seen order, matching the previous stable sort + slice.
+    var maxThemes = 6;
     var themes = [];
     for (var kw in keywordCounts) {
-        if (keywordCounts[kw] >= minCount && keywordCounts[kw] <= maxCount) {
-            themes.push({ keyword: kw, count: keywordCounts[kw] });
-        }
+        var kwCount = keywordCounts[kw];
+        if (kwCount < minCount || kwCount > maxCount) continue;
+        if (themes.length === maxThemes && kwCount <= themes[maxThemes - 1].count) continue;
+        var pos = themes.length;
+        while (pos > 0 && themes[pos - 1].count < kwCount) pos--;
+        themes.splice(pos, 0, { keyword: kw, count: kwCount });
+        if (themes.length > maxThemes) themes.pop();
     }
-    themes.sort(function(a, b) { return b.count - a.count; });
-    themes = themes.slice(0, 6);  // Max 6 themes
     
     var groups = themes.map(function(t) {
         return { theme: t.keyword, spells: [], preferredAngle: 0 };
@@ -3161,7 +3437,7 @@ function discoverFuzzyGroupsFromSpells(spells, rng) {
     
     // Assign spells
     spells.forEach(function(spell, idx) {
-        var keywords = spellKeywords[idx] || [];
+        var keywords = spellKeywords[idx] || EMPTY_LIST;
         var bestGroup = null;
         var bestScore = 0;
         
@@ -3308,9 +3584,61 @@ function generateVisualFirstTree(schoolName, spells, config) {
     return treeData;
 }
 
+/**
+ * Single-pass edge index for output formatting: children, prerequisites
+ * and alternate links per node. Replaces the per-node filters over the
+ * full edge list (O(nodes * edges)) with one O(edges) pass and O(1)
+ * lookups. Semantics match the old filters exactly: prerequisite-type
+ * edges are appended after all primary incoming edges, skipping
+ * endpoints the primary pass already recorded.
+ *
+ * @param {Array} edges - Edge list with optional type field
+ * @returns {Object} - {childrenByFrom, prereqsByTo, alternatesByNode, counts}
+ */
+function buildEdgeIndexes(edges) {
+    var childrenByFrom = {};
+    var prereqsByTo = {};
+    var alternatesByNode = {};
+    var counts = { primary: 0, prerequisite: 0, alternate: 0 };
+    var prereqTypeEdges = [];
+
+    edges.forEach(function(e) {
+        if (!e.type || e.type === 'primary' || e.type === 'cross') {
+            counts.primary++;
+            if (!childrenByFrom[e.from]) childrenByFrom[e.from] = [];
+            childrenByFrom[e.from].push(e.to);
+            if (!prereqsByTo[e.to]) prereqsByTo[e.to] = [];
+            prereqsByTo[e.to].push(e.from);
+        } else if (e.type === 'prerequisite') {
+            counts.prerequisite++;
+            prereqTypeEdges.push(e);
+        } else if (e.type === 'alternate') {
+            counts.alternate++;
+            if (!alternatesByNode[e.to]) alternatesByNode[e.to] = [];
+            alternatesByNode[e.to].push(e.from);
+            if (e.from !== e.to) {
+                if (!alternatesByNode[e.from]) alternatesByNode[e.from] = [];
+                alternatesByNode[e.from].push(e.to);
+            }
+        }
+    });
+
+    prereqTypeEdges.forEach(function(e) {
+        if (!prereqsByTo[e.to]) prereqsByTo[e.to] = [];
+        if (prereqsByTo[e.to].indexOf(e.from) === -1) prereqsByTo[e.to].push(e.from);
+    });
+
+    return {
+        childrenByFrom: childrenByFrom,
+        prereqsByTo: prereqsByTo,
+        alternatesByNode: alternatesByNode,
+        counts: counts
+    };
+}
+
 /**
  * Generate visual-first trees for ALL schools at once.
- * 
+ *
  * @param {Array} allSpells - All spells from all schools
  * @param {Object} schoolConfigs - Map of school name to LLM config
  * @param {Object} fuzzyData - Fuzzy NLP relationship data from C++ native
@@ -3453,21 +3781,11 @@ function generateAllVisualFirstTrees(allSpells, schoolConfigs, fuzzyData, treeGe
             
             // Build edges by proximity
             edges = buildEdges(allPositions, config, schoolSeed + 300, fuzzy);
-            
-            var assignedCount = allPositions.filter(function(p) { return p.spell; }).length;
-            console.log('[VisualFirstBuilder] Assigned: ' + assignedCount + '/' + spells.length + ', Edges: ' + edges.length);
         }
-        
-        // Find root (first novice spell or first spell)
-        var root = allPositions.find(function(p) { 
-            return p.spell && p.tier === 0; 
-        }) || allPositions.find(function(p) { return p.spell; });
-        
-        // Categorize edges by type
-        var primaryEdges = edges.filter(function(e) { return !e.type || e.type === 'primary' || e.type === 'cross'; });
-        var prereqEdges = edges.filter(function(e) { return e.type === 'prerequisite'; });
-        var alternateEdges = edges.filter(function(e) { return e.type === 'alternate'; });
-        
+
+        // Index edges by endpoint in one pass (children/prereqs/alternates)
+        var edgeIndex = buildEdgeIndexes(edges);
+
         // Build nodes array
         // DIAGNOSTIC: Log fuzzy.themes availability
         var themeKeys = fuzzy.themes ? Object.keys(fuzzy.themes) : [];
@@ -3476,57 +3794,50 @@ function generateAllVisualFirstTrees(allSpells, schoolConfigs, fuzzyData, treeGe
             console.log('[VisualFirstBuilder] Sample theme keys:', themeKeys.slice(0, 3));
         }
 
-        var nodes = allPositions
-            .filter(function(p) { return p.spell; })
-            .map(function(p) {
-                var formId = p.spell.formId;
-                
-                // Primary children
-                var children = primaryEdges
-                    .filter(function(e) { return e.from === formId; })
-                    .map(function(e) { return e.to; });
-                
-                // Prerequisites - primary incoming + prerequisite type
-                var prerequisites = primaryEdges
-                    .filter(function(e) { return e.to === formId; })
-                    .map(function(e) { return e.from; });
-                
-                prereqEdges.forEach(function(e) {
-                    if (e.to === formId && prerequisites.indexOf(e.from) === -1) {
-                        prerequisites.push(e.from);
-                    }
-                });
-                
-                // Alternate paths (shortcuts)
-                var alternatePaths = alternateEdges
-                    .filter(function(e) { return e.to === formId || e.from === formId; })
-                    .map(function(e) { return e.to === formId ? e.from : e.to; });
-                
-                // Get hard/soft prerequisite requirements (if assigned)
-                var prereqReqs = p.prereqRequirements || null;
-                
-                // Get theme from fuzzy data (C++ TF-IDF discovery)
-                var spellThemes = fuzzy.themes ? fuzzy.themes[formId] : null;
-                var theme = spellThemes && spellThemes.length > 0 ? spellThemes[0] : null;
+        // Single pass over positions: build the node list, find the root
+        // (first novice spell, else first assigned spell), and count assigned
+        // positions - instead of separate filter/find/find/map walks
+        var nodes = [];
+        var root = null;
+        var firstAssigned = null;
+        for (var pi = 0; pi < allPositions.length; pi++) {
+            var pos = allPositions[pi];
+            if (!pos.spell) continue;
+            if (!firstAssigned) firstAssigned = pos;
+            if (!root && pos.tier === 0) root = pos;
 
-                return {
-                    formId: formId,
-                    children: children,
-                    prerequisites: prerequisites,
-                    // New unified prereq system
-                    hardPrereqs: prereqReqs ? prereqReqs.hardPrereqs : undefined,
-                    softPrereqs: prereqReqs ? prereqReqs.softPrereqs : undefined,
-                    softNeeded: prereqReqs ? prereqReqs.softNeeded : undefined,
-                    tier: p.tier + 1,
-                    theme: theme,  // Theme from C++ NLP fuzzy analysis
-                    x: p.x,
-                    y: p.y,
-                    radius: p.radius,
-                    angle: p.angle,
-                    isRoot: p.isRoot || false,  // CRITICAL: Root flag for origin lines
-                    _fromVisualFirst: true  // Flag for wheelRenderer
-                };
+            var formId = pos.spell.formId;
+
+            // Get hard/soft prerequisite requirements (if assigned)
+            var prereqReqs = pos.prereqRequirements || null;
+
+            // Get theme from fuzzy data (C++ TF-IDF discovery)
+            var spellThemes = fuzzy.themes ? fuzzy.themes[formId] : null;
+            var theme = spellThemes && spellThemes.length > 0 ? spellThemes[0] : null;
+
+            nodes.push({
+                formId: formId,
+                children: edgeIndex.childrenByFrom[formId] || [],       // Primary children
+                prerequisites: edgeIndex.prereqsByTo[formId] || [],     // Primary incoming + prerequisite type
+                // New unified prereq system
+                hardPrereqs: prereqReqs ? prereqReqs.hardPrereqs : undefined,
+                softPrereqs: prereqReqs ? prereqReqs.softPrereqs : undefined,
+                softNeeded: prereqReqs ? prereqReqs.softNeeded : undefined,
+                tier: pos.tier + 1,
+                theme: theme,  // Theme from C++ NLP fuzzy analysis
+                x: pos.x,
+                y: pos.y,
+                radius: pos.radius,
+                angle: pos.angle,
+                isRoot: pos.isRoot || false,  // CRITICAL: Root flag for origin lines
+                _fromVisualFirst: true  // Flag for wheelRenderer
             });
+        }
+        if (!root) root = firstAssigned;
+
+        if (branchingMode !== 'fuzzy_groups') {
+            console.log('[VisualFirstBuilder] Assigned: ' + nodes.length + '/' + spells.length + ', Edges: ' + edges.length);
+        }
         
         schoolOutputs[schoolName] = {
             root: root ? root.spell.formId : null,
@@ -3560,67 +3871,46 @@ function generateAllVisualFirstTrees(allSpells, schoolConfigs, fuzzyData, treeGe
  * Format single school output.
  */
 function formatTreeOutput(schoolName, positions, edges, config) {
-    // Find root (first novice spell)
-    var root = positions.find(function(p) { 
-        return p.spell && p.tier === 0; 
-    }) || positions.find(function(p) { return p.spell; });
-    
-    // Categorize edges by type
-    var primaryEdges = edges.filter(function(e) { return !e.type || e.type === 'primary' || e.type === 'cross'; });
-    var prereqEdges = edges.filter(function(e) { return e.type === 'prerequisite'; });
-    var alternateEdges = edges.filter(function(e) { return e.type === 'alternate'; });
-    
-    console.log('[FormatOutput] Edges by type: primary=' + primaryEdges.length + 
-                ', prereq=' + prereqEdges.length + ', alternate=' + alternateEdges.length);
-    
-    // Build nodes array
-    var nodes = positions
-        .filter(function(p) { return p.spell; })
-        .map(function(p) {
-            var formId = p.spell.formId;
-            
-            // Primary children (direct progression)
-            var children = primaryEdges
-                .filter(function(e) { return e.from === formId; })
-                .map(function(e) { return e.to; });
-            
-            // Prerequisites - combine primary incoming edges + prerequisite type edges
-            var prerequisites = primaryEdges
-                .filter(function(e) { return e.to === formId; })
-                .map(function(e) { return e.from; });
-            
-            // Add prerequisite-type edges (additional requirements)
-            prereqEdges.forEach(function(e) {
-                if (e.to === formId && prerequisites.indexOf(e.from) === -1) {
-                    prerequisites.push(e.from);
-                }
-            });
-            
-            // Alternate paths (shortcuts - learning ANY of these also unlocks this spell)
-            var alternatePaths = alternateEdges
-                .filter(function(e) { return e.to === formId || e.from === formId; })
-                .map(function(e) { return e.to === formId ? e.from : e.to; });
-            
-                // Get hard/soft prerequisite requirements (if assigned)
-                var prereqReqs = p.prereqRequirements || null;
-                
-                return {
-                formId: formId,
-                children: children,
-                prerequisites: prerequisites,
-                // New unified prereq system
-                hardPrereqs: prereqReqs ? prereqReqs.hardPrereqs : undefined,
-                softPrereqs: prereqReqs ? prereqReqs.softPrereqs : undefined,
-                softNeeded: prereqReqs ? prereqReqs.softNeeded : undefined,
-                tier: p.tier + 1,
-                x: p.x,
-                y: p.y,
-                radius: p.radius,
-                angle: p.angle,
-                isRoot: p.isRoot || false,  // CRITICAL: Root flag for origin lines
-                _fromVisualFirst: true
-            };
+    // Index edges by endpoint in one pass (children/prereqs/alternates)
+    var edgeIndex = buildEdgeIndexes(edges);
+
+    console.log('[FormatOutput] Edges by type: primary=' + edgeIndex.counts.primary +
+                ', prereq=' + edgeIndex.counts.prerequisite + ', alternate=' + edgeIndex.counts.alternate);
+
+    // Single pass: build the node list and find the root (first novice
+    // spell, else first assigned spell) without separate find/filter walks
+    var nodes = [];
+    var root = null;
+    var firstAssigned = null;
+    for (var pi = 0; pi < positions.length; pi++) {
+        var pos = positions[pi];
+        if (!pos.spell) continue;
+        if (!firstAssigned) firstAssigned = pos;
+        if (!root && pos.tier === 0) root = pos;
+
+        var formId = pos.spell.formId;
+
+        // Get hard/soft prerequisite requirements (if assigned)
+        var prereqReqs = pos.prereqRequirements || null;
+
+        nodes.push({
+            formId: formId,
+            children: edgeIndex.childrenByFrom[formId] || [],       // Primary children (direct progression)
+            prerequisites: edgeIndex.prereqsByTo[formId] || [],     // Primary incoming + prerequisite type edges
+            // New unified prereq system
+            hardPrereqs: prereqReqs ? prereqReqs.hardPrereqs : undefined,
+            softPrereqs: prereqReqs ? prereqReqs.softPrereqs : undefined,
+            softNeeded: prereqReqs ? prereqReqs.softNeeded : undefined,
+            tier: pos.tier + 1,
+            x: pos.x,
+            y: pos.y,
+            radius: pos.radius,
+            angle: pos.angle,
+            isRoot: pos.isRoot || false,  // CRITICAL: Root flag for origin lines
+            _fromVisualFirst: true
         });
+    }
+    if (!root) root = firstAssigned;
     
     var schoolOutput = {
         root: root ? root.spell.formId : null,
@@ -3646,15 +3936,32 @@ function formatTreeOutput(schoolName, positions, edges, config) {
 
 function seededRandom(seed) {
     var state = seed || Date.now();
-    return function() {
+    var next = function() {
         state = (state * 1103515245 + 12345) & 0x7fffffff;
         return state / 0x7fffffff;
     };
+    // Batch draw: returns k randoms from one call, advancing the LCG in a
+    // local loop instead of paying k closure invocations. Produces exactly
+    // the same sequence as calling next() k times.
+    next.batch = function(k) {
+        var out = new Array(k);
+        var s = state;
+        for (var i = 0; i < k; i++) {
+            s = (s * 1103515245 + 12345) & 0x7fffffff;
+            out[i] = s / 0x7fffffff;
+        }
+        state = s;
+        return out;
+    };
+    return next;
 }
 
 function shuffle(arr, rng) {
+    // Pre-draw all randoms in one batch when the rng supports it
+    var draws = rng.batch ? rng.batch(Math.max(0, arr.length - 1)) : null;
+    var d = 0;
     for (var i = arr.length - 1; i > 0; i--) {
-        var j = Math.floor(rng() * (i + 1));
+        var j = Math.floor((draws ? draws[d++] : rng()) * (i + 1));
         var temp = arr[i];
         arr[i] = arr[j];
         arr[j] = temp;
@@ -3684,3 +3991,7 @@ window.VisualFirstBuilder = {
 
 window.generateVisualFirstTree = generateVisualFirstTree;
 window.generateAllVisualFirstTrees = generateAllVisualFirstTrees;
+
+// Compile the thematic group patterns at load rather than inside the first
+// build's theme scan (THEMATIC_KEYWORDS is static)
+getThematicPatterns();
@@ -1263,7 +1263,7 @@ function initializePowerStepsUI() {
     
     // Ensure powerSteps exists
     if (!settings.earlySpellLearning.powerSteps) {
-        settings.earlySpellLearning.powerSteps = JSON.parse(JSON.stringify(DEFAULT_POWER_STEPS));
+        settings.earlySpellLearning.powerSteps = deepCopyPlain(DEFAULT_POWER_STEPS);
     }
     
     renderPowerSteps();
@@ -1397,7 +1397,7 @@ function onPowerStepInputChange(e) {
 }
 
 function resetPowerStepsToDefaults() {
-    settings.earlySpellLearning.powerSteps = JSON.parse(JSON.stringify(DEFAULT_POWER_STEPS));
+    settings.earlySpellLearning.powerSteps = deepCopyPlain(DEFAULT_POWER_STEPS);
     renderPowerSteps();
     console.log('[SpellLearning] Power steps reset to defaults');
 
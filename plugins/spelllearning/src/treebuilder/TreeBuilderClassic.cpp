@@ -164,6 +164,11 @@ TreeBuilder::BuildResult TreeBuilder::BuildClassic(
     treeData["version"] = "1.0";
     treeData["schools"] = json::object();
 
+    // NOTE: Schools are built sequentially on purpose. The hot similarity
+    // kernels inside ComputeSimilarityMatrix are already OpenMP-parallel, and
+    // the shared seeded rng makes per-school draw order part of the
+    // deterministic output - a school-level worker pool would change seeded
+    // results and oversubscribe the OpenMP thread pool.
     for (auto& [schoolName, schoolSpellList] : schoolSpells) {
         if (schoolSpellList.empty()) continue;
 
@@ -251,7 +251,10 @@ void UIManager::OnLoadPresets(const char* argument)
             result["type"] = type;
             result["presets"] = json::array();
 
-            if (std::filesystem::exists(dir) && std::filesystem::is_directory(dir)) {
+            // Single stat: is_directory(dir, ec) is false for missing paths,
+            // so the separate exists() check was a redundant syscall
+            std::error_code dirEc;
+            if (std::filesystem::is_directory(dir, dirEc)) {
                 for (const auto& entry : std::filesystem::directory_iterator(dir)) {
                     if (!entry.is_regular_file()) continue;
                     auto ext = entry.path().extension().string();
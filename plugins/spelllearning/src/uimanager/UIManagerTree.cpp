@@ -230,6 +230,15 @@ void UIManager::OnGetSpellInfoBatch(const char* argument)
     });
 }
 
+namespace
+{
+    // Serializes the background tree saves below: two saves in quick
+    // succession (e.g. auto-save after a build plus a manual save) must
+    // not open the same file with truncation concurrently. Held through
+    // the status dispatch so the toasts arrive in write order.
+    std::mutex s_saveTreeMutex;
+}
+
 void UIManager::OnSaveSpellTree(const char* argument)
 {
     logger::info("UIManager: SaveSpellTree callback triggered");
@@ -241,44 +250,68 @@ void UIManager::OnSaveSpellTree(const char* argument)
 
     std::string argStr(argument);
 
-    AddTaskToGameThread("SaveSpellTree", [argStr]() {
-        auto* instance = GetSingleton();
-        if (!instance || !instance->m_prismaUI) return;
+    // The write needs neither the game thread nor RE:: types - run it on a
+    // background thread so a multi-megabyte tree dump doesn't stall a frame,
+    // then marshal the status update back (InteropCall must run game-side)
+    std::thread([argStr = std::move(argStr)]() {
+        std::lock_guard<std::mutex> lock(s_saveTreeMutex);
+        bool success = false;
 
-        // Create output directory
-        std::filesystem::path outputDir = "Data/SKSE/Plugins/SpellLearning";
-        std::filesystem::create_directories(outputDir);
+        try {
+            // Create output directory
+            std::filesystem::path outputDir = "Data/SKSE/Plugins/SpellLearning";
+            std::filesystem::create_directories(outputDir);
 
-        // Write to file
-        auto treePath = GetTreeFilePath();
+            // Write to file
+            auto treePath = GetTreeFilePath();
 
-        try {
             std::ofstream file(treePath);
             if (file.is_open()) {
                 file << argStr;
                 file.flush();
                 if (file.fail()) {
                     logger::error("UIManager: Failed to write spell tree to {}", treePath.string());
-                    instance->UpdateTreeStatus("Save failed");
                 } else {
                     logger::info("UIManager: Saved spell tree to {}", treePath.string());
-                    instance->UpdateTreeStatus("Tree saved");
+                    success = true;
                 }
             } else {
                 logger::error("UIManager: Failed to open spell tree file for writing");
-                instance->UpdateTreeStatus("Save failed");
             }
         } catch (const std::exception& e) {
             logger::error("UIManager: Exception while saving spell tree: {}", e.what());
-            instance->UpdateTreeStatus("Save failed");
         }
-    });
+
+        AddTaskToGameThread("SaveSpellTreeStatus", [success]() {
+            auto* instance = GetSingleton();
+            if (!instance || !instance->m_prismaUI) return;
+            instance->UpdateTreeStatus(success ? "Tree saved" : "Save failed");
+        });
+    }).detach();
 }
 
 // =============================================================================
 // PROCEDURAL TREE GENERATION (C++ native)
 // =============================================================================
 
+namespace
+{
+    // Cache of the most recent completed build, keyed by the full request
+    // string (command + spells + config). TreeBuilder::Build is pure and
+    // seeded, so an identical request produces an identical tree -
+    // repeating a build (same load order, same settings) becomes a string
+    // copy instead of a full O(N^2) rebuild. Only one entry is kept and
+    // the serialized tree already runs to megabytes, so storing the
+    // request string costs little; its hash is kept only as a cheap
+    // pre-check before the full equality compare (a hash match alone
+    // could silently serve the wrong tree on a collision).
+    std::mutex s_buildCacheMutex;
+    std::size_t s_buildCacheKeyHash = 0;
+    std::string s_buildCacheRequest;
+    bool s_buildCacheValid = false;
+    std::string s_buildCacheTreeData;
+}
+
 void UIManager::OnProceduralTreeGenerate(const char* argument)
 {
     logger::info("UIManager: ProceduralTreeGenerate callback triggered (C++ native)");
@@ -303,6 +336,25 @@ void UIManager::OnProceduralTreeGenerate(const char* argument)
             return;
         }
 
+        // Serve a repeated identical request from the cache without
+        // re-running the builder
+        const std::size_t requestKeyHash = std::hash<std::string>{}(argStr);
+        {
+            std::lock_guard<std::mutex> lock(s_buildCacheMutex);
+            if (s_buildCacheValid && s_buildCacheKeyHash == requestKeyHash &&
+                s_buildCacheRequest == argStr) {
+                logger::info("UIManager: Serving tree build from cache ({} bytes)", s_buildCacheTreeData.size());
+                instance->m_treeBuildInProgress = false;
+
+                nlohmann::json response;
+                response["success"] = true;
+                response["treeData"] = s_buildCacheTreeData;
+                response["elapsed"] = 0.0;
+                instance->m_prismaUI->InteropCall(instance->m_view, "onProceduralTreeComplete", response.dump().c_str());
+                return;
+            }
+        }
+
         try {
             nlohmann::json request = nlohmann::json::parse(argStr);
 
@@ -324,12 +376,29 @@ void UIManager::OnProceduralTreeGenerate(const char* argument)
             logger::info("UIManager: Dispatching tree build to background thread ({} command, {} spells)", command, spells.size());
 
             // Launch background thread — TreeBuilder has ZERO RE:: dependencies
-            std::thread([command, spells = std::move(spells), configJson]() {
+            std::thread([command, spells = std::move(spells), configJson, argStr, requestKeyHash]() {
                 try {
                     auto result = TreeBuilder::Build(command, spells, configJson);
 
+                    // Serialize the (potentially multi-MB) tree on this worker
+                    // thread so the game-thread task only moves a ready string.
+                    // This was previously dumped twice on the game thread (once
+                    // for the payload, once for the log size)
+                    std::string treeDataStr;
+                    if (result.success) {
+                        treeDataStr = result.treeData.dump();
+
+                        std::lock_guard<std::mutex> lock(s_buildCacheMutex);
+                        s_buildCacheKeyHash = requestKeyHash;
+                        s_buildCacheRequest = argStr;
+                        s_buildCacheTreeData = treeDataStr;
+                        s_buildCacheValid = true;
+                    }
+
                     // Marshal result back to game thread for UI callback
-                    AddTaskToGameThread("TreeBuildComplete", [result = std::move(result), command]() {
+                    AddTaskToGameThread("TreeBuildComplete",
+                        [treeDataStr = std::move(treeDataStr), success = result.success,
+                         error = std::move(result.error), elapsedMs = result.elapsedMs, command]() mutable {
                         auto* inst = GetSingleton();
                         if (!inst) return;
                         inst->m_treeBuildInProgress = false;
@@ -337,15 +406,15 @@ void UIManager::OnProceduralTreeGenerate(const char* argument)
                         if (!inst->m_prismaUI) return;
 
                         nlohmann::json response;
-                        if (result.success) {
+                        if (success) {
                             response["success"] = true;
-                            response["treeData"] = result.treeData.dump();
-                            response["elapsed"] = result.elapsedMs / 1000.0;
-                            logger::info("UIManager: {} completed in {:.2f}s Data size: {} bytes (background thread)", command, result.elapsedMs / 1000.0, result.treeData.dump().size());
+                            response["elapsed"] = elapsedMs / 1000.0;
+                            logger::info("UIManager: {} completed in {:.2f}s Data size: {} bytes (background thread)", command, elapsedMs / 1000.0, treeDataStr.size());
+                            response["treeData"] = std::move(treeDataStr);
                         } else {
                             response["success"] = false;
-                            response["error"] = result.error;
-                            logger::error("UIManager: {} failed: {}", command, result.error);
+                            response["error"] = error;
+                            logger::error("UIManager: {} failed: {}", command, error);
                         }
 
                         inst->m_prismaUI->InteropCall(inst->m_view, "onProceduralTreeComplete", response.dump().c_str());